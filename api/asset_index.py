@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class AssetRecord:
+    """One asset of the quantdata payload, with the values ``Manager.get_asset_value`` knows by name."""
+
+    # get_asset_value name -> (attribute, payload key)
+    FIELDS = {
+        "Price": ("price", "Price"),
+        "1mVol": ("vol_1m", "1m 1x Volume (USDT)"),
+        "5mVol": ("vol_5m", "5m 1x Volume (USDT)"),
+        "1hVol": ("vol_1h", "1h 1x Volume (USDT)"),
+        "1mSpread": ("spread_1m", "1m Spread"),
+        "5mSpread": ("spread_5m", "5m Spread"),
+        "15mSpread": ("spread_15m", "15m Spread"),
+        "30mSpread": ("spread_30m", "30m Spread"),
+        "1hSpread": ("spread_1h", "1h Spread"),
+        "4hSpread": ("spread_4h", "4h Spread"),
+        "Trend": ("trend", "Trend"),
+        "Funding": ("funding", "Funding"),
+        "MFI": ("mfi", "MFI"),
+        "ERI Bull Power": ("eri_bull_power", "ERI Bull Power"),
+        "ERI Bear Power": ("eri_bear_power", "ERI Bear Power"),
+        "ERI Trend": ("eri_trend", "ERI Trend"),
+        "HMA Trend": ("hma_trend", "HMA Trend"),
+        "Top Signal 5m": ("top_signal_5m", "Top Signal 5m"),
+        "Bottom Signal 5m": ("bottom_signal_5m", "Bottom Signal 5m"),
+        "Top Signal 1m": ("top_signal_1m", "Top Signal 1m"),
+        "Bottom Signal 1m": ("bottom_signal_1m", "Bottom Signal 1m"),
+    }
+
+    # The linear lookup checked one key and read another for these; kept so strategies see the same values
+    LEGACY_KEYS = {
+        "1hVol": ("1m 1h Volume (USDT)", "1h 1x Volume (USDT)"),
+        "Bottom Signal 5m": ("Bottom Signal 5m", "Bottom signal 5m"),
+        "Bottom Signal 1m": ("Bottom Signal 1m", "Bottom signal 1m"),
+    }
+
+    __slots__ = ("asset", "raw", "api_data") + tuple(attr for attr, key in FIELDS.values())
+
+    def __init__(self, raw: dict):
+        self.asset = raw.get("Asset")
+        self.raw = raw
+        self.api_data = None
+        for name, (attr, key) in self.FIELDS.items():
+            setattr(self, attr, self._read(raw, name, key))
+
+    @classmethod
+    def _read(cls, raw: dict, name: str, key: str):
+        if name not in cls.LEGACY_KEYS:
+            return raw.get(key)
+        checked_key, read_key = cls.LEGACY_KEYS[name]
+        return raw.get(read_key) if checked_key in raw else None
+
+    def value(self, name: str):
+        field = self.FIELDS.get(name)
+        return getattr(self, field[0]) if field is not None else None
+
+
+class AssetIndex:
+    """
+    Symbol-keyed view of one quantdata payload, built once so per-symbol lookups do not scan the list.
+
+    ``version`` is the newest ``Timestamp`` in the payload; a re-download carrying the same version keeps the
+    existing index and its cached per-symbol ``api_data`` dicts.
+    """
+
+    def __init__(self, data):
+        self.source = data
+        self.records = {}
+        self.symbols = []
+        self.version = None
+
+        rows = data if isinstance(data, list) else []
+        for row in rows:
+            if not isinstance(row, dict) or "Asset" not in row:
+                continue
+            self.symbols.append(row.get("Asset", ""))
+            # The linear lookup returned the first matching row
+            self.records.setdefault(row["Asset"], AssetRecord(row))
+            timestamp = row.get("Timestamp")
+            if timestamp is not None and (self.version is None or str(timestamp) > str(self.version)):
+                self.version = timestamp
+
+    def get(self, symbol: str) -> Optional[AssetRecord]:
+        return self.records.get(symbol)
+
+    def api_data(self, symbol: str, fields: tuple) -> dict:
+        """The ``Manager.get_api_data`` dict of a symbol, built once per payload version."""
+        record = self.records.get(symbol)
+        if record is not None and record.api_data is not None:
+            return record.api_data
+        api_data = {
+            name: self.symbols if name == "Symbols" else record.value(name) if record is not None else None
+            for name in fields
+        }
+        if record is not None:
+            record.api_data = api_data
+        return api_data
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from threading import Lock
+
+from directionalscalper.core.strategies.logger import Logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logging = Logger(logger_name="LocalPayload", filename="LocalPayload.log", stream=True)
+
+MSGPACK_SUFFIXES = (".msgpack", ".mpk")
+
+# The scraper writes the JSON and its .msgpack copy back to back, the copy may land slightly before the JSON
+SIBLING_MTIME_TOLERANCE_NS = 2_000_000_000
+
+
+def msgpack_sibling(path: Path) -> Path:
+    """``quantdata.json`` -> ``quantdata.msgpack``, where the scraper writes the binary copy."""
+    return path.with_suffix(".msgpack")
+
+
+class LocalPayloadFile:
+    """
+    A signal file written by a co-located scraper, parsed only when it changes.
+
+    Reads stat() the file at most once per ``check_interval`` seconds and re-parse it only when its mtime,
+    size or inode moved (the scraper replaces it with a rename), so every symbol thread shares one parsed
+    payload. A ``.msgpack`` copy next to a JSON file is preferred when msgpack is installed and the copy is
+    not older than the JSON, so a copy left behind by an earlier scraper cannot shadow fresh JSON.
+    """
+
+    def __init__(self, path, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+
+        self.data = None
+        self.source = None
+        self.signature = None  # (path, inode, size, mtime_ns) of the parsed file
+        self.checked_at = 0.0
+        self.ignored_sibling = None  # (path, mtime_ns) of the outdated .msgpack copy last warned about
+        self.lock = Lock()
+
+    def _candidate(self) -> Path:
+        if msgpack is None or self.path.suffix in MSGPACK_SUFFIXES:
+            return self.path
+        sibling = msgpack_sibling(self.path)
+        try:
+            sibling_mtime = os.stat(sibling).st_mtime_ns
+        except FileNotFoundError:
+            return self.path
+        try:
+            json_mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return sibling
+        if sibling_mtime + SIBLING_MTIME_TOLERANCE_NS >= json_mtime:
+            return sibling
+        if self.ignored_sibling != (sibling, sibling_mtime):
+            logging.warning(f"{sibling} is older than {self.path}, reading the JSON instead")
+            self.ignored_sibling = (sibling, sibling_mtime)
+        return self.path
+
+    def _parse(self, path: Path):
+        if path.suffix in MSGPACK_SUFFIXES:
+            if msgpack is None:
+                raise ImportError(f"msgpack is required to read {path}, pip install msgpack")
+            with open(path, "rb") as f:
+                return msgpack.unpackb(f.read(), raw=False)
+        with open(path) as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError as exc:
+                raise ValueError(
+                    f"ERROR: Invalid JSON: {exc.msg}, line {exc.lineno}, column {exc.colno}"
+                )
+
+    def get(self):
+        """The parsed payload, re-read only if the file changed since the last check."""
+        if self.data is not None and time.time() - self.checked_at < self.check_interval:
+            return self.data
+        with self.lock:
+            if self.data is not None and time.time() - self.checked_at < self.check_interval:
+                return self.data
+            path = self._candidate()
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if self.data is not None:
+                    logging.warning(f"{path} disappeared, keeping the last payload")
+                    self.checked_at = time.time()
+                    return self.data
+                raise
+            signature = (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if signature != self.signature:
+                try:
+                    self.data = self._parse(path)
+                except ValueError as e:
+                    # Half-written file from a scraper that does not rename, try again on the next check
+                    if self.data is None:
+                        raise
+                    logging.warning(f"Failed to parse {path}, keeping the last payload: {e}")
+                    self.checked_at = time.time()
+                    return self.data
+                self.signature = signature
+                self.source = path
+            self.checked_at = time.time()
+            return self.data
@@ -1,7 +1,6 @@
 from __future__ import annotations
 from threading import Thread, Lock
 
-import fnmatch
 import time
 import json
 import logging
@@ -13,6 +12,11 @@ import requests  # type: ignore
 
 from directionalscalper.core.utils import send_public_request
 from directionalscalper.core.strategies.logger import Logger
+from .asset_index import AssetIndex
+from .payload_refresher import PayloadRefresher
+from .symbol_filter import RotatorFilterCache
+from .local_payload import LocalPayloadFile
+from .signal_engine import SignalEngine
 
 logging = Logger(logger_name="Exchange", filename="Exchange.log", stream=True)
 
@@ -36,6 +40,7 @@ class Manager:
         asset_value_cache_life_seconds: int = 10,
         path: Path | None = None,
         url: str = "",
+        signal_engine_ttl: float = 5.0,
     ):
         self.exchange = exchange
         self.exchange_name = exchange_name
@@ -52,14 +57,30 @@ class Manager:
         # Initialize the time when data was last checked
         self.last_checked = 0.0
         
-        # Initialize the main data cache and its expiry
+        # Initialize the main data cache
         self.data = {}
-        self.data_cache_expiry = datetime.now() - timedelta(seconds=self.cache_life_seconds)
         
         # Initialize the asset value cache and its expiry
         self.asset_value_cache = {}
         self.asset_value_cache_expiry = datetime.now() - timedelta(seconds=self.asset_value_cache_life_seconds)
 
+        # One background refresher per payload URL, polled every cache_life_seconds while it is being read
+        self.refreshers = {}
+        self.refreshers_lock = Lock()
+
+        # Local signal file, see local_payload.LocalPayloadFile
+        self.local_payload = None
+
+        # In-process signals for the embedded mode, see signal_engine.SignalEngine
+        self.signal_engine = None
+
+        # Rotator lists filtered once per payload and filter, see symbol_filter.RotatorFilterCache
+        self.rotator_filters = RotatorFilterCache()
+
+        # Symbol-keyed index of the latest quantdata payload, see get_asset_index
+        self.asset_index = None
+        self.asset_index_lock = Lock()
+
         # Attributes for caching
         self.rotator_symbols_cache = None
         self.rotator_symbols_cache_expiry = datetime.now() - timedelta(seconds=1)  # Initialize to an old timestamp to force first fetch
@@ -83,61 +104,56 @@ class Manager:
             logging.info(f"Local API directory: {self.path}")
             self.data = self.get_local_data()
 
+        elif self.api == "embedded":
+            # Signals computed in this process from the exchange's candles, only for the symbols in play
+            logging.info("API manager mode: embedded")
+            self.signal_engine = SignalEngine(self.exchange, ttl=signal_engine_ttl)
+            self.data = []
+
         else:
-            logging.error("API must be 'local' or 'remote'")
-            raise InvalidAPI(message="API must be 'local' or 'remote'")
+            logging.error("API must be 'local', 'remote' or 'embedded'")
+            raise InvalidAPI(message="API must be 'local', 'remote' or 'embedded'")
 
         self.update_last_checked()
 
     def update_last_checked(self):
         self.last_checked = datetime.now().timestamp()
 
+    def refresher_for(self, url: str) -> PayloadRefresher:
+        """The background refresher of a URL; it polls from its first read until nobody reads it for a while."""
+        with self.refreshers_lock:
+            refresher = self.refreshers.get(url)
+            if refresher is None:
+                refresher = self.refreshers[url] = PayloadRefresher(url, interval=self.cache_life_seconds)
+        return refresher
+
+    def get_payload_age(self, url: str = None):
+        """Seconds since the payload of ``url`` (the remote data URL by default) was last confirmed, None before the first."""
+        refresher = self.refreshers.get(url or self.url)
+        return refresher.age if refresher is not None else None
+
     def fetch_data_from_url(self, url, max_retries: int = 5):
-        current_time = datetime.now()
-        if current_time <= self.data_cache_expiry:
-            return self.data
-        for retry in range(max_retries):
-            delay = 2**retry  # exponential backoff
-            delay = min(60, delay)  # cap the delay to 60 seconds
-            try:
-                header, raw_json = send_public_request(url=url)
-                # Update the data cache and its expiry time
-                self.data = raw_json
-                self.data_cache_expiry = current_time + timedelta(seconds=self.cache_life_seconds)
-                return raw_json
-            except requests.exceptions.RequestException as e:
-                logging.error(f"Request failed: {e}")
-            except json.decoder.JSONDecodeError as e:
-                logging.error(f"Failed to parse JSON: {e}")
-            except Exception as e:
-                logging.error(f"Unexpected error occurred: {e}")
-            
-            # Wait before the next retry
-            if retry < max_retries - 1:
-                sleep(delay)
+        # Served from the background refresher, symbol threads never wait on the download
+        data = self.refresher_for(url).get()
+        return data if data is not None else []
 
-        # Return cached data if all retries fail
-        return self.data
-    
     def get_data(self):
         if self.api == "remote":
             return self.get_remote_data()
         if self.api == "local":
             return self.get_local_data()
+        if self.api == "embedded":
+            self.data = self.signal_engine.get_data()
+            return self.data
 
     def get_local_data(self):
-        if not self.check_timestamp():
-            return self.data
-        if not self.path.is_file():
-            raise InvalidAPI(message=f"{self.path} is not a file")
-        f = open(self.path)
+        # stat() per check, parsed again only when the scraper replaced the file
+        if self.local_payload is None:
+            self.local_payload = LocalPayloadFile(self.path)
         try:
-            self.data = json.load(f)
-        except json.JSONDecodeError as exc:
-            raise ValueError(
-                f"ERROR: Invalid JSON: {exc.msg}, line {exc.lineno}, column {exc.colno}"
-            )
-        self.update_last_checked()
+            self.data = self.local_payload.get()
+        except FileNotFoundError:
+            raise InvalidAPI(message=f"{self.path} is not a file")
         return self.data
 
     def is_cache_expired(self):
@@ -179,63 +195,22 @@ class Manager:
         logging.warning(f"Couldn't fetch symbols after {max_retries} attempts.")
         return []
 
+    def _filter_rotator_assets(self, url, min_qty_threshold, blacklist, whitelist, max_usd_value):
+        """Rotator assets of ``url`` passing the filters, None until the payload has been fetched."""
+        raw_json = self.refresher_for(url).get()
+        if not isinstance(raw_json, list):
+            logging.warning(f"No rotator payload from {url} yet. Expected a list of assets.")
+            return None
+        assets = self.rotator_filters.filter(url, raw_json, blacklist, whitelist, max_usd_value, min_qty_threshold)
+        logging.info(f"{len(assets)} of {len(raw_json)} assets from {url} pass the rotator filters")
+        if self.signal_engine is not None:
+            # Rotation candidates get their signals computed ahead of being picked
+            self.signal_engine.watch([asset.get("Asset", "") for asset in assets])
+        return assets
+
     def get_atrp_sorted_rotator_symbols(self, min_qty_threshold: float = None, blacklist: list = None, whitelist: list = None, max_usd_value: float = None, max_retries: int = 5):
         url = f"https://api.quantumvoid.org/volumedata/rotatorsymbols_{self.data_source_exchange}_atrp.json"
-        
-        for retry in range(max_retries):
-            delay = 2**retry  # exponential backoff
-            delay = min(58, delay)  # cap the delay to 30 seconds
-
-            try:
-                logging.info(f"Sending request to {url} (Attempt: {retry + 1})")
-                header, raw_json = send_public_request(url=url)
-                
-                if isinstance(raw_json, list):
-                    logging.info(f"Received {len(raw_json)} ATRP sorted rotator symbols from API")
-                    
-                    filtered_symbols = []
-                    for asset in raw_json:
-                        symbol = asset.get("Asset", "")
-                        min_qty = asset.get("Min qty", 0)
-                        usd_price = asset.get("Price", float('inf'))
-
-                        logging.info(f"Processing symbol {symbol} with min_qty {min_qty} and USD price {usd_price}")
-
-                        if blacklist and any(fnmatch.fnmatch(symbol, pattern) for pattern in blacklist):
-                            logging.info(f"Skipping {symbol} as it's in blacklist")
-                            continue
-
-                        if whitelist and symbol not in whitelist:
-                            logging.info(f"Skipping {symbol} as it's not in whitelist")
-                            continue
-
-                        # Check against the max_usd_value, if provided
-                        if max_usd_value is not None and usd_price > max_usd_value:
-                            logging.info(f"Skipping {symbol} as its USD price {usd_price} is greater than the max allowed {max_usd_value}")
-                            continue
-
-                        if min_qty_threshold is None or min_qty <= min_qty_threshold:
-                            filtered_symbols.append(asset)
-
-                    logging.info(f"Returning {len(filtered_symbols)} ATRP sorted rotator symbols")
-                    return filtered_symbols
-                else:
-                    logging.warning("Unexpected data format. Expected a list of ATRP sorted rotator symbols.")
-                    
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Request failed: {e}")
-            except json.decoder.JSONDecodeError as e:
-                logging.warning(f"Failed to parse JSON: {e}. Response: {raw_json}")
-            except Exception as e:
-                logging.warning(f"Unexpected error occurred: {e}")
-
-            # Wait before the next retry
-            if retry < max_retries - 1:
-                sleep(delay)
-        
-        # If all retries fail, return an empty list
-        logging.warning(f"Couldn't fetch ATRP sorted rotator symbols after {max_retries} attempts.")
-        return []
+        return self._filter_rotator_assets(url, min_qty_threshold, blacklist, whitelist, max_usd_value) or []
 
     def get_bullish_rotator_symbols(self, min_qty_threshold: float = None, blacklist: list = None, whitelist: list = None, max_usd_value: float = None, max_retries: int = 5):
         url = f"https://api.quantumvoid.org/volumedata/rotatorsymbols_{self.data_source_exchange}_bullish.json"
@@ -246,130 +221,23 @@ class Manager:
         return self._get_rotator_symbols(url, min_qty_threshold, blacklist, whitelist, max_usd_value, max_retries)
 
     def _get_rotator_symbols(self, url, min_qty_threshold, blacklist, whitelist, max_usd_value, max_retries):
-        for retry in range(max_retries):
-            delay = 2**retry  # exponential backoff
-            delay = min(58, delay)  # cap the delay to 30 seconds
-
-            try:
-                logging.info(f"Sending request to {url} (Attempt: {retry + 1})")
-                header, raw_json = send_public_request(url=url)
-
-                if isinstance(raw_json, list):
-                    logging.info(f"Received {len(raw_json)} assets from API")
-                    symbols = []
-                    for asset in raw_json:
-                        symbol = asset.get("Asset", "")
-                        min_qty = asset.get("Min qty", 0)
-                        usd_price = asset.get("Price", float('inf'))
-
-                        logging.info(f"Processing symbol {symbol} with min_qty {min_qty} and USD price {usd_price}")
-
-                        if blacklist and any(fnmatch.fnmatch(symbol, pattern) for pattern in blacklist):
-                            logging.info(f"Skipping {symbol} as it's in blacklist")
-                            continue
-
-                        if whitelist and symbol not in whitelist:
-                            logging.info(f"Skipping {symbol} as it's not in whitelist")
-                            continue
-
-                        # Check against the max_usd_value, if provided
-                        if max_usd_value is not None and usd_price > max_usd_value:
-                            logging.info(f"Skipping {symbol} as its USD price {usd_price} is greater than the max allowed {max_usd_value}")
-                            continue
-
-                        if min_qty_threshold is None or min_qty <= min_qty_threshold:
-                            symbols.append(symbol)
-
-                    logging.info(f"Returning {len(symbols)} symbols")
-                    return symbols
-                else:
-                    logging.warning("Unexpected data format. Expected a list of assets.")
-
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Request failed: {e}")
-            except json.decoder.JSONDecodeError as e:
-                logging.warning(f"Failed to parse JSON: {e}. Response: {raw_json}")
-            except Exception as e:
-                logging.warning(f"Unexpected error occurred: {e}")
-
-            # Wait before the next retry
-            if retry < max_retries - 1:
-                sleep(delay)
-
-        # If all retries fail, return an empty list
-        logging.warning(f"Couldn't fetch rotator symbols after {max_retries} attempts.")
-        return []
-
+        assets = self._filter_rotator_assets(url, min_qty_threshold, blacklist, whitelist, max_usd_value)
+        return [asset.get("Asset", "") for asset in assets or []]
 
     def get_auto_rotate_symbols(self, min_qty_threshold: float = None, blacklist: list = None, whitelist: list = None, max_usd_value: float = None, max_retries: int = 5):
-        if self.rotator_symbols_cache and not self.is_cache_expired():
-            return self.rotator_symbols_cache
-
-        symbols = []
         url = f"https://api.quantumvoid.org/volumedata/rotatorsymbols_{self.data_source_exchange}.json"
-        
-        for retry in range(max_retries):
-            delay = 2**retry  # exponential backoff
-            delay = min(58, delay)  # cap the delay to 30 seconds
-
-            try:
-                logging.info(f"Sending request to {url} (Attempt: {retry + 1})")
-                header, raw_json = send_public_request(url=url)
-                
-                if isinstance(raw_json, list):
-                    logging.info(f"Received {len(raw_json)} assets from API")
-                    
-                    for asset in raw_json:
-                        symbol = asset.get("Asset", "")
-                        min_qty = asset.get("Min qty", 0)
-                        usd_price = asset.get("Price", float('inf')) 
-                        
-                        logging.info(f"Processing symbol {symbol} with min_qty {min_qty} and USD price {usd_price}")
-
-                        if blacklist and any(fnmatch.fnmatch(symbol, pattern) for pattern in blacklist):
-                            logging.info(f"Skipping {symbol} as it's in blacklist")
-                            continue
-
-                        if whitelist and symbol not in whitelist:
-                            logging.info(f"Skipping {symbol} as it's not in whitelist")
-                            continue
-
-                        # Check against the max_usd_value, if provided
-                        if max_usd_value is not None and usd_price > max_usd_value:
-                            logging.info(f"Skipping {symbol} as its USD price {usd_price} is greater than the max allowed {max_usd_value}")
-                            continue
-
-                        if min_qty_threshold is None or min_qty <= min_qty_threshold:
-                            symbols.append(symbol)
-
-                    logging.info(f"Returning {len(symbols)} symbols")
-                    
-                    # If successfully fetched, update the cache and its expiry time
-                    if symbols:
-                        self.rotator_symbols_cache = symbols
-                        self.rotator_symbols_cache_expiry = datetime.now() + timedelta(seconds=self.cache_life_seconds)
-
-                    return symbols
-
-                else:
-                    logging.warning("Unexpected data format. Expected a list of assets.")
-                    
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Request failed: {e}")
-            except json.decoder.JSONDecodeError as e:
-                logging.warning(f"Failed to parse JSON: {e}. Response: {raw_json}")
-            except Exception as e:
-                logging.warning(f"Unexpected error occurred: {e}")
+        assets = self._filter_rotator_assets(url, min_qty_threshold, blacklist, whitelist, max_usd_value)
+        if assets is None:
+            # Return cached symbols until the first payload arrives
+            logging.warning("Couldn't fetch rotator symbols. Using cached symbols.")
+            return self.rotator_symbols_cache or []
+
+        symbols = [asset.get("Asset", "") for asset in assets]
+        if symbols:
+            self.rotator_symbols_cache = symbols
+            self.rotator_symbols_cache_expiry = datetime.now() + timedelta(seconds=self.cache_life_seconds)
+        return symbols
 
-            # Wait before the next retry
-            if retry < max_retries - 1:
-                sleep(delay)
-        
-        # Return cached symbols if all retries fail
-        logging.warning(f"Couldn't fetch rotator symbols after {max_retries} attempts. Using cached symbols.")
-        return self.rotator_symbols_cache or []
-
-    
     def get_symbols(self):
         url = f"https://api.quantumvoid.org/volumedata/quantdatav2_bybit.json"
         try:
@@ -398,31 +266,36 @@ class Manager:
     #     return self.data
 
     def get_remote_data(self):
-            if not self.check_timestamp():
-                return self.data
-            while True:  # Keep trying until a successful request is made
-                try:
-                    header, raw_json = send_public_request(url=self.url)
-                    self.data = raw_json
-                    break  # if the request was successful, break the loop
-                except requests.exceptions.RequestException as e:
-                    logging.info(f"Request failed: {e}, retrying...")
-                except json.decoder.JSONDecodeError as e:
-                    logging.info(f"Failed to parse JSON: {e}, retrying...")
-                except Exception as e:
-                    logging.info(f"Unexpected error occurred: {e}, retrying...")
-                finally:
-                    self.update_last_checked()
-            return self.data
+        data = self.refresher_for(self.url).get()
+        if data is not None:
+            self.data = data
+        return self.data
 
     def check_timestamp(self):
         return datetime.now().timestamp() - self.last_checked > self.cache_life_seconds
 
+    def get_asset_index(self, data) -> AssetIndex:
+        """Symbol-keyed index of a payload, rebuilt only when a new payload version arrives."""
+        index = self.asset_index
+        if index is not None and index.source is data:
+            return index
+        with self.asset_index_lock:
+            index = self.asset_index
+            if index is not None and index.source is data:
+                return index
+            new_index = AssetIndex(data)
+            if index is not None and new_index.version is not None and new_index.version == index.version:
+                # Same payload downloaded again, keep the per-symbol records already built
+                index.source = data
+                return index
+            self.asset_index = new_index
+            return new_index
+
     def get_asset_data(self, symbol: str, data):
         try:
-            for asset in data:
-                if asset["Asset"] == symbol:
-                    return asset
+            record = self.get_asset_index(data).get(symbol)
+            if record is not None:
+                return record.raw
         except Exception as e:
             logging.info(f"{e}")
         return None
@@ -435,50 +308,9 @@ class Manager:
 
     def get_asset_value(self, symbol: str, data, value: str):
         try:
-            asset_data = self.get_asset_data(symbol, data)
-            if asset_data is not None:
-                if value == "Price" and "Price" in asset_data:
-                    return asset_data["Price"]
-                if value == "1mVol" and "1m 1x Volume (USDT)" in asset_data:
-                    return asset_data["1m 1x Volume (USDT)"]
-                if value == "5mVol" and "5m 1x Volume (USDT)" in asset_data:
-                    return asset_data["5m 1x Volume (USDT)"]
-                if value == "1hVol" and "1m 1h Volume (USDT)" in asset_data:
-                    return asset_data["1h 1x Volume (USDT)"]
-                if value == "1mSpread" and "1m Spread" in asset_data:
-                    return asset_data["1m Spread"]
-                if value == "5mSpread" and "5m Spread" in asset_data:
-                    return asset_data["5m Spread"]
-                if value == "15mSpread" and "15m Spread" in asset_data:
-                    return asset_data["15m Spread"]
-                if value == "30mSpread" and "30m Spread" in asset_data:
-                    return asset_data["30m Spread"]
-                if value == "1hSpread" and "1h Spread" in asset_data:
-                    return asset_data["1h Spread"]
-                if value == "4hSpread" and "4h Spread" in asset_data:
-                    return asset_data["4h Spread"]
-                if value == "Trend" and "Trend" in asset_data:
-                    return asset_data["Trend"]
-                if value == "Funding" and "Funding" in asset_data:
-                    return asset_data["Funding"]
-                if value == "MFI" and "MFI" in asset_data:
-                    return asset_data["MFI"]
-                if value == "ERI Bull Power" in asset_data:
-                    return asset_data["ERI Bull Power"]
-                if value == "ERI Bear Power" in asset_data:
-                    return asset_data["ERI Bear Power"]
-                if value == "ERI Trend" in asset_data:
-                    return asset_data["ERI Trend"]
-                if value == "HMA Trend" in asset_data:
-                    return asset_data["HMA Trend"]
-                if value == "Top Signal 5m" in asset_data:
-                    return asset_data["Top Signal 5m"]
-                if value == "Bottom Signal 5m" in asset_data:
-                    return asset_data["Bottom signal 5m"]
-                if value == "Top Signal 1m" in asset_data:
-                    return asset_data["Top Signal 1m"]
-                if value == "Bottom Signal 1m" in asset_data:
-                    return asset_data["Bottom signal 1m"]
+            record = self.get_asset_index(data).get(symbol)
+            if record is not None:
+                return record.value(value)
         except Exception as e:
             logging.info(f"{e}")
         return None
@@ -486,33 +318,18 @@ class Manager:
     def is_api_data_cache_expired(self):
         return datetime.now() > self.api_data_cache_expiry
 
+    API_DATA_FIELDS = (
+        '1mVol', '5mVol', '1hVol', '1mSpread', '5mSpread', '30mSpread', '1hSpread', '4hSpread', 'Trend', 'HMA Trend',
+        'MFI', 'ERI Trend', 'Funding', 'Symbols', 'Top Signal 5m', 'Bottom Signal 5m', 'Top Signal 1m', 'Bottom Signal 1m',
+    )
+
     def get_api_data(self, symbol):
+        if self.signal_engine is not None:
+            return self.signal_engine.get_api_data(symbol, self.API_DATA_FIELDS)
         api_data_url = f"https://api.quantumvoid.org/data/quantdatav2_{self.data_source_exchange}.json"
         data = self.fetch_data_from_url(api_data_url)
-
-        symbols = [asset.get("Asset", "") for asset in data if "Asset" in asset]
-        
-        api_data = {
-            '1mVol': self.get_asset_value(symbol, data, "1mVol"),
-            '5mVol': self.get_asset_value(symbol, data, "5mVol"),
-            '1hVol': self.get_asset_value(symbol, data, "1hVol"),
-            '1mSpread': self.get_asset_value(symbol, data, "1mSpread"),
-            '5mSpread': self.get_asset_value(symbol, data, "5mSpread"),
-            '30mSpread': self.get_asset_value(symbol, data, "30mSpread"),
-            '1hSpread': self.get_asset_value(symbol, data, "1hSpread"),
-            '4hSpread': self.get_asset_value(symbol, data, "4hSpread"),
-            'Trend': self.get_asset_value(symbol, data, "Trend"),
-            'HMA Trend': self.get_asset_value(symbol, data, "HMA Trend"),
-            'MFI': self.get_asset_value(symbol, data, "MFI"),
-            'ERI Trend': self.get_asset_value(symbol, data, "ERI Trend"),
-            'Funding': self.get_asset_value(symbol, data, "Funding"),
-            'Symbols': symbols,
-            'Top Signal 5m': self.get_asset_value(symbol, data, "Top Signal 5m"),
-            'Bottom Signal 5m': self.get_asset_value(symbol, data, "Bottom Signal 5m"),
-            'Top Signal 1m': self.get_asset_value(symbol, data, "Top Signal 1m"),
-            'Bottom Signal 1m': self.get_asset_value(symbol, data, "Bottom Signal 1m")
-        }
-        return api_data
+        # One dict lookup, and the same dict for every call until the payload changes
+        return self.get_asset_index(data).api_data(symbol, self.API_DATA_FIELDS)
 
     # def get_api_data(self, symbol):
     #     api_data_url = f"http://apiv3.tradesimple.xyz/data/quantdatav2_{self.data_source_exchange}.json"
@@ -9,7 +9,6 @@ from multiprocessing import Process, Pool
 
 import pandas as pd
 import pidfile
-import ta
 import numpy as np
 
 from decimal import Decimal, ROUND_HALF_UP
@@ -19,12 +18,25 @@ from datetime import datetime
 sys.path.append(".")
 from directionalscalper.api.exchanges.binance import Binance
 from directionalscalper.api.exchanges.bybit import Bybit
+from directionalscalper.core import indicators
 from directionalscalper.core.utils import send_public_request
 from directionalscalper.core.logger import Logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 log = Logger(filename="combined_scraper.log", stream=True)
 
 funding_cache = {}  # We will handle cache differently in multiprocessing if needed
 
+
+def kline_column(bars, column: str) -> np.ndarray:
+    """One field of ``get_futures_kline`` bars as a float64 array for the indicator kernels."""
+    return np.array([bar[column] for bar in bars], dtype=np.float64)
+
+
 class CombinedScraper:
     def __init__(self, exchange_name, filters: dict):
         self.funding_cache = {}  # Local cache for each process
@@ -119,6 +131,11 @@ class CombinedScraper:
             dataframe.to_csv(path, index=False)
         elif to == "parquet":
             dataframe.to_parquet(path)
+        elif to == "msgpack":
+            # Same records as the JSON output, in the compact form the bot's local mode prefers
+            records = json.loads(dataframe.to_json(orient="records", date_format='iso'))
+            with open(path, "wb") as f:
+                f.write(msgpack.packb(records, use_bin_type=True))
         elif to == "dict":
             dataframe.to_dict(path, orient="records")
         else:
@@ -218,51 +235,27 @@ class CombinedScraper:
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df['HMA'] = self.compute_hma(df, column, window)
-        hma_order_pct = round((df[column].iloc[-1] - df['HMA'].iloc[-1]) / df[column].iloc[-1] * 100, 4)
+        values = kline_column(bars, column)
+        hma = indicators.hma(values, window)
+        hma_order_pct = round((values[-1] - hma[-1]) / values[-1] * 100, 4)
 
         return hma_order_pct
 
     def compute_hma(self, df, column: str, window: int):
-        # Step 1
-        wma_half_period = df[column].rolling(window=int(window/2)).mean()
-
-        # Step 2
-        wma_full_period = df[column].rolling(window=window).mean()
-
-        # Step 3
-        series2 = 2 * wma_half_period - wma_full_period
-
-        # Step 4 & 5
-        hma = series2.rolling(window=int(np.sqrt(window))).mean()
-        return hma
+        return pd.Series(indicators.hma(df[column], window), index=df.index)
 
     def get_ema(self, symbol: str, interval: str, limit: int, column: str, window: int):
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )  # 1m, 18, 6
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df[f"EMA{window} {column}"] = ta.trend.EMAIndicator(
-            df[column], window=window
-        ).ema_indicator()
-        return round(
-            (df[f"EMA{window} {column}"][limit - 1]).astype(float),
-            self.symbols["price_scale"],
-        )
+        ema = indicators.ema(kline_column(bars, column), window, min_periods=window)
+        return round(float(ema[limit - 1]), self.symbols["price_scale"])
 
     def get_sma(self, symbol: str, interval: str, limit: int, column: str, window: int):
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        sma = ta.trend.SMAIndicator(df[column], window=window).sma_indicator()
+        sma = indicators.sma(kline_column(bars, column), window)
 
         current_sma = float(sma[limit - 1])
 
@@ -299,34 +292,22 @@ class CombinedScraper:
         """
         # Fetching data
         data = self.exchange.get_futures_kline(symbol=symbol, interval=timeframe, limit=limit)
+        close = kline_column(data, 'close')
 
-        # Create a DataFrame from the data
-        df = pd.DataFrame(data, columns=["timestamp", "open", "high", "low", "close", "volume"])
-        df[['open', 'high', 'low', 'close', 'volume']] = df[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric)
-
-        # Calculate VWMA (Volume Weighted Moving Average)
-        vwma = ((df['close'] * df['volume']).rolling(window=len_slow_ma).sum() / df['volume'].rolling(window=len_slow_ma).sum())
-
-        # Calculate EMA of VWMA
-        slow_vwma_ema = vwma.ewm(span=len_slow_ma, adjust=False).mean()
+        # VWMA followed by an EMA, and the EMA-smoothed bull and bear power against it
+        slow_vwma_ema, bull_power_smoothed, bear_power_smoothed = indicators.eri(
+            kline_column(data, 'high'), kline_column(data, 'low'), close, kline_column(data, 'volume'),
+            len_slow_ma, len_power_ema
+        )
 
         # Determine the trend
-        last_price = df['close'].values[-1]
-        eri_trend = "bullish" if last_price > slow_vwma_ema.values[-1] else "bearish"
-
-        # Calculate bull power and bear power
-        bull_power = df['high'] - slow_vwma_ema
-        bear_power = df['low'] - slow_vwma_ema
-
-        # Smooth the power values using EMA
-        bull_power_smoothed = bull_power.ewm(span=len_power_ema, adjust=False).mean()
-        bear_power_smoothed = bear_power.ewm(span=len_power_ema, adjust=False).mean()
+        eri_trend = "bullish" if close[-1] > slow_vwma_ema[-1] else "bearish"
 
         # Prepare results
         result = {
             "ERI Trend": eri_trend,
-            "ERI Bull Power": bull_power_smoothed.values[-1],
-            "ERI Bear Power": bear_power_smoothed.values[-1]
+            "ERI Bull Power": bull_power_smoothed[-1],
+            "ERI Bear Power": bear_power_smoothed[-1]
         }
 
         return result
@@ -447,29 +428,22 @@ class CombinedScraper:
     # Get MFIRSI
     def get_mfi(self, symbol: str, interval: str, limit: int, lookback: int = 30) -> str:
         bars = self.exchange.get_futures_kline(symbol=symbol, interval=interval, limit=limit)
-        df = pd.DataFrame(bars, columns=["timestamp", "open", "high", "low", "close", "volume"])
-
-        # Calculate MFI, RSI, MA and whether open < close
-        df['mfi'] = ta.volume.MFIIndicator(
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
-            volume=df['volume'],
-            window=14,
-            fillna=False
-        ).money_flow_index()
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-        df['open_less_close'] = (df['open'] < df['close']).astype(int)
-        
+        close = kline_column(bars, 'close')
+
+        # Calculate MFI, RSI and whether open < close
+        mfi = indicators.mfi(kline_column(bars, 'high'), kline_column(bars, 'low'), close, kline_column(bars, 'volume'), window=14)
+        rsi = indicators.rsi(close, window=14)
+        open_less_close = kline_column(bars, 'open') < close
+
         # Calculate conditions
 
         # Using more extreme thresholds for MFIRSI signals
 
-        df['buy_condition'] = ((df['mfi'] < 30) & (df['rsi'] < 40) & (df['open_less_close'] == 1)).astype(int)
-        df['sell_condition'] = ((df['mfi'] > 80) & (df['rsi'] > 70) & (df['open_less_close'] == 0)).astype(int)
+        buy_condition = (mfi < 30) & (rsi < 40) & open_less_close
+        sell_condition = (mfi > 80) & (rsi > 70) & ~open_less_close
 
         # Look for conditions in the last `lookback` bars
-        last_conditions = df.iloc[-lookback:][['buy_condition', 'sell_condition']].values
+        last_conditions = list(zip(buy_condition[-lookback:], sell_condition[-lookback:]))
 
         # Check the last conditions and return accordingly
         for buy, sell in reversed(last_conditions):
@@ -802,21 +776,11 @@ class CombinedScraper:
         raise Exception(f"Failed to analyse {symbol} after {retry_limit} attempts.")
 
     def detect_peaks_and_troughs(self, prices):
-        peaks = []
-        troughs = []
-        for i in range(1, len(prices) - 1):
-            if prices[i-1] < prices[i] > prices[i+1]:
-                peaks.append(i)
-            elif prices[i-1] > prices[i] < prices[i+1]:
-                troughs.append(i)
-        return peaks, troughs
+        peaks, troughs = indicators.peaks_and_troughs(prices)
+        return peaks.tolist(), troughs.tolist()
 
     def linear_regression(self, prices):
-        x = np.arange(len(prices))
-        y = np.array(prices)
-        A = np.vstack([x, np.ones(len(x))]).T
-        m, c = np.linalg.lstsq(A, y, rcond=None)[0]
-        return m, c  # Slope and intercept
+        return indicators.linear_regression(prices)  # Slope and intercept
     
     def calculate_distance_from_line(self, price, slope, intercept, index):
         """Calculate the vertical distance of a price from the linear regression line."""
@@ -929,6 +893,13 @@ def run_scraper_for_exchange(exchange_name: str):
                 # Rename the temporary file to the main file (atomic operation)
                 os.rename(temp_path_quant, main_path_quant)
 
+                # Binary copy next to the JSON for bots running in local mode on this host
+                if msgpack is not None:
+                    main_path_msgpack = f"/var/www/api/data/quantdatav2_{exchange_name}.msgpack"
+                    temp_path_msgpack = f"/var/www/api/data/quantdatav2_{exchange_name}_temp.msgpack"
+                    scraper.output_df(dataframe=df, path=temp_path_msgpack, to="msgpack")
+                    os.rename(temp_path_msgpack, main_path_msgpack)
+
                 # If the exchange is bybit, save to the old path as well
                 if exchange_name == "bybit":
                     old_path = "/var/www/api/data/quantdatav2.json"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import requests  # type: ignore
+
+from directionalscalper.core import utils
+from directionalscalper.core.exchanges.retry_scheduler import RetryScheduler
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="PayloadRefresher", filename="PayloadRefresher.log", stream=True)
+
+
+class PayloadRefresher:
+    """
+    Latest JSON payload of one URL, polled every ``interval`` seconds on a background thread.
+
+    Polls send ``If-None-Match`` / ``If-Modified-Since`` so an unchanged payload costs a 304 and no parsing.
+    Readers get the last good payload straight away while a poll is in flight or failing; ``age`` tells how
+    long ago the server last confirmed it. Only reads in the first ``first_payload_timeout`` seconds wait for a payload.
+
+    Polling starts with the first read and pauses once nobody has read the payload for ``idle_timeout`` seconds
+    (ten intervals by default); the next read resumes it.
+    """
+
+    def __init__(self, url: str, interval: float = 30, timeout: float = 10, first_payload_timeout: float = 30,
+                 idle_timeout: float = None):
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.first_payload_timeout = first_payload_timeout
+        self.idle_timeout = idle_timeout if idle_timeout is not None else 10 * interval
+
+        self.data = None
+        self.etag = None
+        self.last_modified = None
+        self.confirmed_at = 0.0  # Last 200 or 304
+
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.thread_lock = threading.Lock()
+        self.started_at = None
+        self.last_read_at = 0.0
+        self.retry_scheduler = RetryScheduler.for_process()
+
+    def start(self) -> "PayloadRefresher":
+        with self.thread_lock:
+            if self.thread is None and not self.stopped.is_set():
+                if self.started_at is None:
+                    self.started_at = time.time()
+                self.last_read_at = max(self.last_read_at, time.time())
+                self.thread = threading.Thread(target=self._run, name=f"PayloadRefresher-{self.url}", daemon=True)
+                self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        while not self.stopped.is_set():
+            with self.thread_lock:
+                if time.time() - self.last_read_at > self.idle_timeout:
+                    logging.info(f"No reads of {self.url} for {self.idle_timeout:.0f}s, pausing its refresher")
+                    self.thread = None
+                    return
+            self.refresh()
+            self.stopped.wait(self.interval)
+        with self.thread_lock:
+            self.thread = None
+
+    def _fetch(self):
+        headers = {"Accept": "application/json"}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        response = utils.session_pool.request("GET", self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        payload = response.json()
+        if not payload:
+            raise requests.exceptions.RequestException(f"Empty payload from {self.url}")
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        return payload
+
+    def refresh(self) -> bool:
+        """Poll once; on failure the previous payload stays in place."""
+        try:
+            # Retries end before the next poll is due
+            payload = self.retry_scheduler.call(f"remote_data:{self.url}", self._fetch, deadline=self.interval)
+        except Exception as e:
+            logging.warning(f"Failed to refresh {self.url}, serving a {self.age or 0:.0f}s old payload: {e}")
+            return False
+        if payload is not None:
+            self.data = payload
+        self.confirmed_at = time.time()
+        self.ready.set()
+        return True
+
+    def get(self):
+        """The last good payload, None if none has arrived yet."""
+        self.last_read_at = time.time()
+        if self.thread is None:
+            self.start()
+        if self.data is None and self.started_at is not None:
+            # Only the start-up window is waited out, later reads return straight away
+            self.ready.wait(max(0.0, self.started_at + self.first_payload_timeout - time.time()))
+        return self.data
+
+    @property
+    def age(self):
+        """Seconds since the server last confirmed the payload, None before the first one."""
+        if not self.confirmed_at:
+            return None
+        return time.time() - self.confirmed_at
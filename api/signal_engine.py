@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from threading import Lock
+
+import numpy as np
+
+from directionalscalper.core import indicators
+from directionalscalper.core.exchanges.candle_store import OPEN, HIGH, LOW, CLOSE, VOLUME
+from directionalscalper.core.exchanges.single_flight import SingleFlight
+from directionalscalper.core.strategies.logger import Logger
+from .asset_index import AssetRecord
+
+logging = Logger(logger_name="SignalEngine", filename="SignalEngine.log", stream=True)
+
+
+def spread(candles) -> float:
+    """High-low range of the candles as a percentage of the highest high."""
+    highest_high = candles[:, HIGH].max()
+    lowest_low = candles[:, LOW].min()
+    if highest_high > 0:
+        return round((highest_high - lowest_low) / highest_high * 100, 4)
+    return 0.0
+
+
+def sma_order_pct(candles, window: int = 14) -> float:
+    close = candles[:, CLOSE]
+    last_close = close[-1]
+    return round((last_close - indicators.sma(close, window)[-1]) / last_close * 100, 4)
+
+
+def hma_order_pct(candles, window: int = 14) -> float:
+    close = candles[:, CLOSE]
+    return round((close[-1] - indicators.hma(close, window)[-1]) / close[-1] * 100, 4)
+
+
+def ma6_high_low(candles):
+    return indicators.sma(candles[:, HIGH], 6)[-1], indicators.sma(candles[:, LOW], 6)[-1]
+
+
+def mfirsi_signal(candles, lookback: int = 30) -> str:
+    """'long' / 'short' from the newest MFI+RSI extreme in the last ``lookback`` bars, 'neutral' without one."""
+    close = candles[:, CLOSE]
+    mfi = indicators.mfi(candles[:, HIGH], candles[:, LOW], close, candles[:, VOLUME], window=14)
+    rsi = indicators.rsi(close, window=14)
+    green = candles[:, OPEN] < close
+    buy = ((mfi < 30) & (rsi < 40) & green)[-lookback:]
+    sell = ((mfi > 80) & (rsi > 70) & ~green)[-lookback:]
+    for is_buy, is_sell in zip(buy[::-1], sell[::-1]):
+        if is_buy:
+            return 'long'
+        if is_sell:
+            return 'short'
+    return 'neutral'
+
+
+def advanced_eri(candles, len_slow_ma: int = 64, len_power_ema: int = 13) -> dict:
+    """Elder-ray index on an EMA of the VWMA, as ``CombinedScraper.calculate_advanced_eri``."""
+    slow_vwma_ema, bull_power, bear_power = indicators.eri(
+        candles[:, HIGH], candles[:, LOW], candles[:, CLOSE], candles[:, VOLUME], len_slow_ma, len_power_ema
+    )
+    return {
+        "ERI Trend": "bullish" if candles[-1, CLOSE] > slow_vwma_ema[-1] else "bearish",
+        "ERI Bull Power": bull_power[-1],
+        "ERI Bear Power": bear_power[-1],
+    }
+
+
+def top_bottom_signals(candles, pd_tb: int = 22, ph_tb: float = 0.90, pl_tb: float = 1.10):
+    """Williams' Vix Fix top and bottom flags of the newest candle."""
+    highest_close = indicators.rolling_max(candles[:, CLOSE], pd_tb)
+    wvf = (highest_close - candles[:, LOW]) / highest_close * 100
+    top = wvf[-1] >= indicators.rolling_max(wvf, pd_tb)[-1] * ph_tb
+    bottom = wvf[-1] <= indicators.rolling_min(wvf, pd_tb)[-1] * pl_tb
+    return bool(top), bool(bottom)
+
+
+class SignalEngine:
+    """
+    The quantdata fields of ``api/multiprocessing_api.py``, computed in-process from the exchange's candle store.
+
+    Only symbols the bot asks about (``get_api_data``) or ``watch``es as rotation candidates are analysed, each
+    at most once per ``ttl`` seconds with concurrent callers sharing the result. Rows have the same keys and
+    units as the scraper's payload, so ``get_data``, ``get_api_data`` and the asset lookups behave as Manager's.
+    """
+
+    FUNDING_TTL = 300
+    WATCH_EXPIRY = 600  # Symbols nobody asked about for this long are dropped
+
+    def __init__(self, exchange, ttl: float = 5.0):
+        self.exchange = exchange
+        self.ttl = ttl
+
+        self.watched = {}  # symbol -> last time it was asked for
+        self.rows = {}  # symbol -> last good row
+        self.funding = {}  # symbol -> (time, funding %)
+        self.lock = Lock()
+        self.single_flight = SingleFlight()
+
+    def watch(self, symbols):
+        now = time.time()
+        with self.lock:
+            for symbol in symbols:
+                self.watched[symbol] = now
+
+    def unwatch(self, symbols):
+        with self.lock:
+            for symbol in symbols:
+                self.watched.pop(symbol, None)
+
+    @property
+    def symbols(self) -> list:
+        expired_before = time.time() - self.WATCH_EXPIRY
+        with self.lock:
+            for symbol in [symbol for symbol, asked_at in self.watched.items() if asked_at < expired_before]:
+                del self.watched[symbol]
+                self.rows.pop(symbol, None)
+            return list(self.watched)
+
+    def _candles(self, symbol, timeframe, limit):
+        return np.array(self.exchange.get_ohlcv_array(symbol, timeframe, limit), dtype=np.float64)
+
+    def _funding_pct(self, symbol):
+        ticker_snapshot = getattr(self.exchange, 'ticker_snapshot', None)
+        if ticker_snapshot is not None:
+            rate = ticker_snapshot.get_funding_rate(symbol)
+            if rate is not None:
+                return rate * 100
+        cached = self.funding.get(symbol)
+        if cached is not None and time.time() - cached[0] < self.FUNDING_TTL:
+            return cached[1]
+        rate = self.exchange.exchange.fetch_funding_rate(symbol)['fundingRate'] * 100
+        self.funding[symbol] = (time.time(), rate)
+        return rate
+
+    def _min_qty(self, symbol):
+        market_metadata = getattr(self.exchange, 'market_metadata', None)
+        market = market_metadata.get(symbol) if market_metadata is not None else None
+        return market.min_qty if market is not None else None
+
+    def analyse_symbol(self, symbol: str) -> dict:
+        """One payload row for ``symbol``, same keys as ``CombinedScraper.analyse_symbol``."""
+        values = {"Asset": symbol, "Min qty": self._min_qty(symbol)}
+        price = self.exchange.get_current_price(symbol)
+        values["Price"] = price
+
+        candles_1m = self._candles(symbol, "1m", 240)
+        values["1m Spread"] = spread(candles_1m[-1:])
+        values["5m Spread"] = spread(candles_1m[-5:])
+        values["30m Spread"] = spread(candles_1m[-30:])
+        values["1h Spread"] = spread(candles_1m[-60:])
+        values["4h Spread"] = spread(candles_1m)
+
+        candles_5m = self._candles(symbol, "5m", 240)
+
+        # Volume of the open candle of each timeframe in USDT
+        values["1m 1x Volume (USDT)"] = round(price * candles_1m[-1, VOLUME])
+        values["5m 1x Volume (USDT)"] = round(price * candles_5m[-1, VOLUME])
+        for timeframe in ("30m", "1h"):
+            values[f"{timeframe} 1x Volume (USDT)"] = round(price * self._candles(symbol, timeframe, 5)[-1, VOLUME])
+
+        values["5m MA6 high"], values["5m MA6 low"] = ma6_high_low(candles_5m[-20:])
+
+        values["trend%"] = sma_order_pct(candles_1m[-30:])
+        values["Trend"] = "short" if values["trend%"] > 0 else "long"
+
+        values["Funding"] = self._funding_pct(symbol)
+        values["Timestamp"] = str(int(datetime.now().timestamp()))
+
+        values["MFI"] = mfirsi_signal(candles_1m[-200:], lookback=30)
+        values.update(advanced_eri(self._candles(symbol, "15m", 128)))
+
+        values["hma_trend%"] = hma_order_pct(candles_1m[-30:])
+        values["HMA Trend"] = "short" if values["hma_trend%"] > 0 else "long"
+
+        values["Top Signal 5m"], values["Bottom Signal 5m"] = top_bottom_signals(candles_5m)
+        values["Top Signal 1m"], values["Bottom Signal 1m"] = top_bottom_signals(candles_1m)
+        return values
+
+    def get_row(self, symbol: str):
+        """The row of ``symbol``, recomputed when older than ``ttl``; the last good row if that fails."""
+        try:
+            row = self.single_flight.do(('row', symbol), lambda: self.analyse_symbol(symbol), ttl=self.ttl)
+        except Exception as e:
+            logging.warning(f"Failed to analyse {symbol}, serving the last row: {e}")
+            return self.rows.get(symbol)
+        self.rows[symbol] = row
+        return row
+
+    def get_data(self) -> list:
+        """Rows of every watched symbol, like the scraper's payload."""
+        rows = [row for row in (self.get_row(symbol) for symbol in self.symbols) if row is not None]
+        # Same order as the scraper's payload
+        rows.sort(key=lambda row: (row["1m 1x Volume (USDT)"], row["5m Spread"]), reverse=True)
+        return rows
+
+    def get_api_data(self, symbol: str, fields: tuple) -> dict:
+        self.watch([symbol])
+        row = self.get_row(symbol)
+        record = AssetRecord(row) if row is not None else None
+        symbols = self.symbols
+        return {
+            name: symbols if name == "Symbols" else record.value(name) if record is not None else None
+            for name in fields
+        }
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from threading import Lock
+
+
+def compile_patterns(patterns):
+    """One regex matching any of the fnmatch-style ``patterns``, None when there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+class SymbolFilter:
+    """The rotator filters (blacklist patterns, whitelist, max USD price, min qty) of one caller, compiled."""
+
+    def __init__(self, blacklist=None, whitelist=None, max_usd_value=None, min_qty_threshold=None):
+        self.blacklist = compile_patterns(blacklist)
+        self.whitelist = frozenset(whitelist or ())
+        self.max_usd_value = max_usd_value
+        self.min_qty_threshold = min_qty_threshold
+
+    @staticmethod
+    def make_key(blacklist=None, whitelist=None, max_usd_value=None, min_qty_threshold=None):
+        return frozenset(blacklist or ()), frozenset(whitelist or ()), max_usd_value, min_qty_threshold
+
+    def accepts(self, symbol: str, min_qty, usd_price) -> bool:
+        if self.blacklist is not None and self.blacklist.match(symbol):
+            return False
+        if self.whitelist and symbol not in self.whitelist:
+            return False
+        if self.max_usd_value is not None and usd_price > self.max_usd_value:
+            return False
+        return self.min_qty_threshold is None or min_qty <= self.min_qty_threshold
+
+
+def _row_key(asset: dict):
+    # Everything a filter looks at, so an unchanged row keeps its verdict across payloads
+    return asset.get("Asset", ""), asset.get("Min qty", 0), asset.get("Price", float('inf'))
+
+
+class RotatorFilterCache:
+    """
+    Filtered rotator lists, memoized per payload and per filter.
+
+    A payload is identified by the list object the refresher hands out, so the same payload is filtered once
+    per distinct filter. When a new payload arrives, rows whose symbol, min qty and price are unchanged keep
+    their verdicts and only the changed rows are run through the filter again.
+    """
+
+    def __init__(self):
+        self.filters = {}  # filter key -> SymbolFilter
+        self.sources = {}  # source -> {"payload", "verdicts": {filter key: {row key: bool}}, "results": {filter key: rows}}
+        self.lock = Lock()
+
+    def filter(self, source: str, payload: list, blacklist=None, whitelist=None, max_usd_value=None,
+               min_qty_threshold=None) -> list:
+        """The rows of ``payload`` that pass the filter, in payload order."""
+        key = SymbolFilter.make_key(blacklist, whitelist, max_usd_value, min_qty_threshold)
+        with self.lock:
+            symbol_filter = self.filters.get(key)
+            if symbol_filter is None:
+                symbol_filter = self.filters[key] = SymbolFilter(blacklist, whitelist, max_usd_value, min_qty_threshold)
+
+            state = self.sources.get(source)
+            if state is None or state["payload"] is not payload:
+                state = self.sources[source] = self._new_state(payload, state)
+
+            rows = state["results"].get(key)
+            if rows is None:
+                verdicts = state["verdicts"].setdefault(key, {})
+                rows = []
+                for asset in payload:
+                    row_key = _row_key(asset)
+                    verdict = verdicts.get(row_key)
+                    if verdict is None:
+                        verdict = verdicts[row_key] = symbol_filter.accepts(*row_key)
+                    if verdict:
+                        rows.append(asset)
+                state["results"][key] = rows
+            return list(rows)
+
+    @staticmethod
+    def _new_state(payload: list, previous: dict = None) -> dict:
+        row_keys = {_row_key(asset) for asset in payload}
+        verdicts = {}
+        if previous is not None:
+            # Drop verdicts of rows that changed or left, the rest carry over
+            for key, previous_verdicts in previous["verdicts"].items():
+                verdicts[key] = {row_key: v for row_key, v in previous_verdicts.items() if row_key in row_keys}
+        return {"payload": payload, "verdicts": verdicts, "results": {}}
@@ -28,6 +28,9 @@ class API(BaseModel):
     mode: str = "remote"
     url: str = "http://apiv3.tradesimple.xyz/data/"
     data_source_exchange: str = "bybit"
+    http_pool_size: int = 8
+    http_retries: int = 3
+    signal_engine_ttl: float = 5.0
 
 
 class Bot(BaseModel):
@@ -67,6 +70,9 @@ class Bot(BaseModel):
     whitelist: List[str] = []
     dashboard_enabled: bool = False
     shared_data_path: Optional[str] = None
+    retry_deadline_seconds: Optional[float] = None  # None: one strategy loop interval
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
     #risk_management: Optional[dict] = None
     linear_grid: Optional[dict] = None
     # shared_data_path: Optional[DirectoryPath] = None
@@ -193,9 +199,15 @@ class Exchange(BaseModel):
     api_secret: str
     passphrase: str = None
     symbols_allowed: int = 12
+    use_websocket: bool = False
+    ticker_interval: float = 1.0
+    async_runtime: bool = False
+    base_url: str = None
 
 class Logger(BaseModel):
     level: str = "info"
+    metrics_file: str = "logs/exchange_metrics.jsonl"
+    metrics_interval: int = 60
 
     @validator("level")
     def check_level(cls, v):
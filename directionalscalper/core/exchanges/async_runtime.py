@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import ccxt.async_support as ccxt_async
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="AsyncRuntime", filename="AsyncRuntime.log", stream=True)
+
+
+class AsyncRuntime:
+    """
+    One asyncio event loop for the whole process, running in a daemon thread.
+
+    Symbol threads hand it coroutines with ``run``; the requests of every thread are multiplexed on the
+    loop's sockets instead of each thread blocking on its own. ``client_for`` returns the
+    ``ccxt.async_support`` twin of a sync ccxt client, created once per account and bound to this loop.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name="AsyncRuntime", daemon=True)
+        self.clients = {}
+        self.clients_lock = threading.Lock()
+        self.thread.start()
+
+    @classmethod
+    def for_process(cls) -> "AsyncRuntime":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                logging.info("Started asyncio runtime")
+        return cls._instance
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro, timeout: float = None):
+        """Run ``coro`` on the loop and block the calling thread until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def client_for(self, client, market_type: str = 'swap'):
+        """The async ccxt client for the account behind the sync ``client``, sharing its loaded markets."""
+        key = (client.id, market_type, client.apiKey)
+        with self.clients_lock:
+            async_client = self.clients.get(key)
+            if async_client is None:
+                async_class = getattr(ccxt_async, client.id)
+                params = {
+                    "apiKey": client.apiKey,
+                    "secret": client.secret,
+                    "enableRateLimit": True,
+                    "options": dict(client.options),
+                    "asyncio_loop": self.loop,
+                }
+                if client.password:
+                    params["password"] = client.password
+                async_client = async_class(params)
+                async_client.urls['api'] = dict(client.urls['api'])  # Keeps a base URL override
+                if client.markets:
+                    async_client.set_markets(client.markets, client.currencies)
+                self.clients[key] = async_client
+        return async_client
+
+    def close(self):
+        async def close_clients():
+            for async_client in self.clients.values():
+                await async_client.close()
+
+        self.run(close_clients())
+        self.loop.call_soon_threadsafe(self.loop.stop)
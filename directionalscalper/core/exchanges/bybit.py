@@ -7,19 +7,50 @@ from typing import Optional, Tuple, List
 from ccxt.base.errors import RateLimitExceeded, NetworkError
 import ccxt
 from directionalscalper.core.strategies.logger import Logger
+from directionalscalper.core.exchanges.market_metadata import MarketMetadataStore
+from directionalscalper.core.exchanges.ticker_snapshot import TickerSnapshot
+from directionalscalper.core.exchanges.rate_limiter import BybitRateLimiter
+from directionalscalper.core.exchanges.open_orders import OpenOrdersIndex
+from directionalscalper.core.exchanges.retry_scheduler import is_stale, mark_stale
+from directionalscalper.core.exchanges.leverage_tiers import LeverageTierCache
+from directionalscalper.core.exchanges.bybit_ws import BybitPublicStream, BybitPrivateStream
 
 logging = Logger(logger_name="BybitExchange", filename="BybitExchange.log", stream=True)
 
 class BybitExchange(Exchange):
-    def __init__(self, api_key, secret_key, passphrase=None, market_type='swap'):
+    def __init__(self, api_key, secret_key, passphrase=None, market_type='swap', use_websocket=False, ticker_interval=1.0, async_runtime=False, base_url=None):
         if market_type == 'spot':
-            super().__init__('bybit', api_key, secret_key, passphrase, market_type)
+            super().__init__('bybit', api_key, secret_key, passphrase, market_type, base_url)
         else:
-            super().__init__('bybit', api_key, secret_key, passphrase, market_type)
+            super().__init__('bybit', api_key, secret_key, passphrase, market_type, base_url)
 
         self.max_retries = 100  # Maximum retries for rate-limited requests
         self.retry_wait = 5  # Seconds to wait between retries
 
+        # Shared across every BybitExchange in the process, markets are indexed once instead of per call
+        self.market_metadata = MarketMetadataStore.for_exchange(self.exchange, market_type)
+
+        # One request budget per account, orders and cancels go ahead of market data and bookkeeping
+        self.rate_limiter = BybitRateLimiter.for_client(self.exchange)
+
+        # All tickers of the category in one request per interval, shared by every symbol thread
+        self.ticker_snapshot = TickerSnapshot.for_exchange(self.exchange, market_type, interval=ticker_interval)
+
+        # Leverage tiers rarely change, they are loaded for all symbols in the background and looked up locally
+        self.leverage_tiers = LeverageTierCache.for_exchange(self.exchange, market_type)
+
+        # Account positions and orders are pushed over the private stream, REST is the fallback
+        self.private_stream = None
+        if use_websocket:
+            self.market_stream = BybitPublicStream.for_market_type(market_type)
+            self.private_stream = BybitPrivateStream.for_account(self.exchange, market_type)
+
+        # Open orders of the whole account from one fetch, patched by every order call this process makes
+        self.open_orders_index = OpenOrdersIndex.for_account(self.exchange, market_type, private_stream=self.private_stream)
+
+        if async_runtime:
+            self.enable_async_runtime()
+
     def get_symbol_info_and_positions(self, symbol: str):
         try:
             # Fetch the market info for the given symbol
@@ -56,17 +87,14 @@ class BybitExchange(Exchange):
     def get_market_data_bybit(self, symbol: str) -> dict:
         values = {"precision": 0.0, "leverage": 0.0, "min_qty": 0.0}
         try:
-            self.exchange.load_markets()
-            symbol_data = self.exchange.market(symbol)
-            
-            #print("Symbol data:", symbol_data)  # Debug print
-            
-            if "info" in symbol_data:
-                values["precision"] = symbol_data["precision"]["price"]
-                values["min_qty"] = symbol_data["limits"]["amount"]["min"]
+            market = self.market_metadata.get(symbol)
+
+            if market is not None:
+                values["precision"] = market.price_precision
+                values["min_qty"] = market.min_qty
 
-            # Fetch positions
-            positions = self.exchange.fetch_positions()
+            # Fetch positions, shared with every thread asking at the same time
+            positions = self.coalesced('fetch_positions', self.exchange.fetch_positions, ttl=1.0)
 
             for position in positions:
                 if position['symbol'] == symbol:
@@ -98,8 +126,12 @@ class BybitExchange(Exchange):
         
         :return: A list of open orders for all symbols.
         """
+        all_open_orders = self.open_orders_index.get_open_orders()
+        if all_open_orders is not None:
+            return all_open_orders
+
         try:
-            all_open_orders = self.exchange.fetch_open_orders()
+            all_open_orders = self.coalesced('fetch_open_orders', self.exchange.fetch_open_orders)
             return all_open_orders
         except Exception as e:
             print(f"An error occurred while fetching all open orders: {e}")
@@ -170,7 +202,7 @@ class BybitExchange(Exchange):
     def get_balance_bybit_unified(self, quote):
         if self.exchange.has['fetchBalance']:
             # Fetch the balance
-            balance = self.exchange.fetch_balance()
+            balance = self.coalesced('fetch_balance', self.exchange.fetch_balance)
 
             # Find the quote balance
             unified_balance = balance.get('USDT', {})
@@ -260,6 +292,180 @@ class BybitExchange(Exchange):
             logging.info(f"An error occurred in create_tagged_limit_order_bybit() for {symbol}: {e}")
             return {"error": str(e)}
         
+    # Most orders one request of Bybit's v5 batch endpoints accepts, per category
+    BATCH_ORDER_LIMITS = {"linear": 20, "spot": 10}
+
+    def _batch_category(self) -> str:
+        return "spot" if self.market_type == "spot" else "linear"
+
+    def _send_order_batches(self, batch_method, requests: list) -> list:
+        """
+        Send raw v5 order requests through a batch endpoint, as many per call as the endpoint allows.
+
+        :return: One (result, error) pair per request, in input order. ``result`` is the request's entry of
+                 ``result.list`` and ``error`` is None when Bybit accepted it, the error message otherwise.
+        """
+        category = self._batch_category()
+        chunk_size = self.BATCH_ORDER_LIMITS[category]
+        outcomes = []
+        for start in range(0, len(requests), chunk_size):
+            chunk = requests[start:start + chunk_size]
+            try:
+                response = batch_method({"category": category, "request": chunk})
+            except Exception as e:
+                logging.error(f"Batch order request of {len(chunk)} orders failed: {e}")
+                outcomes.extend((None, str(e)) for _ in chunk)
+                continue
+
+            # Bybit answers in request order, per-order codes are in retExtInfo
+            results = (response.get("result") or {}).get("list") or []
+            statuses = (response.get("retExtInfo") or {}).get("list") or []
+            for i in range(len(chunk)):
+                result = results[i] if i < len(results) else None
+                status = statuses[i] if i < len(statuses) else {}
+                if str(status.get("code", 0)) != "0":
+                    outcomes.append((result, status.get("msg") or f"code {status.get('code')}"))
+                elif not result or not (result.get("orderId") or result.get("orderLinkId")):
+                    outcomes.append((result, "No result for order"))
+                else:
+                    outcomes.append((result, None))
+        return outcomes
+
+    def create_orders_batch_bybit(self, orders: list) -> list:
+        """
+        Place limit orders through ``/v5/order/create-batch``, 20 linear (10 spot) orders per request.
+
+        Each order is a dict with ``symbol``, ``side``, ``qty`` and ``price``, and optionally ``positionIdx``,
+        ``reduceOnly``, ``postOnly`` (default True), ``orderLinkId`` and ``isLeverage``.
+
+        :return: One entry per order, in input order: the placed order (``id``, ``clientOrderId``, ``symbol``,
+                 ``side``, ``amount``, ``price``, ``info``) or ``{"error": message}``.
+        """
+        category = self._batch_category()
+        results = [None] * len(orders)
+        sent = []  # (input position, raw request)
+        for i, order in enumerate(orders):
+            try:
+                symbol = order["symbol"]
+                request = {
+                    "symbol": self.exchange.market_id(symbol),
+                    "side": order["side"].capitalize(),
+                    "orderType": "Limit",
+                    "qty": self.exchange.amount_to_precision(symbol, float(order["qty"])),
+                    "price": self.exchange.price_to_precision(symbol, float(order["price"])),
+                    "timeInForce": "PostOnly" if order.get("postOnly", True) else "GTC",
+                }
+                if category == "linear":
+                    request["positionIdx"] = order.get("positionIdx", 0)
+                if order.get("reduceOnly"):
+                    request["reduceOnly"] = True
+                if order.get("orderLinkId"):
+                    request["orderLinkId"] = order["orderLinkId"]
+                if order.get("isLeverage"):
+                    request["isLeverage"] = 1
+            except Exception as e:
+                logging.info(f"Could not prepare batch order {order}: {e}")
+                results[i] = {"error": str(e)}
+                continue
+            sent.append((i, request))
+
+        outcomes = self._send_order_batches(self.exchange.privatePostV5OrderCreateBatch, [request for _, request in sent])
+        for (i, request), (result, error) in zip(sent, outcomes):
+            order = orders[i]
+            if error is not None:
+                logging.info(f"Batch order {order} was rejected: {error}")
+                results[i] = {"error": error}
+                continue
+            placed = {
+                "id": result.get("orderId"),
+                "clientOrderId": result.get("orderLinkId"),
+                "symbol": order["symbol"],
+                "side": order["side"].lower(),
+                "amount": float(request["qty"]),
+                "price": float(request["price"]),
+                "info": result,
+            }
+            self.open_orders_index.record_placed(placed, order["symbol"], placed["side"], placed["amount"], placed["price"], order)
+            results[i] = placed
+        return results
+
+    def amend_orders_batch_bybit(self, orders: list) -> list:
+        """
+        Amend open orders through ``/v5/order/amend-batch``.
+
+        Each order is a dict with ``symbol``, ``id`` (or ``orderLinkId``) and the new ``qty`` and/or ``price``.
+
+        :return: One entry per order, in input order: ``{"id", "clientOrderId", "info"}`` or ``{"error": message}``.
+        """
+        results = [None] * len(orders)
+        sent = []  # (input position, raw request)
+        for i, order in enumerate(orders):
+            try:
+                symbol = order["symbol"]
+                request = {"symbol": self.exchange.market_id(symbol)}
+                if order.get("id"):
+                    request["orderId"] = order["id"]
+                else:
+                    request["orderLinkId"] = order["orderLinkId"]
+                if order.get("qty") is not None:
+                    request["qty"] = self.exchange.amount_to_precision(symbol, float(order["qty"]))
+                if order.get("price") is not None:
+                    request["price"] = self.exchange.price_to_precision(symbol, float(order["price"]))
+            except Exception as e:
+                logging.info(f"Could not prepare batch amend {order}: {e}")
+                results[i] = {"error": str(e)}
+                continue
+            sent.append((i, request))
+
+        outcomes = self._send_order_batches(self.exchange.privatePostV5OrderAmendBatch, [request for _, request in sent])
+        for (i, request), (result, error) in zip(sent, outcomes):
+            if error is not None:
+                logging.info(f"Batch amend {orders[i]} was rejected: {error}")
+                results[i] = {"error": error}
+                continue
+            order_id = result.get("orderId") or orders[i].get("id")
+            self.open_orders_index.record_amended(
+                order_id,
+                float(request["qty"]) if "qty" in request else None,
+                float(request["price"]) if "price" in request else None,
+            )
+            results[i] = {"id": order_id, "clientOrderId": result.get("orderLinkId"), "info": result}
+        return results
+
+    def cancel_orders_batch_bybit(self, orders: list) -> list:
+        """
+        Cancel orders through ``/v5/order/cancel-batch``.
+
+        Each order is a dict with ``symbol`` and ``id`` (or ``orderLinkId``), so ccxt orders can be passed as they are.
+
+        :return: One entry per order, in input order: ``{"id", "clientOrderId", "info"}`` or ``{"error": message}``.
+        """
+        results = [None] * len(orders)
+        sent = []  # (input position, raw request)
+        for i, order in enumerate(orders):
+            try:
+                request = {"symbol": self.exchange.market_id(order["symbol"])}
+                if order.get("id"):
+                    request["orderId"] = order["id"]
+                else:
+                    request["orderLinkId"] = order["orderLinkId"]
+            except Exception as e:
+                logging.info(f"Could not prepare batch cancel {order}: {e}")
+                results[i] = {"error": str(e)}
+                continue
+            sent.append((i, request))
+
+        outcomes = self._send_order_batches(self.exchange.privatePostV5OrderCancelBatch, [request for _, request in sent])
+        for (i, request), (result, error) in zip(sent, outcomes):
+            if error is not None:
+                logging.info(f"Batch cancel {orders[i].get('id') or orders[i].get('orderLinkId')} was rejected: {error}")
+                results[i] = {"error": error}
+                continue
+            order_id = result.get("orderId") or orders[i].get("id")
+            self.open_orders_index.record_cancelled(order_id)
+            results[i] = {"id": order_id, "clientOrderId": result.get("orderLinkId"), "info": result}
+        return results
+
     def create_limit_order_bybit_unified(self, symbol: str, side: str, qty: float, price: float, positionIdx=0, params={}):
         try:
             if side == "buy" or side == "sell":
@@ -337,33 +543,18 @@ class BybitExchange(Exchange):
             return None
         
     def get_precision_and_limits_bybit(self, symbol):
-        # Fetch the market data
-        markets = self.exchange.fetch_markets()
-
-        # Filter for the specific symbol
-        for market in markets:
-            if market['symbol'] == symbol:
-                precision_amount = market['precision']['amount']
-                precision_price = market['precision']['price']
-                min_amount = market['limits']['amount']['min']
+        market = self.market_metadata.get(symbol)
+        if market is None:
+            return None, None, None
 
-                return precision_amount, precision_price, min_amount
-
-        return None, None, None
+        return market.amount_precision, market.price_precision, market.min_qty
 
     def get_market_precision_data_bybit(self, symbol):
-        # Fetch the market data
-        markets = self.exchange.fetch_markets()
-        
-        # Print the first market from the list
-        logging.info(markets[0])
+        market = self.market_metadata.get(symbol)
+        if market is None:
+            return None
 
-        # Filter for the specific symbol
-        for market in markets:
-            if market['symbol'] == symbol:
-                return market['precision']
-        
-        return None
+        return market.market['precision']
     
     def transfer_funds_bybit(self, code: str, amount: float, from_account: str, to_account: str, params={}):
         """
@@ -427,7 +618,7 @@ class BybitExchange(Exchange):
         """
         try:
             # Use the fetch_balance method from CCXT (inherited from the Exchange class)
-            balance = self.exchange.fetch_balance()
+            balance = self.coalesced('fetch_balance', self.exchange.fetch_balance)
 
             if coin in balance:
                 return balance[coin]['free']
@@ -460,17 +651,10 @@ class BybitExchange(Exchange):
     
     def get_symbol_precision_bybit(self, symbol):
         try:
-            # Use fetch_markets to retrieve data for all markets
-            all_markets = self.exchange.fetch_markets()
-
-            # Find the market data for the specific symbol
-            market_data = next((market for market in all_markets if market['id'] == symbol), None)
+            market = self.market_metadata.get(symbol)
 
-            if market_data:
-                # Extract precision data
-                amount_precision = market_data['precision']['amount']
-                price_precision = market_data['precision']['price']
-                return amount_precision, price_precision
+            if market is not None:
+                return market.amount_precision, market.price_precision
             else:
                 print(f"Market data not found for {symbol}")
                 return None, None
@@ -478,7 +662,7 @@ class BybitExchange(Exchange):
             print(f"An error occurred: {e}")
             return None, None
 
-    def get_positions_bybit(self, symbol, max_retries=100, retry_delay=5) -> dict:
+    def get_positions_bybit(self, symbol, max_retries=None, retry_delay=None) -> dict:
         values = {
             "long": {
                 "qty": 0.0,
@@ -502,28 +686,41 @@ class BybitExchange(Exchange):
             },
         }
 
-        for i in range(max_retries):
-            try:
-                data = self.exchange.fetch_positions(symbol)
-                if len(data) == 2:
-                    sides = ["long", "short"]
-                    for side in [0, 1]:
-                        values[sides[side]]["qty"] = float(data[side]["contracts"])
-                        values[sides[side]]["price"] = float(data[side]["entryPrice"] or 0)
-                        values[sides[side]]["realised"] = round(float(data[side]["info"]["unrealisedPnl"] or 0), 4)
-                        values[sides[side]]["cum_realised"] = round(float(data[side]["info"]["cumRealisedPnl"] or 0), 4)
-                        values[sides[side]]["upnl"] = round(float(data[side]["info"]["unrealisedPnl"] or 0), 4)
-                        values[sides[side]]["upnl_pct"] = round(float(data[side]["percentage"] or 0), 4)
-                        values[sides[side]]["liq_price"] = float(data[side]["liquidationPrice"] or 0)
-                        values[sides[side]]["entry_price"] = float(data[side]["entryPrice"] or 0)
-                break  # If the fetch was successful, break out of the loop
-            except Exception as e:
-                if i < max_retries - 1:  # If not the last attempt
-                    logging.info(f"An unknown error occurred in get_positions_bybit(): {e}. Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    logging.info(f"Failed to fetch positions after {max_retries} attempts: {e}")
-                    raise e  # If it's still failing after max_retries, re-raise the exception.
+        if self.private_stream is not None:
+            positions = self.private_stream.get_positions(self._stream_symbol(symbol))
+            if positions is not None:
+                for position in positions:
+                    side = position['side']
+                    if side is None or float(position['contracts'] or 0) == 0:
+                        continue
+                    values[side]["qty"] = float(position["contracts"])
+                    values[side]["price"] = float(position["entryPrice"] or 0)
+                    values[side]["realised"] = round(float(position["info"]["unrealisedPnl"] or 0), 4)
+                    values[side]["cum_realised"] = round(float(position["info"]["cumRealisedPnl"] or 0), 4)
+                    values[side]["upnl"] = round(float(position["info"]["unrealisedPnl"] or 0), 4)
+                    values[side]["upnl_pct"] = round(float(position["percentage"] or 0), 4)
+                    values[side]["liq_price"] = float(position["liquidationPrice"] or 0)
+                    values[side]["entry_price"] = float(position["entryPrice"] or 0)
+                return values
+
+        # Bounded by the retry deadline; while the circuit is open the last positions come back marked stale
+        data = self.retry_scheduler.call(
+            f"fetch_positions:{symbol}", self.exchange.fetch_positions, (symbol,), cache_key=("fetch_positions", symbol),
+            max_attempts=max_retries, base_delay=retry_delay
+        )
+        if len(data) == 2:
+            sides = ["long", "short"]
+            for side in [0, 1]:
+                values[sides[side]]["qty"] = float(data[side]["contracts"])
+                values[sides[side]]["price"] = float(data[side]["entryPrice"] or 0)
+                values[sides[side]]["realised"] = round(float(data[side]["info"]["unrealisedPnl"] or 0), 4)
+                values[sides[side]]["cum_realised"] = round(float(data[side]["info"]["cumRealisedPnl"] or 0), 4)
+                values[sides[side]]["upnl"] = round(float(data[side]["info"]["unrealisedPnl"] or 0), 4)
+                values[sides[side]]["upnl_pct"] = round(float(data[side]["percentage"] or 0), 4)
+                values[sides[side]]["liq_price"] = float(data[side]["liquidationPrice"] or 0)
+                values[sides[side]]["entry_price"] = float(data[side]["entryPrice"] or 0)
+        if is_stale(data):
+            values = mark_stale(values, data.age)
 
         return values
 
@@ -539,11 +736,7 @@ class BybitExchange(Exchange):
         
     def get_current_max_leverage_bybit(self, symbol):
         try:
-            # Fetch leverage tiers for the symbol
-            leverage_tiers = self.exchange.fetch_market_leverage_tiers(symbol)
-
-            # Process leverage tiers to find the maximum leverage
-            max_leverage = max([tier['maxLeverage'] for tier in leverage_tiers if 'maxLeverage' in tier])
+            max_leverage = self.leverage_tiers.max_leverage(symbol)
             logging.info(f"Maximum leverage for symbol {symbol}: {max_leverage}")
 
             return max_leverage
@@ -625,6 +818,11 @@ class BybitExchange(Exchange):
                         return []
                     
     def get_all_open_positions_bybit(self, retries=10, delay_factor=10, max_delay=60) -> List[dict]:
+        if self.private_stream is not None:
+            positions = self.private_stream.get_positions()
+            if positions is not None:
+                return [position for position in positions if float(position.get('contracts') or 0) != 0]
+
         now = datetime.now()
 
         # Check if the shared cache is still valid
@@ -640,7 +838,7 @@ class BybitExchange(Exchange):
 
             for attempt in range(retries):
                 try:
-                    all_positions = self.exchange.fetch_positions() 
+                    all_positions = self.coalesced('fetch_positions', self.exchange.fetch_positions, ttl=1.0)
                     open_positions = [position for position in all_positions if float(position.get('contracts', 0)) != 0] 
 
                     # Update the shared cache with the new data
@@ -698,19 +896,21 @@ class BybitExchange(Exchange):
                     
     def fetch_leverage_tiers(self, symbol: str) -> dict:
         """
-        Fetch leverage tiers for a given symbol using CCXT's fetch_market_leverage_tiers method.
+        Leverage tiers for a given symbol from the shared LeverageTierCache, no request unless the cache misses.
 
         :param symbol: The trading symbol to fetch leverage tiers for.
         :return: A dictionary containing leverage tiers information if successful, None otherwise.
         """
         try:
-            params = {'category': 'linear'}  # Adjust parameters based on the specific needs and API documentation
-            leverage_tiers = self.exchange.fetch_derivatives_market_leverage_tiers(symbol, params)
-            return leverage_tiers
+            return self.leverage_tiers.get_tiers(symbol)
         except Exception as e:
             logging.error(f"Error fetching leverage tiers for {symbol}: {e}")
             return None
 
+    def get_leverage_tier(self, symbol: str, notional: float) -> Optional[dict]:
+        """The cached leverage tier a position of ``notional`` in ``symbol`` falls in."""
+        return self.leverage_tiers.tier_for_notional(symbol, notional)
+
     def get_open_take_profit_orders(self, symbol, side):
         """
         Fetches open take profit orders for the given symbol and side.
@@ -719,8 +919,12 @@ class BybitExchange(Exchange):
         :param str side: The side ("buy" or "sell") of the TP orders to fetch.
         :return: A list of take profit order structures.
         """
+        tp_orders = self.open_orders_index.get(symbol, side.lower(), True)
+        if tp_orders is not None:
+            return tp_orders
+
         # First, fetch the open orders
-        response = self.exchange.get_open_orders(symbol)
+        response = self.get_open_orders(symbol)
         
         # Filter the orders for take profits (reduceOnly) and the specified side
         tp_orders = [
@@ -732,16 +936,33 @@ class BybitExchange(Exchange):
         
         return tp_orders
 
+    async def get_open_orders_async(self, symbol: str) -> list:
+        open_orders = self.open_orders_index.peek(symbol)
+        if open_orders is not None:
+            return open_orders
+        return await super().get_open_orders_async(symbol)
+
+    async def get_all_open_positions_async(self) -> list:
+        if self.private_stream is not None:
+            positions = self.private_stream.get_positions()
+            if positions is not None:
+                return [position for position in positions if float(position.get('contracts') or 0) != 0]
+        return await super().get_all_open_positions_async()
+
     def get_open_orders(self, symbol):
         """Fetches open orders for the given symbol."""
+        open_orders = self.open_orders_index.get_open_orders(symbol)
+        if open_orders is not None:
+            return open_orders
+
         for _ in range(self.max_retries):
             try:
                 open_orders = self.exchange.fetch_open_orders(symbol)
                 logging.info(f"Open orders {open_orders}")
                 return open_orders
             except ccxt.RateLimitExceeded:
-                logging.info(f"Rate limit exceeded when fetching open orders for {symbol}. Retrying in {self.retry_wait} seconds...")
-                time.sleep(self.retry_wait)
+                logging.info(f"Rate limit exceeded when fetching open orders for {symbol}. Retrying...")
+                self._rate_limit_backoff(self.retry_wait)
         logging.error(f"Failed to fetch open orders for {symbol} after {self.max_retries} retries.")
         return []
 
@@ -770,6 +991,16 @@ class BybitExchange(Exchange):
     def get_open_tp_orders(self, symbol):
         long_tp_orders = []
         short_tp_orders = []
+
+        # Reduce-only sells close longs, reduce-only buys close shorts
+        indexed_long = self.open_orders_index.get(symbol, 'sell', True)
+        indexed_short = self.open_orders_index.get(symbol, 'buy', True)
+        if indexed_long is not None and indexed_short is not None:
+            for orders, tp_orders in ((indexed_long, long_tp_orders), (indexed_short, short_tp_orders)):
+                for order in orders:
+                    tp_orders.append({'id': order['id'], 'qty': float(order['info']['qty']), 'price': float(order['price'])})
+            return long_tp_orders, short_tp_orders
+
         for _ in range(self.max_retries):
             try:
                 all_open_orders = self.exchange.fetch_open_orders(symbol)
@@ -790,8 +1021,8 @@ class BybitExchange(Exchange):
                 
                 return long_tp_orders, short_tp_orders
             except ccxt.RateLimitExceeded:
-                logging.info(f"Rate limit exceeded when fetching TP orders for {symbol}. Retrying in {self.retry_wait} seconds...")
-                time.sleep(self.retry_wait)
+                logging.info(f"Rate limit exceeded when fetching TP orders for {symbol}. Retrying...")
+                self._rate_limit_backoff(self.retry_wait)
         logging.error(f"Failed to fetch TP orders for {symbol} after {self.max_retries} retries.")
         return long_tp_orders, short_tp_orders
     
@@ -999,14 +1230,15 @@ class BybitExchange(Exchange):
         return total_qty
     
     def get_contract_size_bybit(self, symbol):
-        positions = self.exchange.fetch_derivatives_positions([symbol])
-        return positions[0]['contractSize']
+        return self.market_metadata.contract_size(symbol)
 
     def get_max_leverage_bybit(self, symbol, max_retries=10, backoff_factor=0.5):
         #logging.info(f"Called get_max_leverage_bybit with symbol: {symbol}")
         for retry in range(max_retries):
             try:
-                tiers = self.exchange.fetch_derivatives_market_leverage_tiers(symbol)
+                tiers = self.leverage_tiers.get_tiers(symbol)
+                if tiers is None:
+                    raise NetworkError(f"Leverage tiers for {symbol} unavailable")
                 for tier in tiers:
                     info = tier.get('info', {})
                     if info.get('symbol') == symbol:
@@ -1056,16 +1288,7 @@ class BybitExchange(Exchange):
             logging.info(f"Exception in bybit_fetch_precision: {e}")
 
     def get_market_tick_size_bybit(self, symbol):
-        # Fetch the market data
-        markets = self.exchange.fetch_markets()
-
-        # Filter for the specific symbol
-        for market in markets:
-            if market['symbol'] == symbol:
-                tick_size = market['info']['priceFilter']['tickSize']
-                return tick_size
-        
-        return None
+        return self.market_metadata.tick_size(symbol)
 
     def fetch_recent_trades(self, symbol, since=None, limit=100):
         """
@@ -1096,7 +1319,11 @@ class BybitExchange(Exchange):
                 Returns None for a position if it's not open, the key is not present, or there's an error.
         """
         # Fetch positions for the symbol
-        response = self.exchange.fetch_positions([symbol])
+        response = None
+        if self.private_stream is not None:
+            response = self.private_stream.get_positions(self._stream_symbol(symbol))
+        if response is None:
+            response = self.exchange.fetch_positions([symbol])
         #logging.info(f"Response from unrealized pnl: {response}")
 
         unrealized_pnl = {'long': None, 'short': None}
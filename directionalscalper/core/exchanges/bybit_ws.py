@@ -0,0 +1,575 @@
+import os
+import hmac
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import Optional
+
+from directionalscalper.core.strategies.logger import Logger
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+logging = Logger(logger_name="BybitWebSocket", filename="BybitWebSocket.log", stream=True)
+
+PUBLIC_URLS = {
+    'swap': 'wss://stream.bybit.com/v5/public/linear',
+    'spot': 'wss://stream.bybit.com/v5/public/spot',
+}
+PRIVATE_URL = 'wss://stream.bybit.com/v5/private'
+
+# ccxt timeframe -> Bybit v5 kline interval
+KLINE_INTERVALS = {
+    '1m': '1', '3m': '3', '5m': '5', '15m': '15', '30m': '30',
+    '1h': '60', '2h': '120', '4h': '240', '6h': '360', '12h': '720',
+    '1d': 'D', '1w': 'W', '1M': 'M',
+}
+
+KLINE_INTERVAL_MS = {
+    '1': 60_000, '3': 180_000, '5': 300_000, '15': 900_000, '30': 1_800_000,
+    '60': 3_600_000, '120': 7_200_000, '240': 14_400_000, '360': 21_600_000, '720': 43_200_000,
+    'D': 86_400_000, 'W': 604_800_000,
+}
+
+
+class BybitStream:
+    """
+    Connection handling shared by the Bybit v5 streams: reconnect with backoff, heartbeat and
+    resubscribing every topic after a reconnect. Subclasses handle the messages.
+    """
+
+    SUBSCRIBE_CHUNK_SIZE = 10
+    HEARTBEAT_INTERVAL = 20
+
+    def __init__(self, url: str, silence_timeout: int = 30, max_reconnect_delay: int = 60):
+        self.url = url
+        self.silence_timeout = silence_timeout
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.topics = {}  # topic -> last time it was requested
+        self.lock = threading.RLock()
+        self.ws = None
+        self.connected = threading.Event()
+        self.running = False
+        self.last_message_time = 0.0
+        self.reconnect_count = 0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        if self.ws is not None:
+            self.ws.close()
+
+    def is_live(self) -> bool:
+        return self.connected.is_set() and time.time() - self.last_message_time < self.silence_timeout
+
+    def _run(self):
+        delay = 1
+        while self.running:
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            opened_at = time.time()
+            try:
+                self.ws.run_forever()
+            except Exception as e:
+                logging.error(f"Stream {self.url} crashed: {e}")
+
+            self.connected.clear()
+            self._reset_state()
+            if not self.running:
+                break
+
+            # A connection that stayed up for a while resets the backoff
+            if time.time() - opened_at > self.max_reconnect_delay:
+                delay = 1
+            logging.info(f"Stream {self.url} disconnected, reconnecting in {delay} seconds")
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnect_count += 1
+
+    def _heartbeat(self):
+        while self.running:
+            time.sleep(self.HEARTBEAT_INTERVAL)
+            if self.connected.is_set():
+                self._send({"op": "ping"})
+                self._on_heartbeat()
+
+    def _on_heartbeat(self):
+        pass
+
+    def _reset_state(self):
+        pass
+
+    def _send(self, payload: dict) -> bool:
+        try:
+            self.ws.send(json.dumps(payload))
+            return True
+        except Exception as e:
+            logging.error(f"Failed to send {payload.get('op')} on {self.url}: {e}")
+            return False
+
+    def _send_topics(self, op: str, topics: list):
+        for i in range(0, len(topics), self.SUBSCRIBE_CHUNK_SIZE):
+            self._send({"op": op, "args": topics[i:i + self.SUBSCRIBE_CHUNK_SIZE]})
+
+    def _on_open(self, ws):
+        self.last_message_time = time.time()
+        self.connected.set()
+        self._on_connected()
+
+    def _on_connected(self):
+        self._resubscribe()
+
+    def _resubscribe(self):
+        with self.lock:
+            topics = list(self.topics)
+        logging.info(f"Stream {self.url} connected, subscribing to {len(topics)} topics")
+        self._send_topics("subscribe", topics)
+
+    def _on_error(self, ws, error):
+        logging.error(f"Stream {self.url} error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.connected.clear()
+
+    def _on_message(self, ws, message):
+        self.last_message_time = time.time()
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+
+        topic = msg.get("topic")
+        if topic is None:
+            self._handle_op(msg)
+            return
+
+        try:
+            self._handle_topic(topic, msg)
+        except Exception as e:
+            logging.error(f"Failed to handle {topic} message: {e}")
+
+    def _handle_op(self, msg):
+        if msg.get("op") == "subscribe" and not msg.get("success", True):
+            logging.error(f"Subscription rejected on {self.url}: {msg.get('ret_msg')}")
+
+    def _handle_topic(self, topic, msg):
+        raise NotImplementedError
+
+    def subscribe(self, topics: list):
+        now = time.time()
+        new_topics = []
+        with self.lock:
+            for topic in topics:
+                if topic not in self.topics:
+                    new_topics.append(topic)
+                self.topics[topic] = now
+        if new_topics and self.connected.is_set():
+            self._send_topics("subscribe", new_topics)
+
+    def unsubscribe(self, topics: list):
+        with self.lock:
+            topics = [topic for topic in topics if self.topics.pop(topic, None) is not None]
+        if topics and self.connected.is_set():
+            self._send_topics("unsubscribe", topics)
+
+
+class BybitPublicStream(BybitStream):
+    """
+    Bybit v5 public WebSocket feed for tickers, L2 orderbooks and klines.
+
+    Symbols are subscribed on first use and unsubscribed once nobody has read them for ``idle_timeout``
+    seconds, so symbol rotation needs no extra wiring. All state is dropped on disconnect and rebuilt
+    from the snapshots Bybit sends after the automatic resubscribe; until then the getters return None
+    and the caller falls back to REST.
+    """
+
+    _streams = {}
+    _streams_lock = threading.Lock()
+
+    def __init__(self, url: str, orderbook_depth: int = 50, kline_capacity: int = 1000, idle_timeout: int = 600, **kwargs):
+        super().__init__(url, **kwargs)
+        self.orderbook_depth = orderbook_depth
+        self.kline_capacity = kline_capacity
+        self.idle_timeout = idle_timeout
+
+        self.tickers = {}
+        self.orderbooks = {}
+        self.klines = {}  # (symbol, interval) -> {start: [ts, o, h, l, c, v]}
+        self.pending_klines = {}  # Stream candles received before the REST backfill
+
+    @classmethod
+    def for_market_type(cls, market_type: str = 'swap') -> Optional["BybitPublicStream"]:
+        """
+        Return the shared, started stream for a market type, or None when websocket-client is not installed.
+
+        The URL can be overridden with the BYBIT_WS_PUBLIC_URL environment variable (e.g. to point at fake_bybit_ws).
+        """
+        if websocket is None:
+            logging.info("websocket-client is not installed, market data will be fetched over REST")
+            return None
+
+        url = os.environ.get('BYBIT_WS_PUBLIC_URL') or PUBLIC_URLS.get(market_type)
+        if url is None:
+            return None
+
+        with cls._streams_lock:
+            stream = cls._streams.get(url)
+            if stream is None:
+                stream = cls(url)
+                stream.start()
+                cls._streams[url] = stream
+        return stream
+
+    def _reset_state(self):
+        with self.lock:
+            self.tickers.clear()
+            self.orderbooks.clear()
+            self.klines.clear()
+            self.pending_klines.clear()
+
+    def _on_heartbeat(self):
+        self._prune_idle_topics()
+
+    def _handle_topic(self, topic, msg):
+        if topic.startswith("tickers."):
+            self._handle_ticker(msg)
+        elif topic.startswith("orderbook."):
+            self._handle_orderbook(msg)
+        elif topic.startswith("kline."):
+            self._handle_kline(topic, msg)
+
+    def _handle_ticker(self, msg):
+        data = msg["data"]
+        symbol = data["symbol"]
+        with self.lock:
+            if msg.get("type") == "delta" and symbol in self.tickers:
+                self.tickers[symbol].update(data)
+            else:
+                self.tickers[symbol] = dict(data)
+
+    def _handle_orderbook(self, msg):
+        data = msg["data"]
+        symbol = data["s"]
+        with self.lock:
+            # u == 1 is a snapshot Bybit sends after a service restart
+            if msg.get("type") == "snapshot" or data.get("u") == 1 or symbol not in self.orderbooks:
+                if msg.get("type") != "snapshot" and data.get("u") != 1:
+                    return  # Delta without a snapshot to apply it to
+                self.orderbooks[symbol] = {"bids": {}, "asks": {}}
+
+            book = self.orderbooks[symbol]
+            for side, key in (("bids", "b"), ("asks", "a")):
+                levels = book[side]
+                for price, size in data.get(key, []):
+                    if float(size) == 0:
+                        levels.pop(float(price), None)
+                    else:
+                        levels[float(price)] = float(size)
+
+    def _handle_kline(self, topic, msg):
+        _, interval, symbol = topic.split(".", 2)
+        with self.lock:
+            candles = self.klines.get((symbol, interval))
+            if candles is None:
+                # Not backfilled from REST yet, hold the latest candles so the backfill cannot lose a close
+                candles = self.pending_klines.setdefault((symbol, interval), {})
+            for k in msg["data"]:
+                start = int(k["start"])
+                candles[start] = [start, float(k["open"]), float(k["high"]), float(k["low"]), float(k["close"]), float(k["volume"])]
+            limit = self.kline_capacity if (symbol, interval) in self.klines else 2
+            while len(candles) > limit:
+                del candles[min(candles)]
+
+    def _prune_idle_topics(self):
+        cutoff = time.time() - self.idle_timeout
+        with self.lock:
+            idle = [topic for topic, last_used in self.topics.items() if last_used < cutoff]
+        if idle:
+            logging.info(f"Unsubscribing idle topics: {idle}")
+            self.unsubscribe(idle)
+
+    def get_mid_price(self, symbol: str) -> Optional[float]:
+        self.subscribe([f"tickers.{symbol}", f"orderbook.{self.orderbook_depth}.{symbol}"])
+        if not self.is_live():
+            return None
+
+        with self.lock:
+            ticker = self.tickers.get(symbol)
+            # Spot tickers carry no bid/ask, use the top of the book instead
+            if ticker and ticker.get("bid1Price") and ticker.get("ask1Price"):
+                return (float(ticker["bid1Price"]) + float(ticker["ask1Price"])) / 2
+            book = self.orderbooks.get(symbol)
+            if book and book["bids"] and book["asks"]:
+                return (max(book["bids"]) + min(book["asks"])) / 2
+        return None
+
+    def get_orderbook(self, symbol: str) -> Optional[dict]:
+        self.subscribe([f"orderbook.{self.orderbook_depth}.{symbol}"])
+        if not self.is_live():
+            return None
+
+        with self.lock:
+            book = self.orderbooks.get(symbol)
+            if not book or not book["bids"] or not book["asks"]:
+                return None
+            bids = sorted(book["bids"].items(), reverse=True)
+            asks = sorted(book["asks"].items())
+        return {"bids": [[p, s] for p, s in bids], "asks": [[p, s] for p, s in asks]}
+
+    def get_ohlcv(self, symbol: str, timeframe: str, limit: int) -> Optional[list]:
+        """
+        Return the last ``limit`` candles (oldest first, including the open one) in ccxt's list format,
+        or None if the stream does not hold enough contiguous history yet.
+        """
+        interval = KLINE_INTERVALS.get(timeframe)
+        if interval is None or limit is None:
+            return None
+        self.subscribe([f"kline.{interval}.{symbol}"])
+        if not self.is_live():
+            return None
+
+        with self.lock:
+            candles = self.klines.get((symbol, interval))
+            if not candles or len(candles) < limit:
+                return None
+            starts = sorted(candles)[-limit:]
+            interval_ms = KLINE_INTERVAL_MS.get(interval)
+            # The current candle starts once the previous one ends, if we have not seen it the data is stale
+            if interval_ms and starts[-1] + interval_ms <= time.time() * 1000:
+                return None
+            return [list(candles[start]) for start in starts]
+
+    def seed_ohlcv(self, symbol: str, timeframe: str, ohlcv: list):
+        """Backfill kline history fetched over REST; candles already received from the stream win."""
+        interval = KLINE_INTERVALS.get(timeframe)
+        if interval is None or not ohlcv or not self.is_live():
+            return
+
+        with self.lock:
+            candles = self.klines.setdefault((symbol, interval), {})
+            for candle in ohlcv:
+                candles.setdefault(int(candle[0]), list(candle))
+            candles.update(self.pending_klines.pop((symbol, interval), {}))
+            while len(candles) > self.kline_capacity:
+                del candles[min(candles)]
+
+
+class BybitPrivateStream(BybitStream):
+    """
+    Account-level Bybit v5 private stream holding every position and open order of the account.
+
+    Push events update the state in place, a REST reconciliation runs after every (re)connect and then
+    every ``reconcile_interval`` seconds to repair anything a dropped message left behind. Records are
+    the raw Bybit v5 payloads and are handed out parsed by the shared ccxt client, so callers get the
+    same structures as from fetch_positions / fetch_open_orders.
+    """
+
+    _streams = {}
+    _streams_lock = threading.Lock()
+
+    OPEN_ORDER_STATUSES = ("New", "PartiallyFilled", "Untriggered")
+
+    def __init__(self, url: str, client, category: str = 'linear', settle_coin: str = 'USDT',
+                 reconcile_interval: int = 60, **kwargs):
+        super().__init__(url, **kwargs)
+        self.client = client
+        self.category = category
+        self.settle_coin = settle_coin
+        self.reconcile_interval = reconcile_interval
+
+        self.positions = {}  # (symbol, positionIdx) -> raw position
+        self.orders = {}  # orderId -> raw open order
+        self.closed_orders = {}  # orderId -> time the stream saw it close, keeps reconcile from reviving it
+        self.executions = deque(maxlen=1000)
+        self.execution_listeners = []
+
+        self.authenticated = False
+        self.reconciled = False
+        self.last_reconcile_time = 0.0
+        self.reconcile_lock = threading.Lock()
+
+        for topic in (f"position.{category}", f"order.{category}", f"execution.{category}"):
+            self.topics[topic] = time.time()
+
+    @classmethod
+    def for_account(cls, client, market_type: str = 'swap') -> Optional["BybitPrivateStream"]:
+        """
+        Return the shared, started private stream for the account behind a ccxt client.
+
+        Only linear (swap) accounts are streamed. The URL can be overridden with BYBIT_WS_PRIVATE_URL.
+        """
+        if websocket is None or market_type != 'swap' or not client.apiKey:
+            return None
+
+        url = os.environ.get('BYBIT_WS_PRIVATE_URL') or PRIVATE_URL
+        key = (url, client.apiKey)
+        with cls._streams_lock:
+            stream = cls._streams.get(key)
+            if stream is None:
+                stream = cls(url, client)
+                stream.start()
+                cls._streams[key] = stream
+        return stream
+
+    def is_live(self) -> bool:
+        return self.authenticated and self.reconciled and super().is_live()
+
+    def add_execution_listener(self, callback):
+        """Call ``callback(execution)`` from the stream thread for every raw execution pushed."""
+        self.execution_listeners.append(callback)
+
+    def _reset_state(self):
+        self.authenticated = False
+        self.reconciled = False
+
+    def _on_connected(self):
+        # Bybit expects the expiry in server time, nonce() applies ccxt's measured time difference
+        expires = self.client.nonce() + 10000
+        signature = hmac.new(self.client.secret.encode(), f"GET/realtime{expires}".encode(), hashlib.sha256).hexdigest()
+        self._send({"op": "auth", "args": [self.client.apiKey, expires, signature]})
+
+    def _handle_op(self, msg):
+        if msg.get("op") != "auth":
+            super()._handle_op(msg)
+            return
+
+        if msg.get("success"):
+            self.authenticated = True
+            self._resubscribe()
+            threading.Thread(target=self.reconcile, daemon=True).start()
+        else:
+            logging.error(f"Private stream authentication failed: {msg.get('ret_msg')}")
+            self.ws.close()
+
+    def _on_heartbeat(self):
+        if self.authenticated and time.time() - self.last_reconcile_time > self.reconcile_interval:
+            self.reconcile()
+
+    def _handle_topic(self, topic, msg):
+        if topic.startswith("position"):
+            with self.lock:
+                for raw in msg["data"]:
+                    self._apply_position(raw)
+        elif topic.startswith("order"):
+            with self.lock:
+                for raw in msg["data"]:
+                    self._apply_order(raw)
+        elif topic.startswith("execution"):
+            for raw in msg["data"]:
+                self.executions.append(raw)
+                for callback in self.execution_listeners:
+                    try:
+                        callback(raw)
+                    except Exception as e:
+                        logging.error(f"Execution listener failed: {e}")
+
+    @staticmethod
+    def _updated_time(raw) -> int:
+        try:
+            return int(raw.get("updatedTime") or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _apply_position(self, raw):
+        # WebSocket positions carry entryPrice, REST ones avgPrice, keep both so info looks the same either way
+        if "avgPrice" not in raw and "entryPrice" in raw:
+            raw["avgPrice"] = raw["entryPrice"]
+        key = (raw["symbol"], int(raw.get("positionIdx", 0)))
+        existing = self.positions.get(key)
+        if existing is None or self._updated_time(raw) >= self._updated_time(existing):
+            self.positions[key] = raw
+
+    def _apply_order(self, raw):
+        order_id = raw["orderId"]
+        existing = self.orders.get(order_id)
+        if existing is not None and self._updated_time(raw) < self._updated_time(existing):
+            return
+        if raw.get("orderStatus") in self.OPEN_ORDER_STATUSES:
+            self.orders[order_id] = raw
+        else:
+            self.orders.pop(order_id, None)
+            self.closed_orders[order_id] = time.time()
+
+    def _fetch_all(self, method, request: dict) -> list:
+        rows = []
+        request = dict(request)
+        while True:
+            response = method(request)
+            result = response.get("result", {})
+            rows.extend(result.get("list", []))
+            cursor = result.get("nextPageCursor")
+            if not cursor:
+                return rows
+            request["cursor"] = cursor
+
+    def reconcile(self):
+        """Replace the in-memory state with a REST snapshot, keeping pushes newer than the snapshot."""
+        if not self.reconcile_lock.acquire(blocking=False):
+            return
+        try:
+            started = time.time()
+            started_ms = self.client.nonce()
+            request = {"category": self.category, "settleCoin": self.settle_coin}
+            positions = self._fetch_all(self.client.privateGetV5PositionList, dict(request, limit=200))
+            orders = self._fetch_all(self.client.privateGetV5OrderRealtime, dict(request, limit=50))
+
+            # Pushed records win when they are newer than the REST copy, or when REST did not return them
+            # because they changed after the snapshot was taken
+            with self.lock:
+                pushed_positions = self.positions
+                self.positions = {}
+                for raw in positions:
+                    self._apply_position(raw)
+                for key, raw in pushed_positions.items():
+                    if key in self.positions or self._updated_time(raw) > started_ms:
+                        self._apply_position(raw)
+
+                pushed_orders = self.orders
+                self.orders = {}
+                for raw in orders:
+                    if raw["orderId"] not in self.closed_orders:
+                        self._apply_order(raw)
+                for order_id, raw in pushed_orders.items():
+                    if order_id in self.orders or self._updated_time(raw) > started_ms:
+                        self._apply_order(raw)
+
+                self.closed_orders = {order_id: closed_at for order_id, closed_at in self.closed_orders.items() if closed_at > started - 60}
+
+            self.reconciled = True
+            self.last_reconcile_time = time.time()
+        except Exception as e:
+            logging.error(f"Private stream reconciliation failed: {e}")
+        finally:
+            self.reconcile_lock.release()
+
+    def get_positions(self, symbol: str = None) -> Optional[list]:
+        """ccxt positions for the account (or one exchange symbol id), or None when the stream is not live."""
+        if not self.is_live():
+            return None
+        with self.lock:
+            raws = [raw for (raw_symbol, _), raw in sorted(self.positions.items()) if symbol is None or raw_symbol == symbol]
+        return [self.client.parse_position(dict(raw)) for raw in raws]
+
+    def get_open_orders(self, symbol: str = None) -> Optional[list]:
+        """ccxt open orders for the account (or one exchange symbol id), or None when the stream is not live."""
+        if not self.is_live():
+            return None
+        with self.lock:
+            raws = [raw for raw in self.orders.values() if symbol is None or raw["symbol"] == symbol]
+        return [self.client.parse_order(dict(raw)) for raw in raws]
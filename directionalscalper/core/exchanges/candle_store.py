@@ -0,0 +1,155 @@
+import time
+import threading
+
+import numpy as np
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="CandleStore", filename="CandleStore.log", stream=True)
+
+# Column order of the arrays handed out, same as ccxt's OHLCV rows
+TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+class CandleBuffer:
+    """
+    Fixed-size ring of OHLCV rows for one symbol and timeframe.
+
+    Every row is written twice, at ``i`` and ``i + capacity``, so the newest ``n`` rows are always one
+    contiguous slice of the backing array and ``view`` never copies. A view stays valid until the open
+    candle is updated in place by the next refresh; copy it if you need to keep it.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data = np.zeros((2 * capacity, 6), dtype=np.float64)
+        self.head = -1  # Ring position of the newest row
+        self.size = 0
+        self.last_refresh = 0.0
+        self.requested = 0  # Candles asked for by the last full load
+        self.history_exhausted = False  # The last full load got fewer candles than asked, there are no older ones
+
+    @property
+    def last_timestamp(self):
+        if self.size == 0:
+            return None
+        return int(self.data[self.head, TIMESTAMP])
+
+    def append(self, row):
+        self.head = (self.head + 1) % self.capacity
+        self.data[self.head] = row
+        self.data[self.head + self.capacity] = row
+        self.size = min(self.size + 1, self.capacity)
+
+    def replace_last(self, row):
+        self.data[self.head] = row
+        self.data[self.head + self.capacity] = row
+
+    def merge(self, rows):
+        """Merge rows (oldest first): the open candle is updated in place, newer candles are appended."""
+        for row in rows:
+            last_timestamp = self.last_timestamp
+            timestamp = int(row[TIMESTAMP])
+            if last_timestamp is None or timestamp > last_timestamp:
+                self.append(row)
+            elif timestamp == last_timestamp:
+                self.replace_last(row)
+
+    def view(self, limit: int = None) -> np.ndarray:
+        n = self.size if limit is None else min(limit, self.size)
+        end = self.head + self.capacity + 1
+        return self.data[end - n:end]
+
+
+class CandleStore:
+    """
+    Process-wide OHLCV cache with one CandleBuffer per (symbol, timeframe).
+
+    The first request for a key fetches the full window; afterwards only candles from the newest stored
+    timestamp onwards are fetched (usually just the open candle), at most once per ``min_refresh_seconds``.
+    A symbol listed more recently than ``limit`` candles ago keeps its short buffer and is refreshed the same way.
+    Candles come from the ``fetch(symbol, timeframe, since, limit)`` callable passed by the caller, so the
+    exchange decides whether they come from REST or a stream.
+    """
+
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, exchange, capacity: int = 1000, min_refresh_seconds: float = 1.0):
+        self.exchange = exchange
+        self.capacity = capacity
+        self.min_refresh_seconds = min_refresh_seconds
+        self.buffers = {}
+        self.key_locks = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_exchange(cls, exchange, market_type: str = 'swap', **kwargs) -> "CandleStore":
+        key = (exchange.id, market_type)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls(exchange, **kwargs)
+                cls._stores[key] = store
+        return store
+
+    def _key_lock(self, key):
+        with self.lock:
+            lock = self.key_locks.get(key)
+            if lock is None:
+                lock = self.key_locks[key] = threading.Lock()
+        return lock
+
+    def _timeframe_ms(self, timeframe: str) -> int:
+        return self.exchange.parse_timeframe(timeframe) * 1000
+
+    def get(self, symbol: str, timeframe: str, limit: int, fetch) -> np.ndarray:
+        """
+        Return the newest ``limit`` candles as a read-only (n, 6) view: timestamp, open, high, low, close, volume.
+        """
+        if limit is None or limit > self.capacity:
+            return np.asarray(fetch(symbol, timeframe, None, limit), dtype=np.float64).reshape(-1, 6)
+
+        key = (symbol, timeframe)
+        with self._key_lock(key):
+            buffer = self.buffers.get(key)
+            now = time.time()
+
+            if buffer is None or (buffer.size < limit and not buffer.history_exhausted):
+                buffer = self._load(symbol, timeframe, limit, fetch)
+            elif now - buffer.last_refresh >= self.min_refresh_seconds:
+                buffer = self._refresh(buffer, symbol, timeframe, fetch)
+
+            view = buffer.view(limit)
+            view.flags.writeable = False
+            return view
+
+    def _load(self, symbol, timeframe, limit, fetch) -> CandleBuffer:
+        rows = fetch(symbol, timeframe, None, limit)
+        buffer = CandleBuffer(self.capacity)
+        buffer.merge(rows)
+        buffer.requested = limit
+        buffer.history_exhausted = 0 < len(rows) < limit
+        buffer.last_refresh = time.time()
+        self.buffers[(symbol, timeframe)] = buffer
+        return buffer
+
+    def _refresh(self, buffer, symbol, timeframe, fetch) -> CandleBuffer:
+        since = buffer.last_timestamp
+        timeframe_ms = self._timeframe_ms(timeframe)
+        missing = (time.time() * 1000 - since) // timeframe_ms + 1
+
+        window = max(buffer.size, buffer.requested)
+
+        # Too far behind to patch, start over with the same window
+        if missing >= buffer.size:
+            return self._load(symbol, timeframe, window, fetch)
+
+        rows = fetch(symbol, timeframe, since, int(missing) + 1)
+        if rows and int(rows[0][TIMESTAMP]) > since + timeframe_ms:
+            logging.info(f"Gap in {symbol} {timeframe} candles after {since}, reloading")
+            return self._load(symbol, timeframe, window, fetch)
+
+        buffer.merge(rows)
+        buffer.last_refresh = time.time()
+        return buffer
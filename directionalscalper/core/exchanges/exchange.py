@@ -4,15 +4,22 @@ import time
 import ta as ta
 import uuid
 import ccxt
+import numpy as np
 import pandas as pd
 import json
 import requests, hmac, hashlib
 import urllib.parse
 import threading
 import traceback
+import asyncio
 from typing import Optional, Tuple, List
 from ccxt.base.errors import RateLimitExceeded
 from ..strategies.logger import Logger
+from .candle_store import CandleStore, TIMESTAMP, OPEN
+from .moving_averages import MovingAverageService
+from .single_flight import SingleFlight
+from .metrics import ExchangeMetrics
+from .retry_scheduler import RetryScheduler, call_endpoint, call_key
 from requests.exceptions import HTTPError
 from datetime import datetime, timedelta
 from ccxt.base.errors import NetworkError
@@ -25,7 +32,11 @@ class Exchange:
     last_open_positions_time_shared = None
     open_positions_semaphore = threading.Semaphore()
 
-    def __init__(self, exchange_id, api_key, secret_key, passphrase=None, market_type='swap'):
+    # One ccxt client per (exchange, market type, account) shared by every symbol thread
+    shared_clients = {}
+    shared_clients_lock = threading.Lock()
+
+    def __init__(self, exchange_id, api_key, secret_key, passphrase=None, market_type='swap', base_url=None):
         self.order_timestamps = None
         self.exchange_id = exchange_id
         self.api_key = api_key
@@ -33,14 +44,43 @@ class Exchange:
         self.passphrase = passphrase
         self.market_type = market_type  # Store the market type
         self.name = exchange_id
-        self.initialise()
-        self.symbols = self._get_symbols()
+        # REST host override (e.g. fake_bybit_http), BYBIT_REST_URL works too for Bybit
+        self.base_url = base_url or (os.environ.get('BYBIT_REST_URL') if exchange_id.lower().startswith('bybit') else None)
+        self._use_shared_client()
         self.market_precisions = {}
         self.open_positions_cache = None
         self.last_open_positions_time = None
 
         self.entry_order_ids = {}  # Initialize order history
         self.entry_order_ids_lock = threading.Lock()  # For thread safety
+
+        # Optional streaming market data (see bybit_ws.BybitPublicStream), getters fall back to REST without it
+        self.market_stream = None
+
+        # Optional account-wide ticker snapshot (see ticker_snapshot.TickerSnapshot), one request serves every symbol
+        self.ticker_snapshot = None
+
+        # Shared request budget (see rate_limiter.BybitRateLimiter); without one, rate limit errors back off blindly
+        self.rate_limiter = None
+
+        # Identical account-wide calls made by several symbol threads at once go out as one request
+        self.single_flight = SingleFlight.for_exchange(self.exchange, self.market_type)
+
+        # Optional asyncio runtime (see async_runtime.AsyncRuntime), switched on with enable_async_runtime()
+        self.async_runtime = None
+        self.async_exchange = None
+
+        # Shared OHLCV ring buffers, only candles newer than the last stored one are fetched
+        self.candle_store = CandleStore.for_exchange(self.exchange, self.market_type)
+        self.moving_averages = MovingAverageService(self)
+
+        # Latency, errors and call counts of every method and REST request, see metrics.ExchangeMetrics
+        self.metrics = ExchangeMetrics.for_process()
+        self.metrics.instrument_client(self.exchange)
+        self.metrics.instrument_exchange(self)
+
+        # Retries, circuits and last-known-good results of this account, see retry_scheduler.RetryScheduler
+        self.retry_scheduler = RetryScheduler.for_client(self.exchange)
         
     def initialise(self):
         exchange_class = getattr(ccxt, self.exchange_id)
@@ -89,7 +129,77 @@ class Exchange:
 
         # Initializing the exchange object
         self.exchange = exchange_class(exchange_params)
+
+        if self.base_url:
+            self.exchange.urls['api'] = {name: self.base_url.rstrip('/') for name in self.exchange.urls['api']}
         
+    def _use_shared_client(self):
+        """
+        Attach this instance to the shared ccxt client for its account, creating it on first use.
+
+        Markets, the time offset and the throttle state then live in a single client instead of one per symbol thread.
+        """
+        key = (self.exchange_id.lower(), self.market_type, self.api_key, self.base_url)
+        with Exchange.shared_clients_lock:
+            client = Exchange.shared_clients.get(key)
+            if client is None:
+                self.initialise()
+                self._serialize_throttle(self.exchange)
+                client = (self.exchange, self.exchange_id, self._get_symbols())
+                Exchange.shared_clients[key] = client
+                logging.info(f"Created shared {self.exchange_id} client for market type {self.market_type}")
+
+        self.exchange, self.exchange_id, self.symbols = client
+
+    @staticmethod
+    def _serialize_throttle(client):
+        # ccxt's sync throttle is not thread safe, without the lock concurrent threads all see the same
+        # last request timestamp and fire together
+        throttle = client.throttle
+        throttle_lock = threading.Lock()
+
+        def locked_throttle(cost=None):
+            with throttle_lock:
+                throttle(cost)
+                client.lastRestRequestTimestamp = client.milliseconds()
+
+        client.throttle = locked_throttle
+
+    def _stream_symbol(self, symbol):
+        # Streams are keyed by exchange ids ('BTCUSDT'), strategies pass either ids or ccxt symbols
+        try:
+            return self.exchange.market(symbol)['id']
+        except Exception:
+            return symbol
+
+    def _fetch_candles(self, symbol, timeframe, since=None, limit=None):
+        if self.market_stream is not None:
+            stream_symbol = self._stream_symbol(symbol)
+            if since is None:
+                ohlcv = self.market_stream.get_ohlcv(stream_symbol, timeframe, limit)
+                if ohlcv is not None:
+                    return ohlcv
+            else:
+                # Delta refresh, the stream's last two candles do if they reach back to `since`
+                ohlcv = self.market_stream.get_ohlcv(stream_symbol, timeframe, 2)
+                if ohlcv is not None and ohlcv[0][0] <= since:
+                    return [row for row in ohlcv if row[0] >= since]
+
+            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+            if since is None:
+                self.market_stream.seed_ohlcv(stream_symbol, timeframe, ohlcv)
+            return ohlcv
+
+        return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+    def get_ohlcv_array(self, symbol, timeframe='1m', limit=100) -> np.ndarray:
+        """
+        Return the newest candles as a read-only (n, 6) NumPy view: timestamp, open, high, low, close, volume.
+
+        The view points into the shared candle store, copy it before holding on to it across loop iterations.
+        """
+        return self.candle_store.get(symbol, timeframe, limit, self._fetch_candles)
+
     def update_order_history(self, symbol, order_id, timestamp):
         with self.entry_order_ids_lock:
             # Check if the symbol is already in the order history
@@ -232,15 +342,25 @@ class Exchange:
             logging.error(f"Error fetching trades for {symbol}: {e}")
             return []
 
-    def retry_api_call(self, function, *args, max_retries=100, delay=10, **kwargs):
-        for i in range(max_retries):
-            try:
-                return function(*args, **kwargs)
-            except Exception as e:
-                logging.info(f"Error occurred during API call: {e}. Retrying in {delay} seconds...")
-                time.sleep(delay)
-        raise Exception(f"Failed to execute the API function after {max_retries} retries.")
-    
+    def coalesced(self, key, fn, *args, ttl=0.0, **kwargs):
+        """Call ``fn(*args, **kwargs)``, sharing the result with threads making the call under the same key."""
+        return self.single_flight.do(key, lambda: fn(*args, **kwargs), ttl)
+
+    def _rate_limit_backoff(self, seconds):
+        # Nothing to sleep off when the shared limiter blocked the path until its quota resets; paths without
+        # a bucket (public endpoints) are not held back by it, so they still sleep
+        if self.rate_limiter is not None and self.rate_limiter.blocked_last_request():
+            return
+        time.sleep(seconds)
+
+    def retry_api_call(self, function, *args, max_retries=None, delay=None, deadline=None, **kwargs):
+        # Jittered backoff bounded by a deadline, falling back to the last good result once the circuit opens
+        name = getattr(function, '__name__', str(function))
+        return self.retry_scheduler.call(
+            call_endpoint(name, args), function, args, kwargs, cache_key=call_key(name, args, kwargs), deadline=deadline,
+            max_attempts=max_retries, base_delay=delay
+        )
+
     def get_price_precision(self, symbol):
         market = self.exchange.market(symbol)
         smallest_increment = market['precision']['price']
@@ -263,7 +383,7 @@ class Exchange:
             "equity": 0.0,
         }
         try:
-            data = self.exchange.fetch_balance()
+            data = self.coalesced('fetch_balance', self.exchange.fetch_balance)
             if "info" in data:
                 if "result" in data["info"]:
                     if quote in data["info"]["result"]:
@@ -298,13 +418,14 @@ class Exchange:
         """
         try:
             # Fetch the OHLCV data from the exchange
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)  # Pass the limit parameter
-
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            ohlcv = self.get_ohlcv_array(symbol, timeframe, limit=limit)  # Pass the limit parameter
 
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-
-            df.set_index('timestamp', inplace=True)
+            df = pd.DataFrame(
+                ohlcv[:, OPEN:],
+                columns=['open', 'high', 'low', 'close', 'volume'],
+                index=pd.to_datetime(ohlcv[:, TIMESTAMP], unit='ms'),
+            )
+            df.index.name = 'timestamp'
 
             return df
 
@@ -315,6 +436,11 @@ class Exchange:
     def get_orderbook(self, symbol, max_retries=3, retry_delay=5) -> dict:
         values = {"bids": [], "asks": []}
 
+        if self.market_stream is not None:
+            data = self.market_stream.get_orderbook(self._stream_symbol(symbol))
+            if data is not None:
+                return data
+
         for attempt in range(max_retries):
             try:
                 data = self.exchange.fetch_order_book(symbol)
@@ -331,8 +457,8 @@ class Exchange:
                 if "Too many visits" in str(http_err) or (http_err.response.status_code == 429):
                     if attempt < max_retries - 1:
                         delay = retry_delay * (attempt + 1)  # Variable delay
-                        logging.info(f"Rate limit error in get_orderbook(). Retrying in {delay} seconds...")
-                        time.sleep(delay)
+                        logging.info("Rate limit error in get_orderbook(). Retrying...")
+                        self._rate_limit_backoff(delay)
                         continue
                 else:
                     logging.error(f"HTTP error in get_orderbook(): {http_err.response.text}")
@@ -412,8 +538,112 @@ class Exchange:
             logging.info(f"An unknown error occurred in get_positions(): {e}")
         return values
 
+    def enable_async_runtime(self):
+        """Route the I/O of each strategy iteration through the process-wide asyncio runtime."""
+        from .async_runtime import AsyncRuntime
+
+        self.async_runtime = AsyncRuntime.for_process()
+        self.async_exchange = self.async_runtime.client_for(self.exchange, self.market_type)
+
+    # Async counterparts. In-memory sources (streams, snapshots) are used when they have the data, they never
+    # block; everything else is awaited on the async client so concurrent calls share the event loop.
+    async def get_current_price_async(self, symbol: str) -> float:
+        if self.market_stream is not None:
+            price = self.market_stream.get_mid_price(self._stream_symbol(symbol))
+            if price is not None:
+                return price
+
+        if self.ticker_snapshot is not None:
+            ticker = self.ticker_snapshot.peek(symbol)
+            if ticker is not None and ticker.mid is not None:
+                return ticker.mid
+
+        try:
+            ticker = await self.async_exchange.fetch_ticker(symbol)
+            if "bid" in ticker and "ask" in ticker:
+                return (ticker["bid"] + ticker["ask"]) / 2
+        except Exception as e:
+            logging.error(f"An error occurred in get_current_price_async() for {symbol}: {e}")
+            return None
+
+    async def get_orderbook_async(self, symbol, max_retries=3, retry_delay=1) -> dict:
+        if self.market_stream is not None:
+            data = self.market_stream.get_orderbook(self._stream_symbol(symbol))
+            if data is not None:
+                return data
+
+        values = {"bids": [], "asks": []}
+        for attempt in range(max_retries):
+            try:
+                data = await self.async_exchange.fetch_order_book(symbol)
+                if data.get("bids") and data.get("asks"):
+                    values["bids"] = data["bids"]
+                    values["asks"] = data["asks"]
+                break
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    logging.info(f"An error occurred in get_orderbook_async(): {e}. Retrying in {retry_delay} seconds...")
+                    await asyncio.sleep(retry_delay)
+                else:
+                    logging.error(f"Failed to fetch order book after {max_retries} attempts: {e}")
+        return values
+
+    async def get_open_orders_async(self, symbol: str) -> list:
+        return await self.async_exchange.fetch_open_orders(symbol)
+
+    async def get_all_open_positions_async(self) -> list:
+        positions = await self.async_exchange.fetch_positions()
+        return [position for position in positions if float(position.get('contracts') or 0) != 0]
+
+    async def get_ohlcv_async(self, symbol: str, timeframe: str = '1m', limit: int = 100) -> list:
+        return await self.async_exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+
+    async def _gather_iteration_inputs(self, symbol: str, timeframes=()) -> dict:
+        names = ["open_positions", "open_orders", "current_price", "order_book"]
+        calls = [
+            self.get_all_open_positions_async(),
+            self.get_open_orders_async(symbol),
+            self.get_current_price_async(symbol),
+            self.get_orderbook_async(symbol),
+        ]
+        for timeframe in timeframes:
+            names.append(f"ohlcv_{timeframe}")
+            calls.append(self.get_ohlcv_async(symbol, timeframe))
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        inputs = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logging.error(f"Failed to fetch {name} for {symbol}: {result}")
+                result = None
+            inputs[name] = result
+        return inputs
+
+    def fetch_iteration_inputs(self, symbol: str, timeframes=(), timeout: float = 30) -> dict:
+        """
+        Positions, open orders, price, orderbook (and candles per timeframe) for one strategy iteration,
+        requested concurrently on the asyncio runtime. Entries that failed are None.
+        """
+        return self.async_runtime.run(self._gather_iteration_inputs(symbol, timeframes), timeout)
+
+    def get_ticker(self, symbol: str):
+        """Bid/ask/last/mark/funding for ``symbol`` from the shared ticker snapshot, or None without one."""
+        if self.ticker_snapshot is None:
+            return None
+        return self.ticker_snapshot.get(symbol)
+
     # Universal
     def get_current_price(self, symbol: str) -> float:
+        if self.market_stream is not None:
+            price = self.market_stream.get_mid_price(self._stream_symbol(symbol))
+            if price is not None:
+                return price
+
+        if self.ticker_snapshot is not None:
+            price = self.ticker_snapshot.get_mid_price(symbol)
+            if price is not None:
+                return price
+
         try:
             ticker = self.exchange.fetch_ticker(symbol)
             if "bid" in ticker and "ask" in ticker:
@@ -491,21 +721,8 @@ class Exchange:
 
         for i in range(max_retries):
             try:
-                bars = self.exchange.fetch_ohlcv(
-                    symbol=symbol, timeframe=timeframe, limit=num_bars
-                )
-                df = pd.DataFrame(
-                    bars, columns=["Time", "Open", "High", "Low", "Close", "Volume"]
-                )
-                df["Time"] = pd.to_datetime(df["Time"], unit="ms")
-                df["MA_3_High"] = df.High.rolling(3).mean()
-                df["MA_3_Low"] = df.Low.rolling(3).mean()
-                df["MA_6_High"] = df.High.rolling(6).mean()
-                df["MA_6_Low"] = df.Low.rolling(6).mean()
-                values["MA_3_H"] = df["MA_3_High"].iat[-1]
-                values["MA_3_L"] = df["MA_3_Low"].iat[-1]
-                values["MA_6_H"] = df["MA_6_High"].iat[-1]
-                values["MA_6_L"] = df["MA_6_Low"].iat[-1]
+                # Only the last six bars matter for MA3/MA6, num_bars no longer changes the result
+                values.update(self.moving_averages.get(symbol, timeframe))
                 break  # If the fetch was successful, break out of the loop
             except Exception as e:
                 if i < max_retries - 1:  # If not the last attempt
@@ -0,0 +1,746 @@
+"""
+Local stand-in for the Bybit v5 REST API, for running the bot, benchmarks and tests offline.
+
+Only the stdlib is used. The server implements the endpoints ccxt's bybit client calls for the strategies
+(server time, instruments, tickers, orderbook, kline, risk limits, wallet balance, positions, open and closed
+orders, executions, order create/amend/cancel and their batch versions, leverage and position mode) on top
+of a simulated hedge-mode account. Prices follow a random walk; resting limit orders fill when the book
+crosses them, post-only orders that would take liquidity are cancelled, and fills update positions and the
+wallet. Every response can be delayed (``latency``/``jitter``), each endpoint can be given a per-second
+request limit that answers with Bybit's 10006 rate-limit error, and ``fail`` injects errors.
+
+Run standalone and point the bot at it (with the WebSockets off, or pointed at fake_bybit_ws):
+
+    python -m directionalscalper.core.exchanges.fake_bybit_http --port 8766 --symbols BTCUSDT ETHUSDT --latency 0.02
+    BYBIT_REST_URL=http://127.0.0.1:8766 python multi_bot.py ...
+"""
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+INTERVAL_MINUTES = {
+    "1": 1, "3": 3, "5": 5, "15": 15, "30": 30, "60": 60, "120": 120, "240": 240,
+    "360": 360, "720": 720, "D": 1440, "W": 10080, "M": 43200,
+}
+
+
+def _fmt(value: float, step: float) -> str:
+    decimals = max(0, -int(math.floor(math.log10(step)))) if step < 1 else 0
+    return f"{value:.{decimals}f}"
+
+
+class _FakeError(Exception):
+    def __init__(self, ret_code: int, ret_msg: str):
+        super().__init__(ret_msg)
+        self.ret_code = ret_code
+        self.ret_msg = ret_msg
+
+
+class _Market:
+    def __init__(self, symbol: str, price: float, tick_size: float, qty_step: float, min_qty: float, max_leverage: float):
+        self.symbol = symbol
+        self.base = symbol[:-4] if symbol.endswith("USDT") else symbol[:-3]
+        self.price = price
+        self.open_24h = price
+        self.tick_size = tick_size
+        self.qty_step = qty_step
+        self.min_qty = min_qty
+        self.max_leverage = max_leverage
+        self.candles = {}  # interval minutes -> [[start ms, open, high, low, close, volume], ...]
+
+    @property
+    def bid(self) -> float:
+        return self.round_price(self.price - self.tick_size)
+
+    @property
+    def ask(self) -> float:
+        return self.round_price(self.price + self.tick_size)
+
+    def round_price(self, price: float) -> float:
+        return round(round(price / self.tick_size) * self.tick_size, 10)
+
+    def price_str(self, price: float) -> str:
+        return _fmt(price, self.tick_size)
+
+    def qty_str(self, qty: float) -> str:
+        return _fmt(qty, self.qty_step)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self._respond("GET", url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            params = json.loads(body) if body else {}
+        except ValueError:
+            params = {}
+        self._respond("POST", urlparse(self.path).path, params)
+
+    def _respond(self, method, path, params):
+        status, payload, headers = self.server.fake.handle(method, path, params)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeBybitHTTP:
+    """
+    Fake Bybit v5 REST server with a simulated account.
+
+    :param symbols: Linear USDT perpetuals to list, e.g. ``["BTCUSDT", "ETHUSDT"]``.
+    :param prices: Starting price per symbol (100.0 when missing).
+    :param latency: Seconds every response is delayed by, plus up to ``jitter`` seconds at random.
+    :param rate_limit: Requests per second allowed on each private endpoint (None for no limit);
+                       ``rate_limits`` overrides it per path, public endpoints included.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, symbols=("BTCUSDT",), prices=None,
+                 balance: float = 10000.0, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: int = None, rate_limits: dict = None, volatility: float = 0.0005,
+                 maker_fee: float = 0.0002, taker_fee: float = 0.00055, history: int = 1000, seed: int = None):
+        self.server = _ThreadingServer((host, port), _Handler)
+        self.server.fake = self
+        self.host, self.port = self.server.server_address
+
+        self.random = random.Random(seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_limits = dict(rate_limits or {})
+        self.volatility = volatility
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.history = history
+
+        prices = prices or {}
+        self.markets = {}
+        for symbol in symbols:
+            price = float(prices.get(symbol, 100.0))
+            tick_size = 10 ** (math.floor(math.log10(price)) - 4)
+            qty_step = 10 ** -max(0, min(3, math.floor(math.log10(price)) - 1))
+            self.markets[symbol] = _Market(symbol, price, tick_size, qty_step, qty_step, 50.0)
+
+        self.balance = balance
+        self.cum_realised = {}  # symbol -> realised pnl
+        self.leverage = {}  # symbol -> leverage
+        self.positions = {}  # (symbol, positionIdx) -> {'size', 'avg_price', 'created'}
+        self.orders = {}  # order id -> open order
+        self.order_history = deque(maxlen=5000)
+        self.executions = deque(maxlen=5000)
+        self.next_order_id = 1
+        self.lock = threading.RLock()
+
+        self.windows = {}  # path -> (window start, requests in window)
+        self.failures = {}  # path -> [remaining, retCode, retMsg, HTTP status]
+        self.request_counts = {}  # path -> requests served
+        self.stats_lock = threading.Lock()
+
+        self.routes = {
+            ("GET", "/v5/market/time"): self._server_time,
+            ("GET", "/v5/market/instruments-info"): self._instruments,
+            ("GET", "/v5/market/tickers"): self._tickers,
+            ("GET", "/v5/market/orderbook"): self._orderbook,
+            ("GET", "/v5/market/kline"): self._kline,
+            ("GET", "/v5/market/mark-price-kline"): self._kline,
+            ("GET", "/v5/market/risk-limit"): self._risk_limit,
+            ("GET", "/v5/asset/coin/query-info"): lambda params: {"rows": []},
+            ("GET", "/v5/user/query-api"): lambda params: {"id": "1", "readOnly": 0, "unified": 0, "uta": 1, "permissions": {}},
+            ("GET", "/v5/account/info"): lambda params: {"unifiedMarginStatus": 3, "marginMode": "REGULAR_MARGIN"},
+            ("GET", "/v5/account/wallet-balance"): self._wallet_balance,
+            ("GET", "/v5/position/list"): self._position_list,
+            ("GET", "/v5/order/realtime"): self._open_orders,
+            ("GET", "/v5/order/history"): self._order_history,
+            ("GET", "/v5/execution/list"): self._execution_list,
+            ("POST", "/v5/order/create"): self._create_order,
+            ("POST", "/v5/order/amend"): self._amend_order,
+            ("POST", "/v5/order/cancel"): self._cancel_order,
+            ("POST", "/v5/order/cancel-all"): self._cancel_all,
+            ("POST", "/v5/order/create-batch"): lambda params: self._batch(params, self._create_order),
+            ("POST", "/v5/order/amend-batch"): lambda params: self._batch(params, self._amend_order),
+            ("POST", "/v5/order/cancel-batch"): lambda params: self._batch(params, self._cancel_order),
+            ("POST", "/v5/position/set-leverage"): self._set_leverage,
+            ("POST", "/v5/position/switch-mode"): lambda params: {},
+            ("POST", "/v5/position/trading-stop"): lambda params: {},
+            ("POST", "/v5/position/set-risk-limit"): lambda params: {},
+        }
+        self.walk_thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, walk_interval: float = 0.5):
+        """Serve in a daemon thread and move prices every ``walk_interval`` seconds (0 keeps them still)."""
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        if walk_interval:
+            self.walk_thread = threading.Thread(target=self._walk_loop, args=(walk_interval,), daemon=True)
+            self.walk_thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fail(self, path: str, count: int = 1, ret_code: int = 10016, ret_msg: str = "Internal server error",
+             http_status: int = 200):
+        """Answer the next ``count`` requests to ``path`` with an error instead of handling them."""
+        with self.stats_lock:
+            self.failures[path] = [count, ret_code, ret_msg, http_status]
+
+    def set_price(self, symbol: str, price: float):
+        """Move a market to ``price`` and fill whatever the move crosses."""
+        with self.lock:
+            market = self.markets[symbol]
+            market.price = price
+            self._update_candles(market)
+            self._match(market)
+
+    # HTTP
+
+    def handle(self, method: str, path: str, params: dict):
+        delay = self.latency + (self.random.random() * self.jitter if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        now_ms = int(time.time() * 1000)
+        headers = {}
+        limit = self.rate_limits.get(path, self.rate_limit if not path.startswith("/v5/market/") else None)
+        with self.stats_lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+            if limit:
+                window_start, used = self.windows.get(path, (0, 0))
+                if now_ms - window_start >= 1000:
+                    window_start, used = now_ms, 0
+                used += 1
+                self.windows[path] = (window_start, used)
+                headers = {
+                    "X-Bapi-Limit": str(limit),
+                    "X-Bapi-Limit-Status": str(max(limit - used, 0)),
+                    "X-Bapi-Limit-Reset-Timestamp": str(window_start + 1000),
+                }
+                if used > limit:
+                    return 200, self._envelope(None, 10006, "Too many visits!"), headers
+            failure = self.failures.get(path)
+            if failure is not None:
+                failure[0] -= 1
+                if failure[0] <= 0:
+                    del self.failures[path]
+                return failure[3], self._envelope(None, failure[1], failure[2]), headers
+
+        route = self.routes.get((method, path))
+        if route is None:
+            return 404, self._envelope(None, 10404, f"{method} {path} is not implemented by the fake server"), headers
+        try:
+            with self.lock:
+                result = route(params)
+        except _FakeError as e:
+            return 200, self._envelope(None, e.ret_code, e.ret_msg), headers
+        except Exception as e:
+            return 200, self._envelope(None, 10001, f"params error: {e}"), headers
+
+        if isinstance(result, tuple):
+            result, ext_info = result
+            return 200, self._envelope(result, ext_info=ext_info), headers
+        return 200, self._envelope(result), headers
+
+    @staticmethod
+    def _envelope(result, ret_code: int = 0, ret_msg: str = "OK", ext_info=None) -> dict:
+        return {
+            "retCode": ret_code,
+            "retMsg": ret_msg,
+            "result": result if result is not None else {},
+            "retExtInfo": ext_info if ext_info is not None else {},
+            "time": int(time.time() * 1000),
+        }
+
+    def _market(self, symbol) -> _Market:
+        market = self.markets.get(symbol)
+        if market is None:
+            raise _FakeError(10001, f"params error: symbol invalid {symbol}")
+        return market
+
+    # Market data
+
+    def _server_time(self, params):
+        now = time.time()
+        return {"timeSecond": str(int(now)), "timeNano": str(int(now * 1e9))}
+
+    def _instruments(self, params):
+        category = params.get("category", "linear")
+        symbol = params.get("symbol")
+        rows = []
+        for market in self.markets.values():
+            if symbol and market.symbol != symbol:
+                continue
+            if category == "linear":
+                rows.append({
+                    "symbol": market.symbol, "contractType": "LinearPerpetual", "status": "Trading",
+                    "baseCoin": market.base, "quoteCoin": "USDT", "settleCoin": "USDT",
+                    "launchTime": "1585526400000", "deliveryTime": "0", "deliveryFeeRate": "", "priceScale": "4",
+                    "leverageFilter": {"minLeverage": "1", "maxLeverage": str(market.max_leverage), "leverageStep": "0.01"},
+                    "priceFilter": {"minPrice": str(market.tick_size), "maxPrice": "1999999", "tickSize": str(market.tick_size)},
+                    "lotSizeFilter": {"maxOrderQty": "1000000", "minOrderQty": str(market.min_qty), "qtyStep": str(market.qty_step),
+                                      "postOnlyMaxOrderQty": "1000000", "minNotionalValue": "5"},
+                    "unifiedMarginTrade": True, "fundingInterval": 480, "copyTrading": "both",
+                })
+            elif category == "spot":
+                rows.append({
+                    "symbol": market.symbol, "baseCoin": market.base, "quoteCoin": "USDT", "innovation": "0",
+                    "status": "Trading", "marginTrading": "both",
+                    "lotSizeFilter": {"basePrecision": str(market.qty_step), "quotePrecision": "0.0001",
+                                      "minOrderQty": str(market.min_qty), "maxOrderQty": "1000000",
+                                      "minOrderAmt": "1", "maxOrderAmt": "10000000"},
+                    "priceFilter": {"tickSize": str(market.tick_size)},
+                })
+        return {"category": category, "list": rows, "nextPageCursor": ""}
+
+    def _ticker(self, market: _Market) -> dict:
+        change = (market.price - market.open_24h) / market.open_24h
+        return {
+            "symbol": market.symbol, "lastPrice": market.price_str(market.price),
+            "indexPrice": market.price_str(market.price), "markPrice": market.price_str(market.price),
+            "prevPrice24h": market.price_str(market.open_24h), "price24hPcnt": f"{change:.6f}",
+            "highPrice24h": market.price_str(max(market.price, market.open_24h)),
+            "lowPrice24h": market.price_str(min(market.price, market.open_24h)),
+            "prevPrice1h": market.price_str(market.open_24h), "openInterest": "1000000",
+            "openInterestValue": f"{1000000 * market.price:.2f}", "turnover24h": f"{5000000 * market.price:.2f}",
+            "volume24h": "5000000", "fundingRate": "0.0001", "nextFundingTime": str((int(time.time()) // 28800 + 1) * 28800000),
+            "predictedDeliveryPrice": "", "basisRate": "", "deliveryFeeRate": "", "deliveryTime": "0",
+            "bid1Price": market.price_str(market.bid), "bid1Size": "10", "ask1Price": market.price_str(market.ask), "ask1Size": "10",
+        }
+
+    def _tickers(self, params):
+        symbol = params.get("symbol")
+        markets = [self._market(symbol)] if symbol else list(self.markets.values())
+        return {"category": params.get("category", "linear"), "list": [self._ticker(market) for market in markets]}
+
+    def _orderbook(self, params):
+        market = self._market(params.get("symbol"))
+        depth = min(int(params.get("limit", 25)), 500)
+        step = market.tick_size
+        sizes = [market.qty_str(max(market.min_qty, 1 + (i * 7919 % 13))) for i in range(depth)]
+        return {
+            "s": market.symbol,
+            "b": [[market.price_str(market.bid - step * i), sizes[i]] for i in range(depth)],
+            "a": [[market.price_str(market.ask + step * i), sizes[i]] for i in range(depth)],
+            "ts": int(time.time() * 1000),
+            "u": int(time.time() * 10),
+            "seq": int(time.time() * 10),
+        }
+
+    def _candles(self, market: _Market, minutes: int) -> list:
+        candles = market.candles.get(minutes)
+        if candles is None:
+            # Backfill a random walk that ends at the current price
+            period = minutes * 60_000
+            now = int(time.time() * 1000)
+            start = now - now % period - (self.history - 1) * period
+            vol = self.volatility * math.sqrt(minutes * 120)
+            closes = [market.price]
+            for _ in range(self.history - 1):
+                closes.append(closes[-1] / (1 + self.random.gauss(0, vol)))
+            closes.reverse()
+            candles = []
+            for i, close in enumerate(closes):
+                open_ = closes[i - 1] if i else close
+                wick = abs(self.random.gauss(0, vol / 2)) * close
+                candles.append([start + i * period, open_, max(open_, close) + wick, min(open_, close) - wick, close,
+                                round(self.random.uniform(100, 10000), 3)])
+            market.candles[minutes] = candles
+        return candles
+
+    def _update_candles(self, market: _Market):
+        now = int(time.time() * 1000)
+        for minutes, candles in market.candles.items():
+            period = minutes * 60_000
+            start = now - now % period
+            last = candles[-1]
+            while last[0] < start:
+                last = [last[0] + period, last[4], last[4], last[4], last[4], 0.0]
+                candles.append(last)
+            if len(candles) > self.history * 2:
+                del candles[:len(candles) - self.history]
+            last[2] = max(last[2], market.price)
+            last[3] = min(last[3], market.price)
+            last[4] = market.price
+            last[5] += round(self.random.uniform(0, 10), 3)
+
+    def _kline(self, params):
+        market = self._market(params.get("symbol"))
+        minutes = INTERVAL_MINUTES.get(str(params.get("interval", "1")))
+        if minutes is None:
+            raise _FakeError(10001, "params error: invalid interval")
+        candles = self._candles(market, minutes)
+        self._update_candles(market)
+        limit = min(int(params.get("limit", 200)), 1000)
+        start = int(params.get("start", 0))
+        end = int(params.get("end", 2 ** 62))
+        selected = [candle for candle in candles if start <= candle[0] <= end][-limit:]
+        return {
+            "category": params.get("category", "linear"),
+            "symbol": market.symbol,
+            "list": [
+                [str(c[0]), market.price_str(c[1]), market.price_str(c[2]), market.price_str(c[3]), market.price_str(c[4]),
+                 f"{c[5]:.3f}", f"{c[5] * c[4]:.4f}"]
+                for c in reversed(selected)
+            ],
+        }
+
+    def _risk_limit(self, params):
+        symbol = params.get("symbol")
+        rows = []
+        for market in self.markets.values():
+            if symbol and market.symbol != symbol:
+                continue
+            leverage = market.max_leverage
+            for i in range(5):
+                rows.append({
+                    "id": i + 1, "symbol": market.symbol, "riskLimitValue": str(200000 * (i + 1)),
+                    "maintenanceMargin": f"{0.005 * (i + 1):.3f}", "initialMargin": f"{1 / leverage:.4f}",
+                    "isLowestRisk": 1 if i == 0 else 0, "maxLeverage": f"{leverage:.2f}",
+                })
+                leverage = max(1.0, leverage / 2)
+        return {"category": params.get("category", "linear"), "list": rows, "nextPageCursor": ""}
+
+    # Account
+
+    def _upnl(self, symbol: str, idx: int) -> float:
+        position = self.positions.get((symbol, idx))
+        if not position or not position["size"]:
+            return 0.0
+        price = self.markets[symbol].price
+        direction = 1 if idx == 1 else -1
+        return (price - position["avg_price"]) * position["size"] * direction
+
+    def _margin(self):
+        position_im = sum(
+            position["size"] * self.markets[symbol].price / self.leverage.get(symbol, 10)
+            for (symbol, idx), position in self.positions.items()
+        )
+        order_im = sum(
+            order["qty"] * order["price"] / self.leverage.get(order["symbol"], 10)
+            for order in self.orders.values() if not order["reduceOnly"]
+        )
+        return position_im, order_im
+
+    def _wallet_balance(self, params):
+        upnl = sum(self._upnl(symbol, idx) for symbol, idx in self.positions)
+        position_im, order_im = self._margin()
+        equity = self.balance + upnl
+        available = max(equity - position_im - order_im, 0.0)
+        realised = sum(self.cum_realised.values())
+        return {"list": [{
+            "accountType": "UNIFIED", "accountIMRate": "0", "accountMMRate": "0",
+            "totalEquity": f"{equity:.4f}", "totalWalletBalance": f"{self.balance:.4f}",
+            "totalMarginBalance": f"{equity:.4f}", "totalAvailableBalance": f"{available:.4f}",
+            "totalPerpUPL": f"{upnl:.4f}", "totalInitialMargin": f"{position_im + order_im:.4f}",
+            "totalMaintenanceMargin": f"{position_im * 0.1:.4f}",
+            "coin": [{
+                "coin": "USDT", "equity": f"{equity:.4f}", "usdValue": f"{equity:.4f}",
+                "walletBalance": f"{self.balance:.4f}", "availableToWithdraw": f"{available:.4f}",
+                "availableToBorrow": "", "borrowAmount": "0", "accruedInterest": "0",
+                "totalOrderIM": f"{order_im:.4f}", "totalPositionIM": f"{position_im:.4f}",
+                "totalPositionMM": f"{position_im * 0.1:.4f}", "unrealisedPnl": f"{upnl:.4f}",
+                "cumRealisedPnl": f"{realised:.4f}", "bonus": "0", "locked": "0",
+            }],
+        }]}
+
+    def _position(self, symbol: str, idx: int) -> dict:
+        market = self.markets[symbol]
+        position = self.positions.get((symbol, idx)) or {"size": 0.0, "avg_price": 0.0, "created": int(time.time() * 1000)}
+        size = position["size"]
+        leverage = self.leverage.get(symbol, 10)
+        value = size * position["avg_price"]
+        if size:
+            direction = 1 if idx == 1 else -1
+            liq_price = max(position["avg_price"] * (1 - direction / leverage * 0.9), 0)
+        return {
+            "positionIdx": idx, "riskId": 1, "riskLimitValue": "200000", "symbol": symbol,
+            "side": ("Buy" if idx == 1 else "Sell") if size else "", "size": market.qty_str(size),
+            "avgPrice": market.price_str(position["avg_price"]) if size else "0", "positionValue": f"{value:.4f}",
+            "tradeMode": 0, "autoAddMargin": 0, "positionStatus": "Normal", "leverage": str(leverage),
+            "markPrice": market.price_str(market.price), "liqPrice": market.price_str(liq_price) if size else "",
+            "bustPrice": "", "positionIM": f"{value / leverage:.4f}", "positionMM": f"{value / leverage * 0.1:.4f}",
+            "positionBalance": f"{value / leverage:.4f}", "tpslMode": "Full", "takeProfit": "0", "stopLoss": "0",
+            "trailingStop": "0", "unrealisedPnl": f"{self._upnl(symbol, idx):.4f}",
+            "cumRealisedPnl": f"{self.cum_realised.get(symbol, 0.0):.4f}", "adlRankIndicator": 1 if size else 0,
+            "isReduceOnly": False, "createdTime": str(position["created"]), "updatedTime": str(int(time.time() * 1000)),
+            "seq": 1,
+        }
+
+    def _position_list(self, params):
+        symbol = params.get("symbol")
+        if symbol:
+            self._market(symbol)
+            rows = [self._position(symbol, idx) for idx in (1, 2)]
+        else:
+            rows = [self._position(s, idx) for (s, idx), position in sorted(self.positions.items()) if position["size"]]
+        return {"category": params.get("category", "linear"), "list": rows, "nextPageCursor": ""}
+
+    def _set_leverage(self, params):
+        market = self._market(params.get("symbol"))
+        leverage = float(params.get("buyLeverage") or params.get("sellLeverage") or 10)
+        if leverage > market.max_leverage:
+            raise _FakeError(10001, "leverage invalid")
+        if self.leverage.get(market.symbol) == leverage:
+            raise _FakeError(110043, "Set leverage not modified")
+        self.leverage[market.symbol] = leverage
+        return {}
+
+    # Orders
+
+    def _order_view(self, order: dict) -> dict:
+        market = self.markets[order["symbol"]]
+        filled = order["filled"]
+        return {
+            "orderId": order["id"], "orderLinkId": order["orderLinkId"], "blockTradeId": "", "symbol": order["symbol"],
+            "price": market.price_str(order["price"]) if order["orderType"] == "Limit" else "0",
+            "qty": market.qty_str(order["qty"]), "side": order["side"], "isLeverage": "", "positionIdx": order["positionIdx"],
+            "orderStatus": order["status"], "cancelType": order.get("cancelType", "UNKNOWN"),
+            "rejectReason": order.get("rejectReason", "EC_NoError"),
+            "avgPrice": market.price_str(order["avg_price"]) if filled else "0",
+            "leavesQty": market.qty_str(order["qty"] - filled if order["status"] in ("New", "PartiallyFilled") else 0),
+            "leavesValue": f"{(order['qty'] - filled) * order['price']:.4f}", "cumExecQty": market.qty_str(filled),
+            "cumExecValue": f"{filled * order['avg_price']:.4f}", "cumExecFee": f"{order['fee']:.6f}",
+            "timeInForce": order["timeInForce"], "orderType": order["orderType"], "stopOrderType": "",
+            "orderIv": "", "triggerPrice": "", "takeProfit": "", "stopLoss": "", "tpTriggerBy": "", "slTriggerBy": "",
+            "triggerDirection": 0, "triggerBy": "", "lastPriceOnCreated": market.price_str(order["created_price"]),
+            "reduceOnly": order["reduceOnly"], "closeOnTrigger": False, "smpType": "None", "smpGroup": 0,
+            "smpOrderId": "", "tpslMode": "", "tpLimitPrice": "", "slLimitPrice": "", "placeType": "",
+            "createdTime": str(order["created"]), "updatedTime": str(order["updated"]),
+        }
+
+    def _paginate(self, rows: list, params: dict) -> dict:
+        limit = min(int(params.get("limit", 20)), 50)
+        offset = int(params.get("cursor") or 0)
+        page = rows[offset:offset + limit]
+        cursor = str(offset + limit) if offset + limit < len(rows) else ""
+        return {"category": params.get("category", "linear"), "list": page, "nextPageCursor": cursor}
+
+    def _open_orders(self, params):
+        symbol = params.get("symbol")
+        rows = [
+            self._order_view(order) for order in sorted(self.orders.values(), key=lambda order: -order["created"])
+            if (not symbol or order["symbol"] == symbol)
+            and (not params.get("orderId") or order["id"] == params["orderId"])
+            and (not params.get("orderLinkId") or order["orderLinkId"] == params["orderLinkId"])
+        ]
+        return self._paginate(rows, params)
+
+    def _order_history(self, params):
+        symbol = params.get("symbol")
+        rows = [self._order_view(order) for order in reversed(self.order_history) if not symbol or order["symbol"] == symbol]
+        return self._paginate(rows, params)
+
+    def _execution_list(self, params):
+        symbol = params.get("symbol")
+        rows = [dict(execution) for execution in reversed(self.executions) if not symbol or execution["symbol"] == symbol]
+        return self._paginate(rows, params)
+
+    def _position_idx(self, side: str, position_idx: int, reduce_only: bool) -> int:
+        if position_idx in (1, 2):
+            return position_idx
+        opens_long = side == "Buy"
+        if reduce_only:
+            opens_long = not opens_long
+        return 1 if opens_long else 2
+
+    def _create_order(self, params):
+        market = self._market(params.get("symbol"))
+        side = params.get("side")
+        if side not in ("Buy", "Sell"):
+            raise _FakeError(10001, "params error: side invalid")
+        order_type = params.get("orderType", "Limit")
+        qty = float(params.get("qty") or 0)
+        if qty < market.min_qty:
+            raise _FakeError(170136, "Order quantity below the lower limit")
+        reduce_only = str(params.get("reduceOnly", "false")).lower() == "true"
+        position_idx = self._position_idx(side, int(params.get("positionIdx") or 0), reduce_only)
+        reduces = (side == "Sell") == (position_idx == 1)
+        if reduces and not (self.positions.get((market.symbol, position_idx)) or {}).get("size"):
+            raise _FakeError(110017, "Reduce-only rule not satisfied")
+        order_link_id = params.get("orderLinkId") or ""
+        if order_link_id and any(order["orderLinkId"] == order_link_id for order in self.orders.values()):
+            raise _FakeError(110072, "OrderLinkedID is duplicate")
+
+        now = int(time.time() * 1000)
+        order = {
+            "id": f"fake-{self.next_order_id}", "orderLinkId": order_link_id, "symbol": market.symbol, "side": side,
+            "orderType": order_type, "qty": qty, "price": float(params.get("price") or 0) if order_type == "Limit" else 0.0,
+            "timeInForce": params.get("timeInForce") or ("GTC" if order_type == "Limit" else "IOC"),
+            "positionIdx": position_idx, "reduceOnly": reduces, "status": "New", "filled": 0.0, "avg_price": 0.0,
+            "fee": 0.0, "created": now, "updated": now, "created_price": market.price,
+        }
+        self.next_order_id += 1
+
+        crosses = order_type == "Market" or (order["price"] >= market.ask if side == "Buy" else order["price"] <= market.bid)
+        if crosses and order["timeInForce"] == "PostOnly":
+            order.update(status="Cancelled", cancelType="CancelByUser", rejectReason="EC_PostOnlyWillTakeLiquidity")
+            self.order_history.append(order)
+        elif crosses:
+            fill_price = market.ask if side == "Buy" else market.bid
+            if order_type == "Limit":
+                fill_price = min(fill_price, order["price"]) if side == "Buy" else max(fill_price, order["price"])
+            self._fill(order, fill_price, self.taker_fee)
+        elif order["timeInForce"] in ("IOC", "FOK"):
+            order.update(status="Cancelled", cancelType="CancelByUser")
+            self.order_history.append(order)
+        else:
+            self.orders[order["id"]] = order
+        return {"orderId": order["id"], "orderLinkId": order_link_id}
+
+    def _find_order(self, params) -> dict:
+        order = self.orders.get(params.get("orderId"))
+        if order is None and params.get("orderLinkId"):
+            order = next((o for o in self.orders.values() if o["orderLinkId"] == params["orderLinkId"]), None)
+        if order is None or (params.get("symbol") and order["symbol"] != params["symbol"]):
+            raise _FakeError(110001, "Order does not exist")
+        return order
+
+    def _amend_order(self, params):
+        order = self._find_order(params)
+        market = self.markets[order["symbol"]]
+        if params.get("qty") is not None:
+            order["qty"] = float(params["qty"])
+        if params.get("price") is not None:
+            order["price"] = float(params["price"])
+        order["updated"] = int(time.time() * 1000)
+        self._match(market)
+        return {"orderId": order["id"], "orderLinkId": order["orderLinkId"]}
+
+    def _cancel_order(self, params):
+        order = self._find_order(params)
+        self._close_order(order, "Cancelled")
+        return {"orderId": order["id"], "orderLinkId": order["orderLinkId"]}
+
+    def _cancel_all(self, params):
+        symbol = params.get("symbol")
+        cancelled = []
+        for order in list(self.orders.values()):
+            if not symbol or order["symbol"] == symbol:
+                self._close_order(order, "Cancelled")
+                cancelled.append({"orderId": order["id"], "orderLinkId": order["orderLinkId"]})
+        return {"list": cancelled, "success": "1"}
+
+    def _batch(self, params, handler):
+        results, statuses = [], []
+        for request in params.get("request") or []:
+            try:
+                results.append(dict(handler(dict(request, category=params.get("category"))), symbol=request.get("symbol"),
+                                    category=params.get("category"), createAt=str(int(time.time() * 1000))))
+                statuses.append({"code": 0, "msg": "OK"})
+            except _FakeError as e:
+                results.append({"category": params.get("category"), "symbol": request.get("symbol"), "orderId": "", "orderLinkId": request.get("orderLinkId", "")})
+                statuses.append({"code": e.ret_code, "msg": e.ret_msg})
+        return {"list": results}, {"list": statuses}
+
+    def _close_order(self, order: dict, status: str):
+        self.orders.pop(order["id"], None)
+        order["status"] = status
+        order["updated"] = int(time.time() * 1000)
+        self.order_history.append(order)
+
+    # Matching
+
+    def _fill(self, order: dict, price: float, fee_rate: float):
+        market = self.markets[order["symbol"]]
+        key = (order["symbol"], order["positionIdx"])
+        position = self.positions.setdefault(key, {"size": 0.0, "avg_price": 0.0, "created": int(time.time() * 1000)})
+        qty = order["qty"] - order["filled"]
+        if order["reduceOnly"]:
+            qty = min(qty, position["size"])
+
+        fee = qty * price * fee_rate
+        self.balance -= fee
+        if order["reduceOnly"]:
+            direction = 1 if order["positionIdx"] == 1 else -1
+            pnl = (price - position["avg_price"]) * qty * direction
+            self.balance += pnl
+            self.cum_realised[order["symbol"]] = self.cum_realised.get(order["symbol"], 0.0) + pnl - fee
+            position["size"] = round(position["size"] - qty, 10)
+            if position["size"] <= 0:
+                del self.positions[key]
+        else:
+            total = position["size"] + qty
+            position["avg_price"] = (position["avg_price"] * position["size"] + price * qty) / total
+            position["size"] = round(total, 10)
+            self.cum_realised[order["symbol"]] = self.cum_realised.get(order["symbol"], 0.0) - fee
+
+        order["avg_price"] = price
+        order["filled"] = order["filled"] + qty
+        order["fee"] += fee
+        self._close_order(order, "Filled")
+        self.executions.append({
+            "symbol": order["symbol"], "orderId": order["id"], "orderLinkId": order["orderLinkId"], "side": order["side"],
+            "orderPrice": market.price_str(order["price"]), "orderQty": market.qty_str(order["qty"]), "orderType": order["orderType"],
+            "execId": f"exec-{order['id']}", "execPrice": market.price_str(price), "execQty": market.qty_str(qty),
+            "execFee": f"{fee:.6f}", "execType": "Trade", "execValue": f"{qty * price:.4f}", "feeRate": str(fee_rate),
+            "isMaker": fee_rate == self.maker_fee, "execTime": str(int(time.time() * 1000)), "leavesQty": "0",
+            "closedSize": market.qty_str(qty if order["reduceOnly"] else 0), "markPrice": market.price_str(market.price),
+        })
+
+    def _match(self, market: _Market):
+        for order in list(self.orders.values()):
+            if order["symbol"] != market.symbol:
+                continue
+            if (order["side"] == "Buy" and market.ask <= order["price"]) or (order["side"] == "Sell" and market.bid >= order["price"]):
+                if order["reduceOnly"] and not (self.positions.get((market.symbol, order["positionIdx"])) or {}).get("size"):
+                    self._close_order(order, "Cancelled")
+                    continue
+                self._fill(order, order["price"], self.maker_fee)
+
+    def step(self):
+        """Move every price one random-walk step and fill the orders it crosses."""
+        with self.lock:
+            for market in self.markets.values():
+                market.price = max(market.round_price(market.price * (1 + self.random.gauss(0, self.volatility))), market.tick_size)
+                self._update_candles(market)
+                self._match(market)
+
+    def _walk_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            self.step()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Bybit v5 REST server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--symbols", nargs="+", default=["BTCUSDT"])
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds at random")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Requests per second per private endpoint")
+    args = parser.parse_args()
+
+    fake = FakeBybitHTTP(args.host, args.port, symbols=args.symbols, balance=args.balance, latency=args.latency,
+                         jitter=args.jitter, rate_limit=args.rate_limit).start()
+    print(f"Fake Bybit REST API listening on {fake.url}")
+    while True:
+        time.sleep(3600)
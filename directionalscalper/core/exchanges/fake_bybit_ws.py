@@ -0,0 +1,295 @@
+"""
+Minimal stand-in for the Bybit v5 WebSockets, for running the streams offline.
+
+Only the stdlib is used. The server speaks just enough of RFC 6455 (text frames, ping/pong, close)
+and of Bybit's auth/subscribe/unsubscribe/ping protocol for BybitPublicStream and BybitPrivateStream.
+Messages are pushed with ``publish`` or generated by ``run_random_walk``.
+
+Run standalone and point the bot at it:
+
+    python -m directionalscalper.core.exchanges.fake_bybit_ws --port 8765 --symbols BTCUSDT ETHUSDT
+    BYBIT_WS_PUBLIC_URL=ws://127.0.0.1:8765 python multi_bot.py ...
+"""
+import json
+import time
+import base64
+import random
+import socket
+import struct
+import hashlib
+import argparse
+import threading
+import socketserver
+
+WS_MAGIC = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class _Connection(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.topics = set()
+        self.send_lock = threading.Lock()
+        self.alive = True
+
+    def handle(self):
+        if not self._handshake():
+            return
+        self.server.fake.add_connection(self)
+        try:
+            while self.alive:
+                frame = self._read_frame()
+                if frame is None:
+                    break
+                opcode, payload = frame
+                if opcode == 0x8:  # close
+                    self._send_frame(0x8, payload[:2])
+                    break
+                if opcode == 0x9:  # ping
+                    self._send_frame(0xA, payload)
+                elif opcode == 0x1:
+                    self.server.fake.handle_message(self, payload.decode())
+        except OSError:
+            pass
+        finally:
+            self.alive = False
+            self.server.fake.remove_connection(self)
+
+    def _handshake(self) -> bool:
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return False
+            data += chunk
+
+        headers = {}
+        for line in data.decode(errors="replace").split("\r\n")[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        key = headers.get("sec-websocket-key")
+        if key is None:
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + WS_MAGIC).encode()).digest()).decode()
+        self.request.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+        return True
+
+    def _recv_exact(self, n):
+        buf = b""
+        while len(buf) < n:
+            chunk = self.request.recv(n - len(buf))
+            if not chunk:
+                return None
+            buf += chunk
+        return buf
+
+    def _read_frame(self):
+        header = self._recv_exact(2)
+        if header is None:
+            return None
+        opcode = header[0] & 0x0F
+        masked = header[1] & 0x80
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._recv_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._recv_exact(8))[0]
+        mask = self._recv_exact(4) if masked else None
+        payload = self._recv_exact(length) if length else b""
+        if payload is None:
+            return None
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+
+    def _send_frame(self, opcode, payload: bytes):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack(">BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+        with self.send_lock:
+            self.request.sendall(header + payload)
+
+    def send_json(self, payload: dict):
+        try:
+            self._send_frame(0x1, json.dumps(payload).encode())
+        except OSError:
+            self.alive = False
+
+    def drop(self):
+        """Close the socket without a close frame, like a network failure."""
+        self.alive = False
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeBybitWS:
+    """
+    Fake Bybit WebSocket server, usable as the public or the private endpoint.
+
+    ``snapshot_provider(topic)`` is called on every subscribe and may return the data of the snapshot
+    to push back, like Bybit does for tickers and orderbooks.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, snapshot_provider=None):
+        self.server = _ThreadingServer((host, port), _Connection)
+        self.server.fake = self
+        self.host, self.port = self.server.server_address
+        self.snapshot_provider = snapshot_provider
+        self.connections = []
+        self.connections_lock = threading.Lock()
+        self.subscribe_requests = []  # Every topic list a client subscribed to, in order
+        self.connection_count = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.drop_connections()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_connection(self, conn):
+        with self.connections_lock:
+            self.connections.append(conn)
+            self.connection_count += 1
+
+    def remove_connection(self, conn):
+        with self.connections_lock:
+            if conn in self.connections:
+                self.connections.remove(conn)
+
+    def drop_connections(self):
+        with self.connections_lock:
+            connections = list(self.connections)
+        for conn in connections:
+            conn.drop()
+
+    def subscribed_topics(self) -> set:
+        with self.connections_lock:
+            return set().union(*(conn.topics for conn in self.connections)) if self.connections else set()
+
+    def handle_message(self, conn, message: str):
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+
+        op = msg.get("op")
+        if op == "auth":
+            # Any key is accepted, the private stream only needs the handshake to complete
+            conn.send_json({"success": True, "ret_msg": "", "op": "auth", "conn_id": "fake"})
+        elif op == "ping":
+            conn.send_json({"success": True, "ret_msg": "pong", "conn_id": "fake", "op": "ping"})
+        elif op in ("subscribe", "unsubscribe"):
+            topics = msg.get("args", [])
+            if op == "subscribe":
+                conn.topics.update(topics)
+                self.subscribe_requests.append(list(topics))
+            else:
+                conn.topics.difference_update(topics)
+            conn.send_json({"success": True, "ret_msg": "", "conn_id": "fake", "req_id": msg.get("req_id", ""), "op": op})
+
+            if op == "subscribe" and self.snapshot_provider is not None:
+                for topic in topics:
+                    data = self.snapshot_provider(topic)
+                    if data is not None:
+                        self._push(conn, topic, "snapshot", data)
+
+    def _push(self, conn, topic, msg_type, data):
+        conn.send_json({"topic": topic, "type": msg_type, "ts": int(time.time() * 1000), "data": data})
+
+    def publish(self, topic: str, data, msg_type: str = "snapshot"):
+        """Push a message to every connection subscribed to ``topic``."""
+        with self.connections_lock:
+            connections = [conn for conn in self.connections if topic in conn.topics]
+        for conn in connections:
+            self._push(conn, topic, msg_type, data)
+
+    def run_random_walk(self, symbols, prices=None, interval: float = 0.5):
+        """Publish random-walk tickers, orderbooks and 1m/5m klines for ``symbols`` until the process exits."""
+        prices = dict(prices or {})
+        for symbol in symbols:
+            prices.setdefault(symbol, 100.0)
+        klines = {}
+
+        def book(price):
+            return {
+                "b": [[f"{price - 0.01 * (i + 1):.2f}", f"{random.uniform(1, 10):.3f}"] for i in range(50)],
+                "a": [[f"{price + 0.01 * (i + 1):.2f}", f"{random.uniform(1, 10):.3f}"] for i in range(50)],
+            }
+
+        def ticker(symbol):
+            price = prices[symbol]
+            return {"symbol": symbol, "lastPrice": f"{price:.2f}", "bid1Price": f"{price - 0.01:.2f}", "ask1Price": f"{price + 0.01:.2f}"}
+
+        def snapshot(topic):
+            parts = topic.split(".")
+            symbol = parts[-1]
+            if symbol not in prices:
+                return None
+            if parts[0] == "tickers":
+                return ticker(symbol)
+            if parts[0] == "orderbook":
+                return dict(book(prices[symbol]), s=symbol, u=1, seq=1)
+            return None
+
+        self.snapshot_provider = snapshot
+        update_id = 1
+        while True:
+            time.sleep(interval)
+            now = int(time.time() * 1000)
+            update_id += 1
+            for symbol in symbols:
+                prices[symbol] *= 1 + random.gauss(0, 0.0005)
+                price = prices[symbol]
+                self.publish(f"tickers.{symbol}", ticker(symbol), "delta")
+                self.publish(f"orderbook.50.{symbol}", dict(book(price), s=symbol, u=update_id, seq=update_id))
+                for minutes in (1, 5):
+                    start = now - now % (minutes * 60_000)
+                    candle = klines.get((symbol, minutes))
+                    if candle is None or candle["start"] != start:
+                        candle = {"start": start, "end": start + minutes * 60_000 - 1, "interval": str(minutes),
+                                  "open": price, "high": price, "low": price}
+                        klines[(symbol, minutes)] = candle
+                    candle["high"] = max(candle["high"], price)
+                    candle["low"] = min(candle["low"], price)
+                    data = {
+                        "start": candle["start"], "end": candle["end"], "interval": candle["interval"],
+                        "open": f"{candle['open']:.2f}", "close": f"{price:.2f}",
+                        "high": f"{candle['high']:.2f}", "low": f"{candle['low']:.2f}",
+                        "volume": f"{random.uniform(1, 100):.3f}", "turnover": "0", "confirm": False, "timestamp": now,
+                    }
+                    self.publish(f"kline.{minutes}.{symbol}", [data])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Bybit v5 WebSocket server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbols", nargs="+", default=["BTCUSDT"])
+    args = parser.parse_args()
+
+    fake = FakeBybitWS(args.host, args.port).start()
+    print(f"Fake Bybit WebSocket listening on {fake.url}")
+    fake.run_random_walk(args.symbols)
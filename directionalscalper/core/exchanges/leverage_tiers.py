@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Optional
+
+from directionalscalper.core.strategies.logger import Logger
+from .single_flight import SingleFlight
+
+logging = Logger(logger_name="LeverageTiers", filename="LeverageTiers.log", stream=True)
+
+
+class LeverageTierCache:
+    """
+    Process-wide cache of Bybit risk-limit (leverage) tiers, keyed by exchange symbol id.
+
+    The tiers of every linear market are loaded in the background with one paginated
+    ``/v5/market/risk-limit`` walk and reloaded every ``ttl_seconds``. A symbol missing from the cache,
+    or whose entry outlived the TTL, is fetched on its own (concurrent misses share one request).
+    Tiers are the ccxt structures from ``fetch_derivatives_market_leverage_tiers``.
+    """
+
+    _caches = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(self, exchange, market_type: str = 'swap', ttl_seconds: int = 6 * 3600):
+        self.exchange = exchange
+        self.market_type = market_type
+        self.ttl_seconds = ttl_seconds
+
+        self.tiers = {}  # symbol id -> (loaded at, tiers)
+        self.single_flight = SingleFlight()
+        self.refresh_thread = None
+
+    @classmethod
+    def for_exchange(cls, exchange, market_type: str = 'swap', **kwargs) -> "LeverageTierCache":
+        key = (exchange.id, market_type)
+        with cls._caches_lock:
+            cache = cls._caches.get(key)
+            if cache is None:
+                cache = cls._caches[key] = cls(exchange, market_type, **kwargs)
+                if market_type == 'swap':
+                    cache._start_background_refresh()
+        return cache
+
+    def _start_background_refresh(self):
+        self.refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self.refresh_thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            self.refresh_all()
+            time.sleep(self.ttl_seconds)
+
+    def refresh_all(self) -> bool:
+        try:
+            rows = []
+            request = {"category": "linear"}
+            while True:
+                result = self.exchange.publicGetV5MarketRiskLimit(request).get("result", {})
+                rows.extend(result.get("list", []))
+                cursor = result.get("nextPageCursor")
+                if not cursor:
+                    break
+                request["cursor"] = cursor
+        except Exception as e:
+            logging.error(f"Failed to load leverage tiers: {e}")
+            return False
+
+        by_symbol = {}
+        for row in rows:
+            by_symbol.setdefault(row.get("symbol"), []).append(row)
+
+        now = time.time()
+        tiers = dict(self.tiers)
+        for symbol_id, symbol_rows in by_symbol.items():
+            market = self._market(symbol_id)
+            if market is None:
+                continue
+            symbol_rows.sort(key=lambda row: float(row.get("riskLimitValue") or 0))
+            tiers[symbol_id] = (now, self.exchange.parse_market_leverage_tiers(symbol_rows, market))
+        self.tiers = tiers
+        logging.info(f"Loaded leverage tiers for {len(by_symbol)} symbols")
+        return True
+
+    def _market(self, symbol):
+        try:
+            return self.exchange.market(symbol)
+        except Exception:
+            return None
+
+    def _market_id(self, symbol: str) -> str:
+        market = self._market(symbol)
+        return market["id"] if market is not None else symbol
+
+    def get_tiers(self, symbol: str) -> Optional[list]:
+        """Tiers for 'BTCUSDT' or 'BTC/USDT:USDT', lowest notional first, or None if they cannot be loaded."""
+        symbol_id = self._market_id(symbol)
+        cached = self.tiers.get(symbol_id)
+        if cached is not None and time.time() - cached[0] < self.ttl_seconds:
+            return cached[1]
+
+        def fetch():
+            tiers = self.exchange.fetch_derivatives_market_leverage_tiers(symbol)
+            self.tiers = dict(self.tiers, **{symbol_id: (time.time(), tiers)})
+            return tiers
+
+        try:
+            return self.single_flight.do(symbol_id, fetch)
+        except Exception as e:
+            logging.error(f"Failed to fetch leverage tiers for {symbol}: {e}")
+            # A stale entry beats none
+            return cached[1] if cached is not None else None
+
+    def tier_for_notional(self, symbol: str, notional: float) -> Optional[dict]:
+        """The tier a position of ``notional`` (quote currency) falls in; the last tier if it is above all of them."""
+        tiers = self.get_tiers(symbol)
+        if not tiers:
+            return None
+        for tier in tiers:
+            if tier.get("maxNotional") is None or notional <= tier["maxNotional"]:
+                return tier
+        return tiers[-1]
+
+    def max_leverage(self, symbol: str, notional: float = None) -> Optional[float]:
+        """The highest leverage for ``symbol``, or the one allowed at ``notional`` when given."""
+        if notional is not None:
+            tier = self.tier_for_notional(symbol, notional)
+            return tier.get("maxLeverage") if tier is not None else None
+        tiers = self.get_tiers(symbol)
+        if not tiers:
+            return None
+        leverages = [tier["maxLeverage"] for tier in tiers if tier.get("maxLeverage") is not None]
+        return max(leverages) if leverages else None
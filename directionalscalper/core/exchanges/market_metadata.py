@@ -0,0 +1,183 @@
+import threading
+import time
+from typing import Optional
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="MarketMetadata", filename="MarketMetadata.log", stream=True)
+
+
+class MarketInfo:
+    """Flattened view of a single ccxt market with the fields the strategies read on every loop."""
+
+    __slots__ = (
+        "symbol",
+        "id",
+        "type",
+        "amount_precision",
+        "price_precision",
+        "min_qty",
+        "tick_size",
+        "contract_size",
+        "max_leverage",
+        "market",
+    )
+
+    def __init__(self, market: dict):
+        precision = market.get("precision") or {}
+        limits = market.get("limits") or {}
+        info = market.get("info") or {}
+
+        self.symbol = market.get("symbol")
+        self.id = market.get("id")
+        self.type = market.get("type")
+        self.amount_precision = precision.get("amount")
+        self.price_precision = precision.get("price")
+        self.min_qty = (limits.get("amount") or {}).get("min")
+        self.tick_size = (info.get("priceFilter") or {}).get("tickSize")
+        self.contract_size = market.get("contractSize")
+        self.max_leverage = (limits.get("leverage") or {}).get("max")
+        self.market = market
+
+
+class MarketMetadataStore:
+    """
+    Process-wide, in-memory index of exchange markets.
+
+    Markets are loaded once per (exchange id, market type) and indexed by both the ccxt
+    symbol ('BTC/USDT:USDT') and the exchange id ('BTCUSDT'), so lookups are O(1) dict hits.
+    The index is rebuilt in a background thread every ``ttl_seconds`` and synchronously
+    when a lookup misses (at most once per ``miss_refresh_interval`` seconds).
+    """
+
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, exchange, market_type: str = "swap", ttl_seconds: int = 3600, miss_refresh_interval: int = 30):
+        self.exchange = exchange
+        self.market_type = market_type
+        self.ttl_seconds = ttl_seconds
+        self.miss_refresh_interval = miss_refresh_interval
+
+        self.by_symbol = {}
+        self.by_id = {}
+        self.last_refresh_time = 0.0
+        self.last_miss_refresh_time = 0.0
+
+        self.refresh_lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.refresh_thread = None
+
+    @classmethod
+    def for_exchange(cls, exchange, market_type: str = "swap", **kwargs) -> "MarketMetadataStore":
+        """
+        Return the shared store for this ccxt exchange and market type, creating and loading it on first use.
+        """
+        key = (exchange.id, market_type)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls(exchange, market_type, **kwargs)
+                cls._stores[key] = store
+        store.ensure_loaded()
+        return store
+
+    def ensure_loaded(self):
+        """Load the index unless it is already loaded; threads racing on a new store load it once."""
+        if self.by_symbol:
+            return
+        with self.load_lock:
+            if not self.by_symbol:
+                self.load()
+
+    def load(self):
+        """Build the index, reusing markets ccxt already loaded when available."""
+        markets = getattr(self.exchange, "markets", None)
+        if markets:
+            self._index(list(markets.values()))
+        else:
+            self.refresh()
+        self._start_background_refresh()
+
+    def refresh(self) -> bool:
+        with self.refresh_lock:
+            try:
+                markets = self.exchange.fetch_markets()
+            except Exception as e:
+                logging.error(f"Failed to refresh market metadata for {self.exchange.id}: {e}")
+                return False
+            self._index(markets)
+            return True
+
+    def _index(self, markets: list):
+        by_symbol = {}
+        by_id = {}
+        for market in markets:
+            info = MarketInfo(market)
+            if info.symbol:
+                by_symbol[info.symbol] = info
+            if info.id:
+                # Bybit reuses the same id for spot and linear markets, prefer the configured market type
+                existing = by_id.get(info.id)
+                if existing is None or (existing.type != self.market_type and info.type == self.market_type):
+                    by_id[info.id] = info
+
+        # Swap the references in one go so readers never see a half-built index
+        self.by_symbol = by_symbol
+        self.by_id = by_id
+        self.last_refresh_time = time.time()
+        logging.info(f"Indexed {len(by_symbol)} markets for {self.exchange.id} ({self.market_type})")
+
+    def _start_background_refresh(self):
+        with self.refresh_lock:
+            if self.refresh_thread is not None and self.refresh_thread.is_alive():
+                return
+            self.refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self.refresh_thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.ttl_seconds)
+            self.refresh()
+
+    def get(self, symbol: str) -> Optional[MarketInfo]:
+        """
+        Look up a market by ccxt symbol or exchange id.
+
+        :param str symbol: 'BTC/USDT:USDT' or 'BTCUSDT'.
+        :return: The MarketInfo, or None if the symbol is unknown even after a refresh.
+        """
+        market = self.by_symbol.get(symbol) or self.by_id.get(symbol)
+        if market is not None:
+            return market
+
+        now = time.time()
+        if now - self.last_miss_refresh_time < self.miss_refresh_interval:
+            return None
+        self.last_miss_refresh_time = now
+
+        logging.info(f"Market metadata miss for {symbol}, refreshing")
+        self.refresh()
+        return self.by_symbol.get(symbol) or self.by_id.get(symbol)
+
+    def precision(self, symbol: str):
+        market = self.get(symbol)
+        if market is None:
+            return None, None
+        return market.amount_precision, market.price_precision
+
+    def min_qty(self, symbol: str):
+        market = self.get(symbol)
+        return market.min_qty if market is not None else None
+
+    def tick_size(self, symbol: str):
+        market = self.get(symbol)
+        return market.tick_size if market is not None else None
+
+    def contract_size(self, symbol: str):
+        market = self.get(symbol)
+        return market.contract_size if market is not None else None
+
+    def max_leverage(self, symbol: str):
+        market = self.get(symbol)
+        return market.max_leverage if market is not None else None
@@ -0,0 +1,207 @@
+import bisect
+import functools
+import inspect
+import json
+import logging as std_logging
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="ExchangeMetrics", filename="ExchangeMetrics.log", stream=True)
+
+
+class LatencyHistogram:
+    """Call count, errors and latency of one endpoint or method, bucketed on fixed millisecond bounds."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+    __slots__ = ("buckets", "count", "errors", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float, error: bool = False):
+        self.buckets[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if error:
+            self.errors += 1
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the ``pct`` percentile, capped at ``max_ms``."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(float(self.BOUNDS_MS[i]), self.max_ms) if i < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class ExchangeMetrics:
+    """
+    Process-wide counters for exchange calls, cheap enough to leave on.
+
+    Two layers are recorded: every ``Exchange`` method call (``method``) and every REST request the ccxt
+    client sends (``endpoint``), each with a latency histogram and an error count. Retries made by
+    ``retry_api_call`` are counted per function, and calls are counted per symbol per minute for the last
+    ``window_minutes`` minutes. ``snapshot()`` is the in-process view, ``start_exporter`` appends it to a
+    rotating JSON-lines file.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, window_minutes: int = 60):
+        self.window_minutes = window_minutes
+        self.started_at = time.time()
+
+        self.histograms = {}  # (kind, name) -> LatencyHistogram
+        self.retries = {}  # function name -> retry count
+        self.symbol_minutes = {}  # symbol -> {minute: calls}
+        self.lock = threading.Lock()
+
+        self.exporter_thread = None
+
+    @classmethod
+    def for_process(cls) -> "ExchangeMetrics":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        return cls._instance
+
+    def record(self, kind: str, name: str, seconds: float, symbol: str = None, error: bool = False):
+        with self.lock:
+            histogram = self.histograms.get((kind, name))
+            if histogram is None:
+                histogram = self.histograms[(kind, name)] = LatencyHistogram()
+            histogram.add(seconds * 1000, error)
+            if symbol is not None and kind == "endpoint":
+                minutes = self.symbol_minutes.setdefault(symbol, {})
+                minute = int(time.time() // 60)
+                minutes[minute] = minutes.get(minute, 0) + 1
+                if len(minutes) > self.window_minutes:
+                    for old in [m for m in minutes if m <= minute - self.window_minutes]:
+                        del minutes[old]
+
+    def record_retry(self, name: str):
+        with self.lock:
+            self.retries[name] = self.retries.get(name, 0) + 1
+
+    def calls_per_minute(self, symbol: str = None, minutes: int = 5) -> dict:
+        """Average REST requests per minute over the last ``minutes`` whole minutes, per symbol or for one symbol."""
+        current = int(time.time() // 60)
+        window = range(current - minutes, current)
+        with self.lock:
+            symbols = [symbol] if symbol is not None else list(self.symbol_minutes)
+            return {
+                s: round(sum(self.symbol_minutes.get(s, {}).get(m, 0) for m in window) / minutes, 2)
+                for s in symbols
+            }
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            methods = {name: h.to_dict() for (kind, name), h in self.histograms.items() if kind == "method"}
+            endpoints = {name: h.to_dict() for (kind, name), h in self.histograms.items() if kind == "endpoint"}
+            retries = dict(self.retries)
+        return {
+            "time": int(time.time()),
+            "uptime_seconds": int(time.time() - self.started_at),
+            "methods": methods,
+            "endpoints": endpoints,
+            "retries": retries,
+            "calls_per_minute": self.calls_per_minute(),
+        }
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.retries = {}
+            self.symbol_minutes = {}
+            self.started_at = time.time()
+
+    def start_exporter(self, path: str = "logs/exchange_metrics.jsonl", interval: float = 60,
+                       max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        """Append a snapshot to ``path`` every ``interval`` seconds, rotating the file at ``max_bytes``."""
+        if self.exporter_thread is not None:
+            return
+        writer = std_logging.getLogger("directionalscalper.exchange_metrics")
+        writer.propagate = False
+        writer.setLevel(std_logging.INFO)
+        writer.addHandler(RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count))
+
+        def export_loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    writer.info(json.dumps(self.snapshot()))
+                except Exception as e:
+                    logging.error(f"Failed to export exchange metrics: {e}")
+
+        self.exporter_thread = threading.Thread(target=export_loop, name="ExchangeMetricsExporter", daemon=True)
+        self.exporter_thread.start()
+        logging.info(f"Exporting exchange metrics to {path} every {interval}s")
+
+    def instrument_client(self, client):
+        """Time every REST request of a ccxt client, by endpoint path, once per client."""
+        if getattr(client, "_metrics_installed", False):
+            return
+        fetch2 = client.fetch2
+
+        def timed_fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+            start = time.perf_counter()
+            error = False
+            try:
+                return fetch2(path, api, method, params, headers, body, config)
+            except Exception:
+                error = True
+                raise
+            finally:
+                symbol = params.get("symbol") if isinstance(params, dict) else None
+                self.record("endpoint", f"{method} {path}", time.perf_counter() - start, symbol, error)
+
+        client.fetch2 = timed_fetch2
+        client._metrics_installed = True
+
+    def instrument_exchange(self, exchange):
+        """Time every public method of an ``Exchange`` instance, wrapping the bound methods on the instance."""
+        for name, attr in inspect.getmembers(type(exchange), inspect.isfunction):
+            if name.startswith("_") or inspect.iscoroutinefunction(attr):
+                continue
+            setattr(exchange, name, self._timed(name, getattr(exchange, name)))
+
+    def _timed(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                self.record("method", name, time.perf_counter() - start, None, error)
+
+        return timed
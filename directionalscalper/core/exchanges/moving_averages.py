@@ -0,0 +1,99 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from .candle_store import TIMESTAMP, HIGH, LOW
+
+
+class _MovingAverageState:
+    __slots__ = ("closed_highs", "closed_lows", "last_closed_timestamp", "snapshot_key", "snapshot")
+
+    def __init__(self, depth: int):
+        self.closed_highs = deque(maxlen=depth)
+        self.closed_lows = deque(maxlen=depth)
+        self.last_closed_timestamp = None
+        self.snapshot_key = None
+        self.snapshot = None
+
+
+class MovingAverageService:
+    """
+    MA3/MA6 of candle highs and lows, kept per (symbol, timeframe).
+
+    The values match ``df.High.rolling(n).mean().iat[-1]`` on the fetched candles, i.e. the window includes
+    the open candle. Closed candles are pushed into fixed-size windows once, when they close; a call only adds
+    the open candle on top. Results are cached per (open candle timestamp, open high, open low), so repeated
+    calls within one loop do no work.
+    """
+
+    WINDOWS = (3, 6)
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.depth = max(self.WINDOWS) - 1  # Closed candles needed next to the open one
+        self.states = {}
+        self.lock = threading.Lock()
+
+    def get(self, symbol: str, timeframe: str = '1m') -> dict:
+        # One spare closed candle so a close between two calls is absorbed without a reload
+        bars = self.exchange.get_ohlcv_array(symbol, timeframe, self.depth + 2)
+        if len(bars) == 0:
+            raise ValueError(f"No {timeframe} candles for {symbol}")
+
+        open_bar = bars[-1]
+        key = (open_bar[TIMESTAMP], open_bar[HIGH], open_bar[LOW])
+
+        with self.lock:
+            state = self.states.get((symbol, timeframe))
+            if state is None:
+                state = self.states[(symbol, timeframe)] = _MovingAverageState(self.depth)
+
+            if state.snapshot_key == key:
+                return state.snapshot
+
+            closed = bars[:-1]
+            if state.last_closed_timestamp is None or len(closed) == 0 or closed[0, TIMESTAMP] > state.last_closed_timestamp:
+                # First call, or more candles closed than we hold: start over from the fetched window
+                state.closed_highs.clear()
+                state.closed_lows.clear()
+                new_closed = closed
+            else:
+                new_closed = closed[closed[:, TIMESTAMP] > state.last_closed_timestamp]
+
+            for bar in new_closed:
+                state.closed_highs.append(bar[HIGH])
+                state.closed_lows.append(bar[LOW])
+                state.last_closed_timestamp = bar[TIMESTAMP]
+
+            values = {}
+            for window in self.WINDOWS:
+                values[f"MA_{window}_H"] = self._window_mean(state.closed_highs, open_bar[HIGH], window)
+                values[f"MA_{window}_L"] = self._window_mean(state.closed_lows, open_bar[LOW], window)
+
+            state.snapshot_key = key
+            state.snapshot = values
+            return values
+
+    @staticmethod
+    def _window_mean(closed, open_value, window):
+        if len(closed) < window - 1:
+            return np.nan
+        # Oldest first, like pandas' rolling sum
+        total = 0.0
+        for value in list(closed)[len(closed) - (window - 1):]:
+            total += value
+        return (total + open_value) / window
+
+    def get_all(self, symbol: str) -> dict:
+        """The six values BaseStrategy.get_all_moving_averages hands to the strategies."""
+        m1 = self.get(symbol, '1m')
+        m5 = self.get(symbol, '5m')
+        return {
+            "ma_6_high": m1["MA_6_H"],
+            "ma_6_low": m1["MA_6_L"],
+            "ma_3_low": m1["MA_3_L"],
+            "ma_3_high": m1["MA_3_H"],
+            "ma_1m_3_high": m1["MA_3_H"],
+            "ma_5m_3_high": m5["MA_3_H"],
+        }
@@ -0,0 +1,257 @@
+import threading
+import time
+from typing import Optional
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="OpenOrdersIndex", filename="OpenOrdersIndex.log", stream=True)
+
+
+class OpenOrdersIndex:
+    """
+    Account-wide index of open orders, bucketed by symbol id, side and reduceOnly.
+
+    The whole account is loaded with one request (cursor-paginated ``/v5/order/realtime``, or the private
+    stream's state when it is live) at most once per ``max_age`` seconds, and every symbol thread reads
+    from it. Orders this process creates, amends or cancels through the ccxt client are patched into the
+    index straight away, so reads right after an order call see it without another fetch.
+    """
+
+    CATEGORIES = {"swap": "linear", "spot": "spot"}
+
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self, client, market_type: str = 'swap', max_age: float = 2.0, paginate: bool = True,
+                 private_stream=None, settle_coin: str = 'USDT'):
+        self.client = client
+        self.market_type = market_type
+        self.category = self.CATEGORIES.get(market_type, "linear")
+        self.max_age = max_age
+        self.paginate = paginate
+        self.private_stream = private_stream
+        self.settle_coin = settle_coin
+
+        self.orders = {}  # order id -> ccxt order
+        self.buckets = {}  # symbol id -> {(side, reduce_only): {order id: ccxt order}}
+        self.last_refresh_time = 0.0
+
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+        self.refreshing = False
+        self.pending_patches = []  # Patches made while a refresh is in flight, replayed onto its result
+
+    @classmethod
+    def for_account(cls, client, market_type: str = 'swap', **kwargs) -> "OpenOrdersIndex":
+        key = (client.id, market_type, client.apiKey)
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                index = cls._indexes[key] = cls(client, market_type, **kwargs)
+                index.install(client)
+        return index
+
+    def install(self, client):
+        """Patch the index from every order created, amended or cancelled through ``client``."""
+        create_order = client.create_order
+        edit_order = client.edit_order
+        cancel_order = client.cancel_order
+        cancel_all_orders = client.cancel_all_orders
+
+        def indexed_create_order(symbol, type, side, amount, price=None, params={}):
+            order = create_order(symbol, type, side, amount, price, params)
+            if type == 'limit' and order and order.get('id'):
+                self.record_placed(order, symbol, side, amount, price, params)
+            return order
+
+        def indexed_edit_order(id, symbol, type, side, amount=None, price=None, params={}):
+            order = edit_order(id, symbol, type, side, amount, price, params)
+            self.record_amended(id, amount, price)
+            return order
+
+        def indexed_cancel_order(id, symbol=None, params={}):
+            result = cancel_order(id, symbol, params)
+            self.record_cancelled(id)
+            return result
+
+        def indexed_cancel_all_orders(symbol=None, params={}):
+            result = cancel_all_orders(symbol, params)
+            self._patch(self._remove_symbol, self._market_id(symbol) if symbol else None)
+            return result
+
+        client.create_order = indexed_create_order
+        client.edit_order = indexed_edit_order
+        client.cancel_order = indexed_cancel_order
+        client.cancel_all_orders = indexed_cancel_all_orders
+
+    def record_placed(self, order, symbol, side, amount, price, params={}):
+        """Add a limit order placed outside the wrapped client methods (e.g. through a batch endpoint)."""
+        reduce_only = bool(params.get('reduceOnly') or params.get('reduce_only'))
+        self._patch(self._add, self._placed_order(order, symbol, side, amount, price, reduce_only, params))
+
+    def record_amended(self, order_id, amount=None, price=None):
+        self._patch(self._amend, order_id, amount, price)
+
+    def record_cancelled(self, order_id):
+        self._patch(self._remove, order_id)
+
+    def _market_id(self, symbol: str) -> str:
+        if "/" not in symbol:
+            return symbol
+        try:
+            return self.client.market(symbol)["id"]
+        except Exception:
+            return symbol.split(":")[0].replace("/", "")
+
+    @staticmethod
+    def _placed_order(order, symbol, side, amount, price, reduce_only, params) -> dict:
+        # Bybit only answers with the order id, fill in what was sent so the index can bucket it
+        placed = dict(order)
+        info = dict(placed.get('info') or {})
+        info.setdefault('reduceOnly', reduce_only)
+        info.setdefault('positionIdx', params.get('positionIdx', 0))
+        info.setdefault('qty', str(amount))
+        placed.update({
+            'symbol': placed.get('symbol') or symbol,
+            'side': placed.get('side') or side,
+            'type': placed.get('type') or 'limit',
+            'amount': placed.get('amount') or amount,
+            'price': placed.get('price') or price,
+            'status': 'open',
+            'reduceOnly': reduce_only,
+            'info': info,
+        })
+        return placed
+
+    def _bucket_key(self, order):
+        reduce_only = bool(order.get('reduceOnly') or order.get('info', {}).get('reduceOnly', False))
+        return self._market_id(order.get('symbol') or ''), (order.get('side'), reduce_only)
+
+    def _add(self, order):
+        self._remove(order['id'])
+        symbol_id, key = self._bucket_key(order)
+        self.orders[order['id']] = order
+        self.buckets.setdefault(symbol_id, {}).setdefault(key, {})[order['id']] = order
+
+    def _remove(self, order_id):
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return
+        symbol_id, key = self._bucket_key(order)
+        self.buckets.get(symbol_id, {}).get(key, {}).pop(order_id, None)
+
+    def _remove_symbol(self, symbol_id):
+        if symbol_id is None:
+            self.orders.clear()
+            self.buckets.clear()
+            return
+        for bucket in self.buckets.pop(symbol_id, {}).values():
+            for order_id in bucket:
+                self.orders.pop(order_id, None)
+
+    def _amend(self, order_id, amount, price):
+        order = self.orders.get(order_id)
+        if order is None:
+            return
+        order = dict(order, info=dict(order.get('info') or {}))
+        if amount is not None:
+            order['amount'] = amount
+            order['info']['qty'] = str(amount)
+        if price is not None:
+            order['price'] = price
+        self._add(order)
+
+    def _patch(self, fn, *args):
+        with self.lock:
+            fn(*args)
+            if self.refreshing:
+                self.pending_patches.append((fn, args))
+
+    def _fetch(self) -> list:
+        if self.private_stream is not None:
+            orders = self.private_stream.get_open_orders()
+            if orders is not None:
+                return orders
+
+        if not self.paginate:
+            return self.client.fetch_open_orders()
+
+        request = {"category": self.category, "limit": 50}
+        if self.category == "linear":
+            request["settleCoin"] = self.settle_coin
+        raws = []
+        while True:
+            result = self.client.privateGetV5OrderRealtime(request).get("result", {})
+            raws.extend(result.get("list", []))
+            cursor = result.get("nextPageCursor")
+            if not cursor:
+                break
+            request["cursor"] = cursor
+        return [self.client.parse_order(raw) for raw in raws]
+
+    def refresh(self) -> bool:
+        with self.refresh_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if time.time() - self.last_refresh_time < self.max_age:
+                return True
+            with self.lock:
+                self.refreshing = True
+                self.pending_patches = []
+            try:
+                orders = self._fetch()
+            except Exception as e:
+                logging.error(f"Failed to refresh open orders: {e}")
+                with self.lock:
+                    self.refreshing = False
+                return False
+
+            with self.lock:
+                self.orders = {}
+                self.buckets = {}
+                for order in orders:
+                    self._add(order)
+                # Orders placed or cancelled while the request was in flight may be missing from it
+                for fn, args in self.pending_patches:
+                    fn(*args)
+                self.pending_patches = []
+                self.refreshing = False
+                self.last_refresh_time = time.time()
+            return True
+
+    def invalidate(self):
+        self.last_refresh_time = 0.0
+
+    def _ensure_fresh(self) -> bool:
+        if time.time() - self.last_refresh_time < self.max_age:
+            return True
+        return self.refresh()
+
+    def get_open_orders(self, symbol: str = None) -> Optional[list]:
+        """Open orders of the account or of one symbol, or None if the index could not be loaded."""
+        if not self._ensure_fresh():
+            return None
+        with self.lock:
+            if symbol is None:
+                return list(self.orders.values())
+            return [order for bucket in self.buckets.get(self._market_id(symbol), {}).values() for order in bucket.values()]
+
+    def peek(self, symbol: str = None) -> Optional[list]:
+        """Like ``get_open_orders`` but never refreshes, None when the index is stale."""
+        if time.time() - self.last_refresh_time >= self.max_age:
+            return None
+        with self.lock:
+            if symbol is None:
+                return list(self.orders.values())
+            return [order for bucket in self.buckets.get(self._market_id(symbol), {}).values() for order in bucket.values()]
+
+    def get(self, symbol: str, side: str, reduce_only: bool) -> Optional[list]:
+        if not self._ensure_fresh():
+            return None
+        with self.lock:
+            return list(self.buckets.get(self._market_id(symbol), {}).get((side, reduce_only), {}).values())
+
+    def count(self, symbol: str, side: str, reduce_only: bool) -> Optional[int]:
+        if not self._ensure_fresh():
+            return None
+        with self.lock:
+            return len(self.buckets.get(self._market_id(symbol), {}).get((side, reduce_only), {}))
@@ -0,0 +1,198 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="RateLimiter", filename="RateLimiter.log", stream=True)
+
+HIGH, LOW = 0, 1
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second, up to ``capacity``.
+
+    Low priority callers leave ``reserve`` tokens untouched and step aside while a high priority caller
+    is waiting, so order traffic is never queued behind market data.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, reserve: float = 0.0):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.reserve = reserve
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.high_waiting = 0
+        self.condition = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cost: float = 1.0, priority: int = LOW) -> float:
+        """Block until ``cost`` tokens are available and take them. Returns the seconds spent waiting."""
+        cost = min(cost, self.capacity)
+        started = time.monotonic()
+        with self.condition:
+            if priority == HIGH:
+                self.high_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    floor = 0.0 if priority == HIGH else min(self.reserve, self.capacity - cost)
+                    yielding = priority == LOW and self.high_waiting > 0
+
+                    if now >= self.blocked_until and not yielding and self.tokens - cost >= floor:
+                        self.tokens -= cost
+                        return now - started
+
+                    wait = max(self.blocked_until - now, (cost + floor - self.tokens) / self.rate, 0.001)
+                    self.condition.wait(wait)
+            finally:
+                if priority == HIGH:
+                    self.high_waiting -= 1
+                    self.condition.notify_all()
+
+    def sync(self, limit: int, remaining: int, reset_seconds: float):
+        """Align the bucket with the quota the exchange reported for the last request."""
+        with self.condition:
+            now = time.monotonic()
+            self._refill(now)
+            if limit and limit != self.capacity:
+                self.reserve = self.reserve * limit / self.capacity
+                self.rate = self.capacity = float(limit)
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0:
+                self.block(reset_seconds)
+
+    def block(self, seconds: float):
+        with self.condition:
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.condition.notify_all()
+
+
+class BybitRateLimiter:
+    """
+    Rate limiter shared by every thread using a Bybit account.
+
+    Private endpoints get one bucket each, sized from ccxt's per-endpoint cost table and then corrected
+    from Bybit's X-Bapi-Limit* response headers, which report the quota of the account (UID) for that
+    endpoint. Every request also draws from a process-wide bucket for Bybit's IP limit (600 requests per
+    5 seconds). Order placement, amends and cancels are high priority, everything else is low priority.
+
+    Installed by wrapping the ccxt client's ``fetch2`` (before each request) and ``handle_errors`` (after
+    each response); ccxt's own throttle is switched off since this one replaces it.
+    """
+
+    PRIORITY_PATHS = {
+        "v5/order/create",
+        "v5/order/amend",
+        "v5/order/cancel",
+        "v5/order/cancel-all",
+        "v5/order/create-batch",
+        "v5/order/amend-batch",
+        "v5/order/cancel-batch",
+        "v5/position/trading-stop",
+    }
+    RATE_LIMIT_CODES = {"10006", "10018"}
+    IP_RATE = 120  # 600 requests per 5 s
+    IP_RESERVE = 0.2  # Share of the IP budget kept free for high priority requests
+    PENALTY_SECONDS = 1.0  # Backoff after a 429 that carries no reset time
+    MAX_BLOCK_SECONDS = 10.0
+
+    _ip_bucket = TokenBucket(IP_RATE, reserve=IP_RATE * IP_RESERVE)
+    _limiters = {}
+    _limiters_lock = threading.Lock()
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()  # When the last response on this thread blocked a bucket, and until when
+
+    @classmethod
+    def for_client(cls, client) -> "BybitRateLimiter":
+        """Return the limiter of this account, installing it on ``client`` if it is not already."""
+        # Spot and swap clients of the same account share the UID limits
+        key = (client.id, client.apiKey)
+        with cls._limiters_lock:
+            limiter = cls._limiters.get(key)
+            if limiter is None:
+                limiter = cls._limiters[key] = cls()
+            if getattr(client, "rate_limiter", None) is not limiter:
+                limiter.install(client)
+        return limiter
+
+    def install(self, client):
+        fetch2 = client.fetch2
+        handle_errors = client.handle_errors
+
+        def limited_fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+            self.acquire(client, path, api, config)
+            return fetch2(path, api, method, params, headers, body, config)
+
+        def observed_handle_errors(code, reason, url, method, headers, body, response, request_headers, request_body):
+            self.observe(url, code, headers, response)
+            return handle_errors(code, reason, url, method, headers, body, response, request_headers, request_body)
+
+        client.fetch2 = limited_fetch2
+        client.handle_errors = observed_handle_errors
+        client.enableRateLimit = False
+        client.rate_limiter = self
+
+    def _bucket(self, client, path, config):
+        bucket = self.buckets.get(path)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.get(path)
+                if bucket is None:
+                    # ccxt's cost is relative to its base rate: cost 2.5 at 20 ms is 20 requests per second
+                    cost = (config or {}).get("cost", 1) or 1
+                    bucket = self.buckets[path] = TokenBucket(1000 / (client.rateLimit * cost))
+        return bucket
+
+    def priority(self, path: str) -> int:
+        return HIGH if path in self.PRIORITY_PATHS else LOW
+
+    def acquire(self, client, path, api, config=None):
+        priority = self.priority(path)
+        waited = 0.0
+        if api == "private":
+            waited += self._bucket(client, path, config).acquire(1, priority)
+        waited += self._ip_bucket.acquire(1, priority)
+        if waited > 1:
+            logging.info(f"Waited {waited:.2f}s for rate limit budget on {path}")
+
+    def observe(self, url, code, headers, response):
+        path = urlparse(url).path.lstrip("/")
+        bucket = self.buckets.get(path)
+        self.local.blocked_until = 0.0
+
+        reset_seconds = self.PENALTY_SECONDS
+        reset = headers.get("X-Bapi-Limit-Reset-Timestamp") if headers else None
+        if reset:
+            reset_seconds = min(max(int(reset) / 1000 - time.time(), 0.0), self.MAX_BLOCK_SECONDS)
+
+        remaining = headers.get("X-Bapi-Limit-Status") if headers else None
+        if bucket is not None and remaining is not None:
+            bucket.sync(int(headers.get("X-Bapi-Limit") or 0), int(remaining), reset_seconds)
+            if int(remaining) <= 0:
+                self.local.blocked_until = time.monotonic() + reset_seconds
+
+        ret_code = str(response.get("retCode")) if isinstance(response, dict) else None
+        if code == 429 or code == 403 or ret_code == "10018":
+            # IP level limit, everyone backs off
+            logging.warning(f"Bybit IP rate limit hit on {path}, pausing requests for {reset_seconds:.2f}s")
+            self._ip_bucket.block(reset_seconds)
+            self.local.blocked_until = time.monotonic() + reset_seconds
+        elif ret_code in self.RATE_LIMIT_CODES and bucket is not None:
+            logging.warning(f"Bybit rate limit hit on {path}, pausing it for {reset_seconds:.2f}s")
+            bucket.block(reset_seconds)
+            self.local.blocked_until = time.monotonic() + reset_seconds
+
+    def blocked_last_request(self) -> bool:
+        """True while the path of this thread's last rate-limited request is held back by a bucket."""
+        return getattr(self.local, "blocked_until", 0.0) > time.monotonic()
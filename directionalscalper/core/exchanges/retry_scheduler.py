@@ -0,0 +1,263 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from directionalscalper.core.strategies.logger import Logger
+from .metrics import ExchangeMetrics
+
+logging = Logger(logger_name="RetryScheduler", filename="RetryScheduler.log", stream=True)
+
+
+class ExchangeDataUnavailable(Exception):
+    """A call gave up and had no last-known-good value to fall back on."""
+
+
+class CircuitOpenError(ExchangeDataUnavailable):
+    """The endpoint's circuit is open and there is no last-known-good value to fall back on."""
+
+
+class RetryDeadlineExceeded(ExchangeDataUnavailable):
+    """Every attempt failed before the deadline and there is no last-known-good value to fall back on."""
+
+
+class StaleList(list):
+    stale = True
+    age = 0.0
+
+
+class StaleDict(dict):
+    stale = True
+    age = 0.0
+
+
+class StaleTuple(tuple):
+    stale = True
+    age = 0.0
+
+
+class StaleFloat(float):
+    stale = True
+    age = 0.0
+
+
+_STALE_TYPES = ((list, StaleList), (dict, StaleDict), (tuple, StaleTuple), (float, StaleFloat), (int, StaleFloat))
+
+
+def mark_stale(value, age: float):
+    """A copy of ``value`` with ``stale = True`` and its ``age`` in seconds; other types come back unmarked."""
+    for base, stale_type in _STALE_TYPES:
+        if isinstance(value, base) and not isinstance(value, bool):
+            stale = stale_type(value)
+            stale.age = age
+            return stale
+    return value
+
+
+def is_stale(value) -> bool:
+    return getattr(value, "stale", False)
+
+
+def call_endpoint(name: str, args: tuple) -> str:
+    """Circuit name of a call, per symbol when the first argument is one so a bad symbol only trips its own."""
+    if args and isinstance(args[0], str):
+        return f"{name}:{args[0]}"
+    return name
+
+
+def call_key(name: str, args: tuple, kwargs: dict = None):
+    """Last-known-good key of a call, None when its arguments are not hashable."""
+    key = (name, args, tuple(sorted((kwargs or {}).items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit of one endpoint.
+
+    ``failure_threshold`` failed attempts in a row open it; after ``reset_timeout`` seconds a single
+    caller is let through as a probe (half-open), and its outcome closes or reopens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != self.CLOSED:
+                logging.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                if self.state == self.CLOSED:
+                    logging.warning(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+
+class RetryScheduler:
+    """
+    Retries with jittered backoff, a circuit per endpoint and last-known-good fallbacks.
+
+    ``call`` retries a function until it succeeds, ``max_attempts`` is used up or ``deadline`` seconds
+    have passed, sleeping a random time up to an exponentially growing cap between attempts (never past
+    the deadline). Every success is remembered under ``cache_key``; when the endpoint's circuit is open,
+    or the deadline runs out, that value is returned marked stale (see ``is_stale``) instead of blocking.
+    Only the ``max_cached`` most recent values are kept, and none older than ``max_stale_age`` seconds is served.
+
+    ``for_client`` gives each exchange account its own scheduler, so one account's failures never open
+    another's circuits; ``for_process`` is for calls that belong to no account, like the remote data.
+    """
+
+    _instance = None
+    _clients = {}
+    _instance_lock = threading.Lock()
+    settings = {}  # Applied to every scheduler, see configure_all
+
+    def __init__(self, deadline: float = 20.0, base_delay: float = 0.5, max_delay: float = 5.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, max_cached: int = 1024,
+                 max_stale_age: float = 300.0):
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_cached = max_cached
+        self.max_stale_age = max_stale_age
+
+        self.breakers = {}
+        self.last_good = OrderedDict()  # cache key -> (time, value), least recently stored first
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_process(cls) -> "RetryScheduler":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(**cls.settings)
+        return cls._instance
+
+    @classmethod
+    def for_client(cls, client) -> "RetryScheduler":
+        """The scheduler of one ccxt client's account."""
+        key = (client.id, client.apiKey)
+        with cls._instance_lock:
+            scheduler = cls._clients.get(key)
+            if scheduler is None:
+                scheduler = cls._clients[key] = cls(**cls.settings)
+        return scheduler
+
+    @classmethod
+    def configure_all(cls, **settings):
+        """``configure`` every scheduler, those created later included."""
+        with cls._instance_lock:
+            cls.settings = {**cls.settings, **settings}
+            schedulers = list(cls._clients.values()) + ([cls._instance] if cls._instance is not None else [])
+        for scheduler in schedulers:
+            scheduler.configure(**settings)
+
+    def configure(self, **settings):
+        """Change the defaults, e.g. ``configure(deadline=10)`` to bound retries by a 10 s loop."""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name in ("breakers", "last_good", "lock", "settings"):
+                raise AttributeError(f"Unknown retry setting {name}")
+            setattr(self, name, value)
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self.lock:
+            breaker = self.breakers.get(endpoint)
+            if breaker is None:
+                breaker = self.breakers[endpoint] = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def _remember(self, cache_key, value):
+        with self.lock:
+            self.last_good[cache_key] = (time.time(), value)
+            self.last_good.move_to_end(cache_key)
+            while len(self.last_good) > self.max_cached:
+                self.last_good.popitem(last=False)
+
+    def _fallback(self, cache_key, endpoint: str, error: Exception):
+        with self.lock:
+            cached = self.last_good.get(cache_key) if cache_key is not None else None
+            if cached is not None and time.time() - cached[0] > self.max_stale_age:
+                # Too old to trade on, and nothing will refresh it while the endpoint keeps failing
+                del self.last_good[cache_key]
+                cached = None
+        if cached is None:
+            raise error
+        age = time.time() - cached[0]
+        logging.info(f"Serving {age:.1f}s old data for {endpoint}: {error}")
+        return mark_stale(cached[1], age)
+
+    def call(self, endpoint: str, fn, args: tuple = (), kwargs: dict = None, cache_key=None, deadline: float = None,
+             max_attempts: int = None, base_delay: float = None, max_delay: float = None):
+        """
+        Call ``fn(*args, **kwargs)`` with retries.
+
+        :param endpoint: Name the circuit and the retry counters are kept under.
+        :param cache_key: Key of the last-known-good value, None to never fall back.
+        :raises CircuitOpenError: The circuit is open and nothing is cached.
+        :raises RetryDeadlineExceeded: Attempts or time ran out and nothing is cached.
+        """
+        kwargs = kwargs or {}
+        deadline = self.deadline if deadline is None else deadline
+        base_delay = self.base_delay if base_delay is None else base_delay
+        max_delay = self.max_delay if max_delay is None else max_delay
+        breaker = self.breaker(endpoint)
+
+        if not breaker.allow():
+            return self._fallback(cache_key, endpoint, CircuitOpenError(f"Circuit for {endpoint} is open"))
+
+        give_up_at = time.time() + deadline
+        attempt = 0
+        while True:
+            try:
+                value = fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                breaker.record_failure()
+                ExchangeMetrics.for_process().record_retry(endpoint)
+                remaining = give_up_at - time.time()
+                if breaker.state != CircuitBreaker.CLOSED or remaining <= 0 or (max_attempts and attempt >= max_attempts):
+                    return self._fallback(cache_key, endpoint, RetryDeadlineExceeded(
+                        f"{endpoint} failed {attempt} times in {deadline - remaining:.1f}s, last error: {e}"))
+                delay = min(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)), remaining)
+                logging.info(f"Error in {endpoint}: {e}. Retry {attempt} in {delay:.2f} seconds...")
+                time.sleep(delay)
+                continue
+
+            breaker.record_success()
+            if cache_key is not None:
+                self._remember(cache_key, value)
+            return value
+
+    def get_state(self) -> dict:
+        """Circuit state and consecutive failures per endpoint."""
+        with self.lock:
+            breakers = list(self.breakers.values())
+        return {breaker.name: {"state": breaker.state, "failures": breaker.failures} for breaker in breakers}
@@ -0,0 +1,107 @@
+import threading
+import time
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _KeyStats:
+    __slots__ = ("calls", "executions", "hits", "coalesced", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.hits = 0  # Served from a cached result
+        self.coalesced = 0  # Waited for a call another thread already had in flight
+        self.errors = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one.
+
+    The first caller of ``do(key, fn)`` runs ``fn``; callers arriving with the same key while it runs wait
+    for it and get the same result (or exception). With ``ttl`` the result is also handed out for that many
+    seconds after the call returns. Results are shared between threads, so treat them as read-only.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.results = {}
+        self.stats = {}
+
+    @classmethod
+    def for_exchange(cls, exchange, market_type: str = 'swap') -> "SingleFlight":
+        # Per account, calls of two accounts with the same arguments have different results
+        key = (exchange.id, market_type, exchange.apiKey)
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = cls._instances[key] = cls()
+        return instance
+
+    def do(self, key, fn, ttl: float = 0.0):
+        with self.lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = _KeyStats()
+            stats.calls += 1
+
+            cached = self.results.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                stats.hits += 1
+                return cached[1]
+
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                stats.executions += 1
+            else:
+                stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+                if call.error is None and ttl > 0:
+                    self.results[key] = (time.monotonic() + ttl, call.result)
+                elif call.error is not None:
+                    stats.errors += 1
+            call.done.set()
+        return call.result
+
+    def invalidate(self, key=None):
+        """Drop the cached result of ``key``, or of every key."""
+        with self.lock:
+            if key is None:
+                self.results.clear()
+            else:
+                self.results.pop(key, None)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {key: stats.as_dict() for key, stats in self.stats.items()}
@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Optional
+
+from directionalscalper.core.strategies.logger import Logger
+
+logging = Logger(logger_name="TickerSnapshot", filename="TickerSnapshot.log", stream=True)
+
+
+class Ticker:
+    """The fields of one Bybit v5 ticker the strategies read, as floats (None when Bybit sends an empty string)."""
+
+    __slots__ = ("symbol", "bid", "ask", "last", "mark", "funding_rate", "info")
+
+    def __init__(self, info: dict):
+        self.symbol = info.get("symbol")
+        self.bid = _to_float(info.get("bid1Price"))
+        self.ask = _to_float(info.get("ask1Price"))
+        self.last = _to_float(info.get("lastPrice"))
+        self.mark = _to_float(info.get("markPrice"))
+        self.funding_rate = _to_float(info.get("fundingRate"))
+        self.info = info
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.bid and self.ask:
+            return (self.bid + self.ask) / 2
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TickerSnapshot:
+    """
+    Process-wide snapshot of every ticker in one Bybit category.
+
+    All tickers are fetched with a single ``/v5/market/tickers`` request, at most once per ``interval``
+    seconds, and every symbol thread reads from the same snapshot. The first thread to find the snapshot
+    stale refreshes it, the others wait for that request instead of sending their own.
+    """
+
+    CATEGORIES = {"swap": "linear", "spot": "spot"}
+
+    _snapshots = {}
+    _snapshots_lock = threading.Lock()
+
+    def __init__(self, exchange, market_type: str = "swap", interval: float = 1.0):
+        self.exchange = exchange
+        self.market_type = market_type
+        self.category = self.CATEGORIES.get(market_type, "linear")
+        self.interval = interval
+
+        self.tickers = {}
+        self.last_refresh_time = 0.0
+        self.refresh_lock = threading.Lock()
+
+    @classmethod
+    def for_exchange(cls, exchange, market_type: str = "swap", **kwargs) -> "TickerSnapshot":
+        key = (exchange.id, market_type)
+        with cls._snapshots_lock:
+            snapshot = cls._snapshots.get(key)
+            if snapshot is None:
+                snapshot = cls(exchange, market_type, **kwargs)
+                cls._snapshots[key] = snapshot
+        return snapshot
+
+    def _is_fresh(self) -> bool:
+        return time.time() - self.last_refresh_time < self.interval
+
+    def refresh(self) -> bool:
+        with self.refresh_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._is_fresh():
+                return True
+            try:
+                response = self.exchange.publicGetV5MarketTickers({"category": self.category})
+            except Exception as e:
+                logging.error(f"Failed to fetch {self.category} tickers: {e}")
+                return False
+
+            tickers = {}
+            for info in (response.get("result") or {}).get("list") or []:
+                ticker = Ticker(info)
+                if ticker.symbol:
+                    tickers[ticker.symbol] = ticker
+
+            # Swap the reference so readers never see a half-built snapshot
+            self.tickers = tickers
+            self.last_refresh_time = time.time()
+            return True
+
+    def _market_id(self, symbol: str) -> str:
+        if "/" not in symbol:
+            return symbol
+        try:
+            return self.exchange.market(symbol)["id"]
+        except Exception:
+            return symbol.split(":")[0].replace("/", "")
+
+    def get(self, symbol: str) -> Optional[Ticker]:
+        """
+        Return the ticker for 'BTCUSDT' or 'BTC/USDT:USDT', refreshing the snapshot when it is older than ``interval``.
+
+        :return: The Ticker, or None if the symbol is not in the snapshot or the refresh failed.
+        """
+        if not self._is_fresh():
+            self.refresh()
+        return self.tickers.get(self._market_id(symbol))
+
+    def peek(self, symbol: str) -> Optional[Ticker]:
+        """The ticker if the snapshot is fresh, without refreshing it (safe to call from the event loop)."""
+        if not self._is_fresh():
+            return None
+        return self.tickers.get(self._market_id(symbol))
+
+    def get_mid_price(self, symbol: str) -> Optional[float]:
+        ticker = self.get(symbol)
+        return ticker.mid if ticker is not None else None
+
+    def get_funding_rate(self, symbol: str) -> Optional[float]:
+        ticker = self.get(symbol)
+        return ticker.funding_rate if ticker is not None else None
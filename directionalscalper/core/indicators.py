@@ -0,0 +1,216 @@
+"""
+Indicator kernels on NumPy arrays, numerically equivalent to the ``ta`` / pandas calls they replace.
+
+Rolling indicators are computed on sliding-window views, the recursive ones (EMA, Wilder ATR) in a small loop
+that numba compiles when it is installed. Inputs are any array-likes, e.g. the column views of
+``Exchange.get_ohlcv_array``; every function returns float64 arrays aligned with its input, NaN where ``ta``
+has NaN. tests/test_indicators.py checks them against ``ta``, tests/bench_indicators.py times both.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _jit(fn):
+    return njit(cache=True)(fn) if njit is not None else fn
+
+
+def as_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _run_loop(kernel, values: np.ndarray, *args) -> np.ndarray:
+    if njit is not None:
+        out = np.empty(len(values))
+        kernel(values, out, *args)
+        return out
+    # Element access on ndarrays is slow in plain Python, lists are several times faster
+    out = [0.0] * len(values)
+    kernel(values.tolist(), out, *args)
+    return np.array(out)
+
+
+def _rolling(values, window: int, reduce) -> np.ndarray:
+    values = as_array(values)
+    out = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        out[window - 1:] = reduce(sliding_window_view(values, window), axis=1)
+    return out
+
+
+def rolling_sum(values, window: int) -> np.ndarray:
+    """``Series.rolling(window).sum()``; a NaN inside the window gives NaN, as with pandas' min_periods=window."""
+    return _rolling(values, window, np.sum)
+
+
+def sma(values, window: int) -> np.ndarray:
+    """``Series.rolling(window).mean()``, also ``ta.trend.SMAIndicator``."""
+    return _rolling(values, window, np.mean)
+
+
+def rolling_std(values, window: int, ddof: int = 1) -> np.ndarray:
+    """``Series.rolling(window).std(ddof=ddof)``."""
+    return _rolling(values, window, lambda windows, axis: np.std(windows, axis=axis, ddof=ddof))
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    return _rolling(values, window, np.max)
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    return _rolling(values, window, np.min)
+
+
+def diff(values) -> np.ndarray:
+    """``Series.diff()``, NaN first."""
+    return np.diff(as_array(values), prepend=np.nan)
+
+
+@_jit
+def _ewm_mean(values, out, alpha, min_periods):
+    # pandas' ewma with adjust=False, ignore_na=False: seeded by the first observation, gaps decay the old weight
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    nobs = 1 if weighted == weighted else 0
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+    for i in range(1, len(values)):
+        cur = values[i]
+        is_observation = cur == cur
+        if is_observation:
+            nobs += 1
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+
+
+def ewm_mean(values, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """``Series.ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean()``."""
+    values = as_array(values)
+    if len(values) == 0:
+        return values
+    return _run_loop(_ewm_mean, values, float(alpha), max(int(min_periods), 1))
+
+
+def ema(values, span: int, min_periods: int = 0) -> np.ndarray:
+    """``Series.ewm(span=span, adjust=False).mean()``; ``ta.trend.EMAIndicator`` is ``min_periods=span``."""
+    return ewm_mean(values, 2.0 / (span + 1.0), min_periods)
+
+
+def hma(values, window: int) -> np.ndarray:
+    """The scrapers' HMA: the WMAs of the textbook formula are simple rolling means here."""
+    series2 = 2 * sma(values, int(window / 2)) - sma(values, window)
+    return sma(series2, int(np.sqrt(window)))
+
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    """``ta.momentum.rsi`` / ``RSIIndicator(...).rsi()`` with fillna=False."""
+    change = diff(close)
+    up = np.where(change > 0, change, 0.0)
+    down = -np.where(change < 0, change, 0.0)
+    emaup = ewm_mean(up, 1.0 / window, window)
+    emadn = ewm_mean(down, 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(emadn == 0, 100.0, 100 - (100 / (1 + emaup / emadn)))
+
+
+def mfi(high, low, close, volume, window: int = 14) -> np.ndarray:
+    """``ta.volume.MFIIndicator(...).money_flow_index()`` with fillna=False."""
+    typical_price = (as_array(high) + as_array(low) + as_array(close)) / 3.0
+    previous = np.concatenate(([np.nan], typical_price[:-1]))
+    up_down = np.where(typical_price > previous, 1, np.where(typical_price < previous, -1, 0))
+    mfr = typical_price * as_array(volume) * up_down
+    positive = rolling_sum(np.where(mfr >= 0.0, mfr, 0.0), window)
+    negative = np.abs(rolling_sum(np.where(mfr < 0.0, mfr, 0.0), window))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + positive / negative))
+
+
+def true_range(high, low, close, seed_first: bool = True) -> np.ndarray:
+    """
+    max(high - low, |high - previous close|, |low - previous close|).
+
+    The first bar has no previous close: ``seed_first`` uses its high - low like ``ta``, otherwise it is NaN
+    like the same formula written with pandas' ``shift()`` and ``np.maximum``.
+    """
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    tr = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+    if seed_first and len(tr):
+        tr[0] = high[0] - low[0]
+    return tr
+
+
+@_jit
+def _wilder(values, out, window):
+    for i in range(window - 1):
+        out[i] = 0.0
+    total = 0.0
+    for i in range(window):
+        total += values[i]
+    out[window - 1] = total / window
+    for i in range(window, len(values)):
+        out[i] = (out[i - 1] * (window - 1) + values[i]) / float(window)
+
+
+def atr(high, low, close, window: int = 14) -> np.ndarray:
+    """``ta.volatility.AverageTrueRange(...).average_true_range()``, zeros before the first full window like ``ta``."""
+    tr = true_range(high, low, close)
+    if len(tr) < window:
+        return np.zeros(len(tr))
+    return _run_loop(_wilder, tr, int(window))
+
+
+def bollinger(close, window: int = 20, window_dev: float = 2) -> tuple:
+    """``ta.volatility.BollingerBands`` (population std): (middle, upper, lower) bands."""
+    middle = sma(close, window)
+    std = rolling_std(close, window, ddof=0)
+    return middle, middle + window_dev * std, middle - window_dev * std
+
+
+def vwma(close, volume, window: int) -> np.ndarray:
+    close, volume = as_array(close), as_array(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return rolling_sum(close * volume, window) / rolling_sum(volume, window)
+
+
+def eri(high, low, close, volume, len_slow_ma: int = 64, len_power_ema: int = 13) -> tuple:
+    """Elder-ray index on an EMA of the VWMA, as ``CombinedScraper.calculate_advanced_eri``: (slow MA, bull power, bear power)."""
+    slow_vwma_ema = ema(vwma(close, volume, len_slow_ma), len_slow_ma)
+    bull_power = ema(as_array(high) - slow_vwma_ema, len_power_ema)
+    bear_power = ema(as_array(low) - slow_vwma_ema, len_power_ema)
+    return slow_vwma_ema, bull_power, bear_power
+
+
+def linear_regression(values) -> tuple:
+    """Least-squares slope and intercept of ``values`` against their index."""
+    y = as_array(values)
+    x = np.arange(len(y), dtype=np.float64)
+    x_mean, y_mean = x.mean(), y.mean()
+    dx = x - x_mean
+    spread = np.dot(dx, dx)
+    # A single point has no slope; lstsq's minimum-norm answer is a flat line through it
+    slope = np.dot(dx, y - y_mean) / spread if spread else 0.0
+    return slope, y_mean - slope * x_mean
+
+
+def peaks_and_troughs(values) -> tuple:
+    """Indexes of strict local maxima and minima, the first and last value excluded."""
+    values = as_array(values)
+    previous, current, following = values[:-2], values[1:-1], values[2:]
+    peaks = np.flatnonzero((previous < current) & (current > following)) + 1
+    troughs = np.flatnonzero((previous > current) & (current < following)) + 1
+    return peaks, troughs
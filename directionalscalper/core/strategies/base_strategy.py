@@ -6,7 +6,6 @@ import time
 import math
 import numpy as np
 import random
-import ta as ta
 import uuid
 import os
 import uuid
@@ -22,6 +21,9 @@ from datetime import datetime, timedelta
 from threading import Thread, Lock
 
 from ..bot_metrics import BotDatabase
+from .. import indicators
+from ..exchanges.candle_store import OPEN, HIGH, LOW, CLOSE, VOLUME
+from ..exchanges.retry_scheduler import RetryScheduler, call_endpoint, call_key
 
 
 logging = Logger(logger_name="BaseStrategy", filename="BaseStrategy.log", stream=True)
@@ -56,6 +58,7 @@ class BaseStrategy:
         self.helper_wall_size = 5
         self.helper_interval = 1  # Time interval between helper actions
         self.helper_duration = 5  # Helper duration in seconds
+        self.loop_interval = 3  # Seconds between passes of a symbol loop, also the longest a call retries
         self.LEVERAGE_STEP = 0.002
         #self.MAX_LEVERAGE = 0.1
         self.MAX_LEVERAGE = None
@@ -203,16 +206,23 @@ class BaseStrategy:
         return -MaxAbsFundingRate <= funding_rate <= MaxAbsFundingRate
 
     def fetch_historical_data(self, symbol, timeframe, limit=15):
-        ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df = self.get_ohlcv_frame(symbol, timeframe, limit)
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
         return df
 
+    def get_ohlcv_frame(self, symbol, timeframe='1m', limit=100):
+        # Built straight from the candle store's array instead of going through exchange.fetch_ohlcv's frame
+        ohlcv = self.exchange.get_ohlcv_array(symbol, timeframe, limit)
+        return pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"], copy=True)
+
+    def get_ohlcv_columns(self, symbol, timeframe='1m', limit=100):
+        """open, high, low, close and volume of the newest candles as contiguous arrays for the indicator kernels."""
+        ohlcv = self.exchange.get_ohlcv_array(symbol, timeframe, limit)
+        return tuple(np.ascontiguousarray(ohlcv[:, column], dtype=np.float64) for column in (OPEN, HIGH, LOW, CLOSE, VOLUME))
+
     def calculate_atr(self, df, period=14):
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        tr = np.max([high_low, high_close, low_close], axis=0)
+        # The first bar has no previous close, its true range stays NaN
+        tr = indicators.true_range(df['high'], df['low'], df['close'], seed_first=False)
         atr = np.mean(tr[-period:])
         return atr
 
@@ -235,26 +245,16 @@ class BaseStrategy:
 
     def get_all_moving_averages(self, symbol, max_retries=3, delay=5):
         for _ in range(max_retries):
-            m_moving_averages = self.manager.get_1m_moving_averages(symbol)
-            m5_moving_averages = self.manager.get_5m_moving_averages(symbol)
-
-            ma_6_high = m_moving_averages["MA_6_H"]
-            ma_6_low = m_moving_averages["MA_6_L"]
-            ma_3_low = m_moving_averages["MA_3_L"]
-            ma_3_high = m_moving_averages["MA_3_H"]
-            ma_1m_3_high = self.manager.get_1m_moving_averages(symbol)["MA_3_H"]
-            ma_5m_3_high = self.manager.get_5m_moving_averages(symbol)["MA_3_H"]
+            # One 1m and one 5m lookup served from the candle store, instead of four full fetches
+            try:
+                moving_averages = self.exchange.moving_averages.get_all(symbol)
+            except Exception as e:
+                logging.info(f"Failed to get moving averages for {symbol}: {e}")
+                moving_averages = {}
 
             # Check if the data is correct
-            if all(isinstance(value, (float, int, np.number)) for value in [ma_6_high, ma_6_low, ma_3_low, ma_3_high, ma_1m_3_high, ma_5m_3_high]):
-                return {
-                    "ma_6_high": ma_6_high,
-                    "ma_6_low": ma_6_low,
-                    "ma_3_low": ma_3_low,
-                    "ma_3_high": ma_3_high,
-                    "ma_1m_3_high": ma_1m_3_high,
-                    "ma_5m_3_high": ma_5m_3_high,
-                }
+            if moving_averages and all(isinstance(value, (float, int, np.number)) for value in moving_averages.values()):
+                return moving_averages
 
             # If the data is not correct, wait for a short delay
             time.sleep(delay)
@@ -1152,9 +1152,9 @@ class BaseStrategy:
                 df = self.exchange.fetch_ohlcv(symbol, timeframe='5m')
 
                 #print(df.head())
-                df['mfi'] = ta.volume.money_flow_index(df['high'], df['low'], df['close'], df['volume'], window=14)
-                df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-                df['ma'] = ta.trend.sma_indicator(df['close'], window=14)
+                df['mfi'] = indicators.mfi(df['high'], df['low'], df['close'], df['volume'], window=14)
+                df['rsi'] = indicators.rsi(df['close'], window=14)
+                df['ma'] = indicators.sma(df['close'], window=14)
                 df['open_less_close'] = (df['open'] < df['close']).astype(int)
 
                 df['buy_condition'] = ((df['mfi'] < 20) & (df['rsi'] < 35) & (df['open_less_close'] == 1)).astype(int)
@@ -1200,17 +1200,22 @@ class BaseStrategy:
         symbols = [pos.get('symbol').split(':')[0] for pos in positions if isinstance(pos, dict) and pos.get('symbol')]
         return symbols
 
-    def retry_api_call(self, function, *args, max_retries=100, base_delay=10, max_delay=60, **kwargs):
-        retries = 0
-        while retries < max_retries:
-            try:
-                return function(*args, **kwargs)
-            except Exception as e:  # Catch all exceptions
-                retries += 1
-                delay = min(base_delay * (2 ** retries) + random.uniform(0, 0.1 * (2 ** retries)), max_delay)
-                logging.info(f"Error occurred: {e}. Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
-        raise Exception(f"Failed to execute the API function after {max_retries} retries.")
+    def retry_api_call(self, function, *args, max_retries=None, base_delay=None, max_delay=None, deadline=None, **kwargs):
+        """
+        Call an exchange function through the account's retry scheduler.
+
+        Retries back off with jitter and stop at ``deadline`` (the bot's ``retry_deadline_seconds`` by default),
+        never later than one ``loop_interval``, instead of sleeping through up to 100 attempts. Once the circuit
+        of the function and symbol opens, or the deadline runs out, the last value it returned for the same
+        arguments comes back marked stale; without one it raises.
+        """
+        name = getattr(function, '__name__', str(function))
+        scheduler = getattr(self.exchange, 'retry_scheduler', None) or RetryScheduler.for_process()
+        deadline = min(scheduler.deadline if deadline is None else deadline, self.loop_interval)
+        return scheduler.call(
+            call_endpoint(name, args), function, args, kwargs, cache_key=call_key(name, args, kwargs), deadline=deadline,
+            max_attempts=max_retries, base_delay=base_delay, max_delay=max_delay
+        )
 
     def can_trade_new_symbol(self, open_symbols: list, symbols_allowed: int, current_symbol: str) -> bool:
         """
@@ -1342,70 +1347,65 @@ class BaseStrategy:
                     # Calculate long helper price based on best ask price
                     helper_price_long = best_ask_price + gap + safety_margin
                     helper_price_long = helper_price_long.quantize(Decimal('0.0000'), rounding=ROUND_HALF_UP)
-                    helper_order_long = self.exchange.create_tagged_limit_order_bybit(
-                        symbol,
-                        "sell",
-                        long_dynamic_amount * 1.5,
-                        helper_price_long,
-                        positionIdx=2,
-                        postOnly=True,
-                        params={"orderLinkId": f"helperOrder_{symbol}_long_{i}"}
-                    )
-                    helper_orders.append(helper_order_long)
+                    helper_orders.append({
+                        "symbol": symbol,
+                        "side": "sell",
+                        "qty": long_dynamic_amount * 1.5,
+                        "price": helper_price_long,
+                        "positionIdx": 2,
+                        "postOnly": True,
+                        "orderLinkId": f"helperOrder_{symbol}_long_{i}"
+                    })
 
                 if larger_position == "short":
                     # Calculate short helper price based on best bid price
                     helper_price_short = best_bid_price - gap - safety_margin
                     helper_price_short = helper_price_short.quantize(Decimal('0.0000'), rounding=ROUND_HALF_UP)
-                    helper_order_short = self.exchange.create_tagged_limit_order_bybit(
-                        symbol,
-                        "buy",
-                        short_dynamic_amount * 1.5,
-                        helper_price_short,
-                        positionIdx=1,
-                        postOnly=True,
-                        params={"orderLinkId": f"helperOrder_{symbol}_short_{i}"}
-                    )
-                    helper_orders.append(helper_order_short)
+                    helper_orders.append({
+                        "symbol": symbol,
+                        "side": "buy",
+                        "qty": short_dynamic_amount * 1.5,
+                        "price": helper_price_short,
+                        "positionIdx": 1,
+                        "postOnly": True,
+                        "orderLinkId": f"helperOrder_{symbol}_short_{i}"
+                    })
+
+            # Place the whole wall in one batch request
+            placed_orders = self.exchange.create_orders_batch_bybit(helper_orders)
 
             # Sleep for the helper duration and then cancel all placed orders
             time.sleep(self.helper_duration)
 
             # Cancel orders and handle errors
-            for order in helper_orders:
+            to_cancel = []
+            for order in placed_orders:
                 if 'id' in order:
                     logging.info(f"Helper order for {symbol}: {order}")
-                    self.exchange.cancel_order_by_id(order['id'], symbol)
+                    to_cancel.append(order)
                 else:
                     logging.warning(f"Could not place helper order for {symbol}: {order.get('error', 'Unknown error')}")
+            self.exchange.cancel_orders_batch_bybit(to_cancel)
 
             # Deactivate helper for the next cycle
             self.helper_active = False
 
     def calculate_qfl_levels(self, symbol: str, timeframe='5m', lookback_period=12):
         # Fetch historical candle data
-        candles = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=lookback_period)
-        df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-
-        # Convert timestamps to readable dates (optional)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        candles = self.exchange.get_ohlcv_array(symbol, timeframe, lookback_period)
 
         # Find the lowest lows and highest highs of the lookback period for QFL bases and ceilings
-        qfl_base = df['low'].min()  # Support level
-        qfl_ceiling = df['high'].max()  # Resistance level
+        qfl_base = candles[:, LOW].min()  # Support level
+        qfl_ceiling = candles[:, HIGH].max()  # Resistance level
 
         return qfl_base, qfl_ceiling
 
     def calculate_qfl_base(self, symbol: str, timeframe='5m', lookback_period=12):
         # Fetch historical candle data
-        candles = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=lookback_period)
-        df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-
-        # Convert timestamps to readable dates (optional)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        candles = self.exchange.get_ohlcv_array(symbol, timeframe, lookback_period)
 
         # Find the lowest lows of the lookback period
-        qfl_base = df['low'].min()
+        qfl_base = candles[:, LOW].min()
         return qfl_base
 
     # Bybit regular auto hedge logic
@@ -2181,144 +2181,138 @@ class BaseStrategy:
 
     def get_mfirsi_ema_secondary_ema(self, symbol: str, limit: int = 100, lookback: int = 1, ema_period: int = 5, secondary_ema_period: int = 3) -> str:
         # Fetch OHLCV data
-        ohlcv_data = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df = pd.DataFrame(ohlcv_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
         # Calculate MFI and RSI
-        df['mfi'] = ta.volume.MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=14, fillna=False).money_flow_index()
-        df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
+        mfi = indicators.mfi(high, low, close, volume, window=14)
+        rsi = indicators.rsi(close, window=14)
 
         # Calculate EMAs for MFI and RSI
-        df['mfi_ema'] = df['mfi'].ewm(span=ema_period, adjust=False).mean()
-        df['rsi_ema'] = df['rsi'].ewm(span=ema_period, adjust=False).mean()
+        mfi_ema = indicators.ema(mfi, ema_period)
+        rsi_ema = indicators.ema(rsi, ema_period)
 
         # Calculate secondary EMAs for MFI and RSI
-        df['mfi_ema_secondary'] = df['mfi'].ewm(span=secondary_ema_period, adjust=False).mean()
-        df['rsi_ema_secondary'] = df['rsi'].ewm(span=secondary_ema_period, adjust=False).mean()
+        mfi_ema_secondary = indicators.ema(mfi, secondary_ema_period)
+        rsi_ema_secondary = indicators.ema(rsi, secondary_ema_period)
 
         # Determine conditions using EMAs and secondary EMAs
-        df['buy_condition'] = (
-            (df['mfi_ema'] < 30) &
-            (df['rsi_ema'] < 40) &
-            (df['mfi_ema_secondary'] < df['mfi_ema']) &
-            (df['rsi_ema_secondary'] < df['rsi_ema']) &
-            (df['open'] < df['close'])
-        ).astype(int)
-        df['sell_condition'] = (
-            (df['mfi_ema'] > 70) &
-            (df['rsi_ema'] > 60) &
-            (df['mfi_ema_secondary'] > df['mfi_ema']) &
-            (df['rsi_ema_secondary'] > df['rsi_ema']) &
-            (df['open'] > df['close'])
-        ).astype(int)
+        buy_condition = (
+            (mfi_ema < 30) &
+            (rsi_ema < 40) &
+            (mfi_ema_secondary < mfi_ema) &
+            (rsi_ema_secondary < rsi_ema) &
+            (open_ < close)
+        )
+        sell_condition = (
+            (mfi_ema > 70) &
+            (rsi_ema > 60) &
+            (mfi_ema_secondary > mfi_ema) &
+            (rsi_ema_secondary > rsi_ema) &
+            (open_ > close)
+        )
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df.iloc[-lookback:]
-        if recent_conditions['buy_condition'].sum() > 0:
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].sum() > 0:
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
 
     def get_mfirsi_ema_secondary_ema_l(self, symbol: str, limit: int = 100, lookback: int = 6, ema_period: int = 6, secondary_ema_period: int = 4) -> str:
         # Fetch OHLCV data
-        ohlcv_data = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df = pd.DataFrame(ohlcv_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
         # Calculate MFI and RSI
-        df['mfi'] = ta.volume.MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=14, fillna=False).money_flow_index()
-        df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
+        mfi = indicators.mfi(high, low, close, volume, window=14)
+        rsi = indicators.rsi(close, window=14)
 
         # Calculate EMAs for MFI and RSI
-        df['mfi_ema'] = df['mfi'].ewm(span=ema_period, adjust=False).mean()
-        df['rsi_ema'] = df['rsi'].ewm(span=ema_period, adjust=False).mean()
+        mfi_ema = indicators.ema(mfi, ema_period)
+        rsi_ema = indicators.ema(rsi, ema_period)
 
         # Calculate secondary EMAs for MFI and RSI
-        df['mfi_ema_secondary'] = df['mfi'].ewm(span=secondary_ema_period, adjust=False).mean()
-        df['rsi_ema_secondary'] = df['rsi'].ewm(span=secondary_ema_period, adjust=False).mean()
+        mfi_ema_secondary = indicators.ema(mfi, secondary_ema_period)
+        rsi_ema_secondary = indicators.ema(rsi, secondary_ema_period)
 
         # Determine conditions using EMAs and secondary EMAs
-        df['buy_condition'] = (
-            (df['mfi_ema'] < 33) &
-            (df['rsi_ema'] < 43) &
-            (df['mfi_ema_secondary'] < df['mfi_ema']) &
-            (df['rsi_ema_secondary'] < df['rsi_ema']) &
-            (df['open'] < df['close'])
-        ).astype(int)
-        df['sell_condition'] = (
-            (df['mfi_ema'] > 67) &
-            (df['rsi_ema'] > 57) &
-            (df['mfi_ema_secondary'] > df['mfi_ema']) &
-            (df['rsi_ema_secondary'] > df['rsi_ema']) &
-            (df['open'] > df['close'])
-        ).astype(int)
+        buy_condition = (
+            (mfi_ema < 33) &
+            (rsi_ema < 43) &
+            (mfi_ema_secondary < mfi_ema) &
+            (rsi_ema_secondary < rsi_ema) &
+            (open_ < close)
+        )
+        sell_condition = (
+            (mfi_ema > 67) &
+            (rsi_ema > 57) &
+            (mfi_ema_secondary > mfi_ema) &
+            (rsi_ema_secondary > rsi_ema) &
+            (open_ > close)
+        )
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df.iloc[-lookback:]
-        if recent_conditions['buy_condition'].sum() > 0:
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].sum() > 0:
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
 
     def get_mfirsi_ema(self, symbol: str, limit: int = 100, lookback: int = 5, ema_period: int = 5) -> str:
         # Fetch OHLCV data
-        ohlcv_data = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df = pd.DataFrame(ohlcv_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
         # Calculate MFI and RSI
-        df['mfi'] = ta.volume.MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=14, fillna=False).money_flow_index()
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
+        mfi = indicators.mfi(high, low, close, volume, window=14)
+        rsi = indicators.rsi(close, window=14)
 
         # Calculate EMAs for MFI and RSI
-        df['mfi_ema'] = df['mfi'].ewm(span=ema_period, adjust=False).mean()
-        df['rsi_ema'] = df['rsi'].ewm(span=ema_period, adjust=False).mean()
+        mfi_ema = indicators.ema(mfi, ema_period)
+        rsi_ema = indicators.ema(rsi, ema_period)
 
         # Determine conditions using EMAs
-        df['buy_condition'] = ((df['mfi_ema'] < 30) & (df['rsi_ema'] < 40) & (df['open'] < df['close'])).astype(int)
-        df['sell_condition'] = ((df['mfi_ema'] > 80) & (df['rsi_ema'] > 70) & (df['open'] > df['close'])).astype(int)
+        buy_condition = (mfi_ema < 30) & (rsi_ema < 40) & (open_ < close)
+        sell_condition = (mfi_ema > 80) & (rsi_ema > 70) & (open_ > close)
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df.iloc[-lookback:]
-        if recent_conditions['buy_condition'].any():
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].any():
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
 
     def get_mfirsi_volatility_ema(self, symbol: str, limit: int = 100, lookback: int = 5, ema_period: int = 5) -> str:
-        # Fetch OHLCV data using CCXT
-        ohlcv_data = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df = pd.DataFrame(ohlcv_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        # Fetch OHLCV data from the candle store
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
-        # Calculate volatility (standard deviation of close prices)
-        df['volatility'] = df['close'].rolling(window=14).std()
+        # Calculate volatility (standard deviation of the last 14 close prices)
+        volatility = indicators.rolling_std(close, 14)[-1]
 
         # Determine MFI and RSI windows based on volatility
         high_volatility_threshold = 0.05
-        mfi_window = 10 if df['volatility'].iloc[-1] > high_volatility_threshold else 20
-        rsi_window = 10 if df['volatility'].iloc[-1] > high_volatility_threshold else 20
+        mfi_window = 10 if volatility > high_volatility_threshold else 20
+        rsi_window = 10 if volatility > high_volatility_threshold else 20
 
         # Calculate MFI and RSI with adaptive windows
-        df['mfi'] = ta.volume.MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=mfi_window, fillna=False).money_flow_index()
-        df['rsi'] = ta.momentum.rsi(df['close'], window=rsi_window)
+        mfi = indicators.mfi(high, low, close, volume, window=mfi_window)
+        rsi = indicators.rsi(close, window=rsi_window)
 
         # Calculate EMAs for MFI and RSI
-        df['mfi_ema'] = df['mfi'].ewm(span=ema_period, adjust=False).mean()
-        df['rsi_ema'] = df['rsi'].ewm(span=ema_period, adjust=False).mean()
+        mfi_ema = indicators.ema(mfi, ema_period)
+        rsi_ema = indicators.ema(rsi, ema_period)
 
         # Determine conditions using EMAs
-        df['buy_condition'] = (df['mfi_ema'].diff() > 0) & (df['rsi_ema'].diff() > 0) & (df['open'] < df['close'])
-        df['sell_condition'] = (df['mfi_ema'].diff() < 0) & (df['rsi_ema'].diff() < 0) & (df['open'] > df['close'])
+        mfi_ema_change = indicators.diff(mfi_ema)
+        rsi_ema_change = indicators.diff(rsi_ema)
+        buy_condition = (mfi_ema_change > 0) & (rsi_ema_change > 0) & (open_ < close)
+        sell_condition = (mfi_ema_change < 0) & (rsi_ema_change < 0) & (open_ > close)
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df.iloc[-lookback:]
-        if recent_conditions['buy_condition'].any():
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].any():
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
@@ -2326,33 +2320,29 @@ class BaseStrategy:
 
     def get_mfi_atr(self, symbol: str, limit: int = 100, lookback: int = 5) -> str:
         # Fetch 1-minute OHLCV data
-        ohlcv_data_min = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df_min = pd.DataFrame(ohlcv_data_min, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
         # Fetch 1-hour OHLCV data for ATR
-        ohlcv_data_hour = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1h', limit=14)  # Last 14 hours
-        df_hour = pd.DataFrame(ohlcv_data_hour, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        _, hour_high, hour_low, hour_close, _ = self.get_ohlcv_columns(symbol, '1h', 14)  # Last 14 hours
 
-        # Calculate True Range and ATR on 1-hour data
-        df_hour['tr'] = np.maximum((df_hour['high'] - df_hour['low']),
-                                np.maximum(abs(df_hour['high'] - df_hour['close'].shift(1)),
-                                            abs(df_hour['low'] - df_hour['close'].shift(1))))
-        df_hour['atr'] = df_hour['tr'].rolling(window=14).mean()
+        # Calculate True Range and ATR on 1-hour data, the first hour has no previous close and stays NaN
+        hour_atr = indicators.sma(indicators.true_range(hour_high, hour_low, hour_close, seed_first=False), 14)
 
         # Get the latest ATR value from 1-hour data
-        latest_atr_value = df_hour['atr'].iloc[-1]
+        latest_atr_value = hour_atr[-1]
 
-        # Determine Volatility Threshold
-        volatility_threshold = df_hour['atr'].quantile(0.75)
+        # Determine Volatility Threshold, skipping NaN like Series.quantile
+        valid_atr = hour_atr[~np.isnan(hour_atr)]
+        volatility_threshold = np.quantile(valid_atr, 0.75) if len(valid_atr) else np.nan
 
         # Determine MFI and RSI windows based on ATR-based volatility
         mfi_window = 14 if latest_atr_value > volatility_threshold else 14
         rsi_window = 14 if latest_atr_value > volatility_threshold else 14
 
         # Calculate MFI and RSI with adaptive windows on 1-minute data
-        df_min['mfi'] = ta.volume.MFIIndicator(high=df_min['high'], low=df_min['low'], close=df_min['close'], volume=df_min['volume'], window=mfi_window, fillna=False).money_flow_index()
-        df_min['rsi'] = ta.momentum.rsi(df_min['close'], window=rsi_window)
-        df_min['open_less_close'] = (df_min['open'] < df_min['close']).astype(int)
+        mfi = indicators.mfi(high, low, close, volume, window=mfi_window)
+        rsi = indicators.rsi(close, window=rsi_window)
+        open_less_close = open_ < close
 
         # Adaptive thresholds based on volatility
         mfi_buy_threshold = 25 if latest_atr_value > volatility_threshold else 30
@@ -2361,75 +2351,70 @@ class BaseStrategy:
         rsi_sell_threshold = 75 if latest_atr_value > volatility_threshold else 70
 
         # Calculate conditions with adaptive thresholds
-        df_min['buy_condition'] = ((df_min['mfi'] < mfi_buy_threshold) & (df_min['rsi'] < rsi_buy_threshold) & (df_min['open_less_close'] == 1)).astype(int)
-        df_min['sell_condition'] = ((df_min['mfi'] > mfi_sell_threshold) & (df_min['rsi'] > rsi_sell_threshold) & (df_min['open_less_close'] == 0)).astype(int)
+        buy_condition = (mfi < mfi_buy_threshold) & (rsi < rsi_buy_threshold) & open_less_close
+        sell_condition = (mfi > mfi_sell_threshold) & (rsi > rsi_sell_threshold) & ~open_less_close
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df_min.iloc[-lookback:]
-        if recent_conditions['buy_condition'].any():
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].any():
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
 
     def get_mfirsi(self, symbol: str, limit: int = 100, lookback: int = 5) -> str:
-        # Fetch OHLCV data using CCXT
-        ohlcv_data = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df = pd.DataFrame(ohlcv_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        # Fetch OHLCV data from the candle store
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
-        # Calculate volatility (standard deviation of close prices)
-        df['volatility'] = df['close'].rolling(window=14).std()
+        # Calculate volatility (standard deviation of the last 14 close prices)
+        volatility = indicators.rolling_std(close, 14)[-1]
 
         # Determine MFI and RSI windows based on volatility
         high_volatility_threshold = 0.05
-        mfi_window = 10 if df['volatility'].iloc[-1] > high_volatility_threshold else 20
-        rsi_window = 10 if df['volatility'].iloc[-1] > high_volatility_threshold else 20
+        mfi_window = 10 if volatility > high_volatility_threshold else 20
+        rsi_window = 10 if volatility > high_volatility_threshold else 20
 
         # Calculate MFI and RSI with adaptive windows
-        df['mfi'] = ta.volume.MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=mfi_window, fillna=False).money_flow_index()
-        df['rsi'] = ta.momentum.rsi(df['close'], window=rsi_window)
-        df['open_less_close'] = (df['open'] < df['close']).astype(int)
+        mfi = indicators.mfi(high, low, close, volume, window=mfi_window)
+        rsi = indicators.rsi(close, window=rsi_window)
+        open_less_close = open_ < close
 
         # Adaptive thresholds based on volatility
-        mfi_buy_threshold = 25 if df['volatility'].iloc[-1] > high_volatility_threshold else 30
-        mfi_sell_threshold = 85 if df['volatility'].iloc[-1] > high_volatility_threshold else 80
-        rsi_buy_threshold = 35 if df['volatility'].iloc[-1] > high_volatility_threshold else 40
-        rsi_sell_threshold = 75 if df['volatility'].iloc[-1] > high_volatility_threshold else 70
+        mfi_buy_threshold = 25 if volatility > high_volatility_threshold else 30
+        mfi_sell_threshold = 85 if volatility > high_volatility_threshold else 80
+        rsi_buy_threshold = 35 if volatility > high_volatility_threshold else 40
+        rsi_sell_threshold = 75 if volatility > high_volatility_threshold else 70
 
         # Calculate conditions with adaptive thresholds
-        df['buy_condition'] = ((df['mfi'] < mfi_buy_threshold) & (df['rsi'] < rsi_buy_threshold) & (df['open_less_close'] == 1)).astype(int)
-        df['sell_condition'] = ((df['mfi'] > mfi_sell_threshold) & (df['rsi'] > rsi_sell_threshold) & (df['open_less_close'] == 0)).astype(int)
+        buy_condition = (mfi < mfi_buy_threshold) & (rsi < rsi_buy_threshold) & open_less_close
+        sell_condition = (mfi > mfi_sell_threshold) & (rsi > rsi_sell_threshold) & ~open_less_close
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df.iloc[-lookback:]
-        if recent_conditions['buy_condition'].any():
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].any():
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
 
 
     def get_mfirsi_v1(self, symbol: str, limit: int = 100, lookback: int = 5) -> str:
-        # Fetch OHLCV data using CCXT
-        ohlcv_data = self.exchange.fetch_ohlcv(symbol=symbol, timeframe='1m', limit=limit)
-        df = pd.DataFrame(ohlcv_data, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        # Fetch OHLCV data from the candle store
+        open_, high, low, close, volume = self.get_ohlcv_columns(symbol, '1m', limit)
 
         # Calculate MFI and RSI
-        df['mfi'] = ta.volume.MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume'], window=14, fillna=False).money_flow_index()
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-        df['open_less_close'] = (df['open'] < df['close']).astype(int)
+        mfi = indicators.mfi(high, low, close, volume, window=14)
+        rsi = indicators.rsi(close, window=14)
+        open_less_close = open_ < close
 
         # Calculate conditions
-        df['buy_condition'] = ((df['mfi'] < 30) & (df['rsi'] < 40) & (df['open_less_close'] == 1)).astype(int)
-        df['sell_condition'] = ((df['mfi'] > 80) & (df['rsi'] > 70) & (df['open_less_close'] == 0)).astype(int)
+        buy_condition = (mfi < 30) & (rsi < 40) & open_less_close
+        sell_condition = (mfi > 80) & (rsi > 70) & ~open_less_close
 
         # Evaluate conditions over the lookback period
-        recent_conditions = df.iloc[-lookback:]
-        if recent_conditions['buy_condition'].any():
+        if buy_condition[-lookback:].any():
             return 'long'
-        elif recent_conditions['sell_condition'].any():
+        elif sell_condition[-lookback:].any():
             return 'short'
         else:
             return 'neutral'
@@ -2750,6 +2735,7 @@ class BaseStrategy:
         market_price = Decimal(str(market_price))
 
         max_levels, price_interval = self.calculate_dynamic_auto_reduce_levels(symbol, pos_qty, market_price, total_equity, long_pos_price, short_pos_price)
+        ladder = []
         for i in range(1, max_levels + 1):
             # Calculate step price based on position type
             if position_type == 'long':
@@ -2772,35 +2758,46 @@ class BaseStrategy:
             adjusted_dynamic_amount = max(dynamic_amount, min_qty)
             adjusted_dynamic_amount = round(adjusted_dynamic_amount, qty_precision_level)
 
-            # Attempt to place the auto-reduce order
-            try:
-                if position_type == 'long':
-                    order_id = self.auto_reduce_long(symbol, adjusted_dynamic_amount, float(step_price))
-                elif position_type == 'short':
-                    order_id = self.auto_reduce_short(symbol, adjusted_dynamic_amount, float(step_price))
-
-                # Initialize the symbol key if it doesn't exist
-                if symbol not in self.auto_reduce_orders:
-                    self.auto_reduce_orders[symbol] = []
+            ladder.append({
+                "symbol": symbol,
+                "side": "sell" if position_type == 'long' else "buy",
+                "qty": adjusted_dynamic_amount,
+                "price": float(step_price),
+                "positionIdx": 1 if position_type == 'long' else 2,
+                "reduceOnly": True,
+                "postOnly": False
+            })
+
+        # Initialize the symbol key if it doesn't exist
+        if symbol not in self.auto_reduce_orders:
+            self.auto_reduce_orders[symbol] = []
+
+        # Place the whole ladder through the batch endpoint
+        try:
+            orders = self.exchange.create_orders_batch_bybit(ladder) if ladder else []
+        except Exception as e:
+            logging.error(f"Error in executing auto-reduce {position_type} orders for {symbol}: {e}")
+            logging.error("Traceback:", traceback.format_exc())
+            return
 
-                if order_id:
-                    self.auto_reduce_orders[symbol].append(order_id)
-                    logging.info(f"{symbol} {position_type.capitalize()} Auto-Reduce Order Placed at {step_price} with amount {adjusted_dynamic_amount}")
-                else:
-                    logging.warning(f"{symbol} {position_type.capitalize()} Auto-Reduce Order Not Filled Immediately at {step_price} with amount {adjusted_dynamic_amount}")
-            except Exception as e:
-                logging.error(f"Error in executing auto-reduce {position_type} order for {symbol}: {e}")
-                logging.error("Traceback:", traceback.format_exc())
+        for level, order in zip(ladder, orders):
+            order_id = order.get('id')
+            if order_id:
+                self.auto_reduce_orders[symbol].append(order_id)
+                logging.info(f"{symbol} {position_type.capitalize()} Auto-Reduce Order Placed at {level['price']} with amount {level['qty']}")
+            else:
+                logging.warning(f"{symbol} {position_type.capitalize()} Auto-Reduce Order Not Placed at {level['price']} with amount {level['qty']}: {order.get('error')}")
 
     def cancel_all_auto_reduce_orders_bybit(self, symbol: str) -> None:
         try:
             if symbol in self.auto_reduce_orders:
-                for order_id in self.auto_reduce_orders[symbol]:
-                    try:
-                        self.exchange.cancel_order(order_id, symbol)
+                order_ids = self.auto_reduce_orders[symbol]
+                results = self.exchange.cancel_orders_batch_bybit([{"symbol": symbol, "id": order_id} for order_id in order_ids])
+                for order_id, result in zip(order_ids, results):
+                    if 'error' in result:
+                        logging.warning(f"An error occurred while cancelling auto-reduce order {order_id}: {result['error']}")
+                    else:
                         logging.info(f"Cancelling auto-reduce order: {order_id}")
-                    except Exception as e:
-                        logging.warning(f"An error occurred while cancelling auto-reduce order {order_id}: {e}")
                 self.auto_reduce_orders[symbol].clear()  # Clear the list after cancellation
             else:
                 logging.info(f"No auto-reduce orders found for {symbol}")
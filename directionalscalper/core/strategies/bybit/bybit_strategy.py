@@ -24,6 +24,9 @@ from threading import Thread, Lock
 from ...bot_metrics import BotDatabase
 
 from directionalscalper.core.strategies.base_strategy import BaseStrategy
+from directionalscalper.core.strategies.tick_context import TickContext
+from directionalscalper.core.strategies.grid_reconciler import plan_grid_orders
+from directionalscalper.core.exchanges.retry_scheduler import ExchangeDataUnavailable, is_stale
 
 logging = Logger(logger_name="BybitBaseStrategy", filename="BybitBaseStrategy.log", stream=True)
 
@@ -78,6 +81,42 @@ class BybitStrategy(BaseStrategy):
 
         logging.info(f"Updated dynamic amounts for {symbol}. New long_dynamic_amount: {self.long_dynamic_amount[symbol]}, New short_dynamic_amount: {self.short_dynamic_amount[symbol]}")
     
+    def build_tick_context(self, symbol, total_equity=None, available_equity=None) -> TickContext:
+        """
+        Fetch what one loop pass needs in one go: open positions of the account, open orders, ticker,
+        orderbook and market metadata. Balances are passed in since strategies refresh them less often.
+        """
+        inputs = {}
+        if getattr(self.exchange, 'async_runtime', None) is not None:
+            # Independent requests go out together on the event loop, failed ones are fetched below as usual
+            inputs = self.exchange.fetch_iteration_inputs(symbol)
+
+        open_positions = inputs.get('open_positions')
+        if open_positions is None:
+            open_positions = self.retry_api_call(self.exchange.get_all_open_positions_bybit)
+        open_orders = inputs.get('open_orders')
+        if open_orders is None:
+            open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
+        current_price = inputs.get('current_price')
+        if current_price is None:
+            current_price = self.exchange.get_current_price(symbol)
+        order_book = inputs.get('order_book')
+        if not order_book or not order_book.get('bids'):
+            order_book = self.exchange.get_orderbook(symbol)
+
+        market_metadata = getattr(self.exchange, 'market_metadata', None)
+        return TickContext(
+            symbol,
+            open_positions=open_positions,
+            open_orders=open_orders,
+            ticker=self.exchange.get_ticker(symbol),
+            current_price=current_price,
+            order_book=order_book,
+            total_equity=total_equity,
+            available_equity=available_equity,
+            market=market_metadata.get(symbol) if market_metadata is not None else None,
+        )
+
     def get_open_symbols(self):
         open_position_data = self.retry_api_call(self.exchange.get_all_open_positions_bybit)
         position_symbols = set()
@@ -88,8 +127,9 @@ class BybitStrategy(BaseStrategy):
                 position_symbols.add(position_symbol.replace("/", ""))
         return position_symbols
 
-    def should_terminate(self, symbol, current_time):
-        open_symbols = self.get_open_symbols()  # Fetch open symbols
+    def should_terminate(self, symbol, current_time, tick=None):
+        # Reuse the positions of this pass when the caller has a TickContext
+        open_symbols = tick.open_symbols if tick is not None else self.get_open_symbols()
         if symbol not in open_symbols:
             if not hasattr(self, 'position_closed_time'):
                 self.position_closed_time = current_time
@@ -1485,27 +1525,29 @@ class BybitStrategy(BaseStrategy):
                 if symbol in open_symbols or trading_allowed:
                     if long_mode and (mfi_signal_long or (long_pos_qty > 0 and not long_grid_active)):
                         if should_reissue or (long_pos_qty > 0 and not any(order['side'].lower() == 'buy' for order in open_orders)):
-                            # Cancel existing long grid orders if should_reissue or long position exists but no buy orders
-                            self.cancel_grid_orders(symbol, "buy")
-                            self.filled_levels[symbol]["buy"].clear()
+                            # Move the live long grid onto the new levels instead of cancelling and placing it again
+                            logging.info(f"[{symbol}] Reconciling long grid orders.")
+                            if self.reconcile_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                         # Place new long grid orders only if there are no existing buy orders and no active long grid
-                        if not any(order['side'].lower() == 'buy' for order in open_orders) and not long_grid_active:
+                        elif not any(order['side'].lower() == 'buy' for order in open_orders) and not long_grid_active:
                             logging.info(f"[{symbol}] Placing new long grid orders.")
-                            self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     if short_mode and (mfi_signal_short or (short_pos_qty > 0 and not short_grid_active)):
                         if should_reissue or (short_pos_qty > 0 and not any(order['side'].lower() == 'sell' for order in open_orders)):
-                            # Cancel existing short grid orders if should_reissue or short position exists but no sell orders
-                            self.cancel_grid_orders(symbol, "sell")
-                            self.filled_levels[symbol]["sell"].clear()
+                            # Move the live short grid onto the new levels instead of cancelling and placing it again
+                            logging.info(f"[{symbol}] Reconciling short grid orders.")
+                            if self.reconcile_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                         # Place new short grid orders only if there are no existing sell orders and no active short grid
-                        if not any(order['side'].lower() == 'sell' for order in open_orders) and not short_grid_active:
+                        elif not any(order['side'].lower() == 'sell' for order in open_orders) and not short_grid_active:
                             logging.info(f"[{symbol}] Placing new short grid orders.")
-                            self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     # Check if there is room for trading new symbols
                     logging.info(f"[{symbol}] Number of open symbols: {len(open_symbols)}, Symbols allowed: {symbols_allowed}")
@@ -1514,12 +1556,12 @@ class BybitStrategy(BaseStrategy):
                         # Place grid orders for the new symbol
                         if long_mode and mfi_signal_long:
                             logging.info(f"[{symbol}] Placing new long orders.")
-                            self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
                         if short_mode and mfi_signal_short:
                             logging.info(f"[{symbol}] Placing new short orders.")
-                            self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     if long_pos_qty > 0:
                         # Update TP for long position
@@ -1627,15 +1669,15 @@ class BybitStrategy(BaseStrategy):
                 if symbol in open_symbols or trading_allowed:
                     if long_mode and (not long_grid_active or long_pos_qty > 0) and (mfi_signal_long or long_pos_qty > 0):
                         if should_reissue or (long_pos_qty > 0 and not any(order['side'].lower() == 'buy' for order in open_orders)):
-                            logging.info(f"[{symbol}] Placing new long grid orders.")
-                            self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            logging.info(f"[{symbol}] Reconciling long grid orders.")
+                            if self.reconcile_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     if short_mode and (not short_grid_active or short_pos_qty > 0) and (mfi_signal_short or short_pos_qty > 0):
                         if should_reissue or (short_pos_qty > 0 and not any(order['side'].lower() == 'sell' for order in open_orders)):
-                            logging.info(f"[{symbol}] Placing new short grid orders.")
-                            self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            logging.info(f"[{symbol}] Reconciling short grid orders.")
+                            if self.reconcile_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     # Check if there is room for trading new symbols
                     logging.info(f"[{symbol}] Number of open symbols: {len(open_symbols)}, Symbols allowed: {symbols_allowed}")
@@ -1644,12 +1686,12 @@ class BybitStrategy(BaseStrategy):
                         # Place grid orders for the new symbol
                         if long_mode and mfi_signal_long:
                             logging.info(f"[{symbol}] Placing new long orders.")
-                            self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
                         if short_mode and mfi_signal_short:
                             logging.info(f"[{symbol}] Placing new short orders.")
-                            self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
                 else:
                     logging.info(f"[{symbol}] Trading not allowed. Skipping grid placement.")
 
@@ -1724,15 +1766,15 @@ class BybitStrategy(BaseStrategy):
                 if symbol in open_symbols or trading_allowed:
                     if long_mode and not long_grid_active:
                         if should_reissue or (long_pos_qty > 0 and not any(order['side'].lower() == 'buy' for order in open_orders)):
-                            logging.info(f"[{symbol}] Placing new long grid orders.")
-                            self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            logging.info(f"[{symbol}] Reconciling long grid orders.")
+                            if self.reconcile_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     if short_mode and not short_grid_active:
                         if should_reissue or (short_pos_qty > 0 and not any(order['side'].lower() == 'sell' for order in open_orders)):
-                            logging.info(f"[{symbol}] Placing new short grid orders.")
-                            self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            logging.info(f"[{symbol}] Reconciling short grid orders.")
+                            if self.reconcile_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
 
                     # Check if there is room for trading new symbols
                     logging.info(f"[{symbol}] Number of open symbols: {len(open_symbols)}, Symbols allowed: {symbols_allowed}")
@@ -1741,12 +1783,12 @@ class BybitStrategy(BaseStrategy):
                         # Place grid orders for the new symbol
                         if long_mode:
                             logging.info(f"[{symbol}] Placing new long orders.")
-                            self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "buy", grid_levels_long, amounts_long, True, self.filled_levels[symbol]["buy"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
                         if short_mode:
                             logging.info(f"[{symbol}] Placing new short orders.")
-                            self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"])
-                            self.active_grids.add(symbol)  # Mark the symbol as having an active grid
+                            if self.issue_grid_orders(symbol, "sell", grid_levels_short, amounts_short, False, self.filled_levels[symbol]["sell"]):
+                                self.active_grids.add(symbol)  # Mark the symbol as having an active grid
                 else:
                     logging.info(f"[{symbol}] Trading not allowed. Skipping grid placement.")
 
@@ -1777,41 +1819,125 @@ class BybitStrategy(BaseStrategy):
         except Exception as e:
             logging.info(f"Exception caught in should_reissue_orders {e}")
 
+    def fresh_open_orders(self, symbol: str, side: str):
+        """
+        Open orders of ``symbol`` to place grid orders against, None when only a stale copy or nothing is available.
+
+        Stale fallbacks are fine for display and sizing, but amending or re-placing levels from them would act on
+        orders that have since filled or been cancelled.
+        """
+        try:
+            open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
+        except ExchangeDataUnavailable as e:
+            logging.warning(f"[{symbol}] Skipping the {side} grid this pass, open orders unavailable: {e}")
+            return None
+        if is_stale(open_orders):
+            logging.warning(f"[{symbol}] Skipping the {side} grid this pass, open orders are {open_orders.age:.0f}s old")
+            return None
+        return open_orders or []
+
     def issue_grid_orders(self, symbol: str, side: str, grid_levels: list, amounts: list, is_long: bool, filled_levels: set):
         """
         Check the status of existing grid orders and place new orders for unfilled levels.
         """
-        open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
+        open_orders = self.fresh_open_orders(symbol, side)
+        if open_orders is None:
+            return False
         logging.info(f"Open orders data for {symbol}: {open_orders}")
 
-        # Place new grid orders for unfilled levels
+        # Place new grid orders for unfilled levels, the whole ladder goes out through the batch endpoint
+        position_idx = 1 if is_long else 2
+        pending_levels = []
+        batch = []
         for level, amount in zip(grid_levels, amounts):
             if level not in filled_levels:
                 unique_identifier = str(uuid.uuid4())[:8]  # Generate a unique 8-character string
                 order_link_id = f"{symbol}_{side}_{level}_{unique_identifier}"
-                position_idx = 1 if is_long else 2
-                order = self.exchange.create_tagged_limit_order_bybit(symbol, side, amount, level, positionIdx=position_idx, orderLinkId=order_link_id)
-                if order is not None and 'id' in order:
-                    logging.info(f"Placed {side} order at level {level} for {symbol} with amount {amount}")
-                    filled_levels.add(level)  # Add the level to filled_levels
-                else:
-                    logging.error(f"Failed to place {side} order at level {level} for {symbol} with amount {amount}")
+                pending_levels.append((level, amount))
+                batch.append({"symbol": symbol, "side": side, "qty": amount, "price": level, "positionIdx": position_idx, "orderLinkId": order_link_id})
             else:
                 logging.info(f"Skipping {side} order at level {level} for {symbol} as it is already filled for the current open position.")
 
+        orders = self.exchange.create_orders_batch_bybit(batch) if batch else []
+        for (level, amount), order in zip(pending_levels, orders):
+            if order.get('id'):
+                logging.info(f"Placed {side} order at level {level} for {symbol} with amount {amount}")
+                filled_levels.add(level)  # Add the level to filled_levels
+            else:
+                logging.error(f"Failed to place {side} order at level {level} for {symbol} with amount {amount}: {order.get('error')}")
+
         logging.info(f"[{symbol}] {side.capitalize()} grid orders issued for unfilled levels.")
+        return True
  
+    def reconcile_grid_orders(self, symbol: str, side: str, grid_levels: list, amounts: list, is_long: bool, filled_levels: set):
+        """
+        Bring the live orders of one grid side in line with ``grid_levels`` and ``amounts``.
+
+        Orders within a tick of a level are left alone (keeping their queue priority), orders that moved or
+        changed size are amended, and only surplus orders are cancelled and missing levels created.
+        """
+        open_orders = self.fresh_open_orders(symbol, side)
+        if open_orders is None:
+            return False
+        live_orders = [
+            order for order in open_orders
+            if order['side'].lower() == side and not (order.get('reduceOnly') or order.get('info', {}).get('reduceOnly'))
+        ]
+
+        qty_step, tick_size = self.exchange.get_symbol_precision_bybit(symbol)
+        plan = plan_grid_orders(grid_levels, amounts, live_orders, tick_size, qty_step)
+        logging.info(f"[{symbol}] {side.capitalize()} grid reconciliation: {plan}")
+
+        live_levels = {float(order['price']) for order in plan.keep}
+
+        if plan.amend:
+            amends = [{"symbol": symbol, "id": order['id'], "price": price, "qty": qty} for order, price, qty in plan.amend]
+            for (order, price, qty), result in zip(plan.amend, self.exchange.amend_orders_batch_bybit(amends)):
+                if 'error' in result:
+                    logging.error(f"[{symbol}] Failed to amend {side} grid order {order['id']} to price {price}, qty {qty}: {result['error']}")
+                    # Leave nothing behind at the old level
+                    plan.cancel.append(order)
+                    plan.create.append((price if price is not None else float(order['price']), qty if qty is not None else float(order.get('amount') or 0)))
+                else:
+                    live_levels.add(price if price is not None else float(order['price']))
+
+        if plan.cancel:
+            for order, result in zip(plan.cancel, self.exchange.cancel_orders_batch_bybit(plan.cancel)):
+                if 'error' in result:
+                    logging.info(f"[{symbol}] Failed to cancel orphaned {side} grid order {order['id']}: {result['error']}")
+
+        if plan.create:
+            position_idx = 1 if is_long else 2
+            batch = [
+                {"symbol": symbol, "side": side, "qty": qty, "price": price, "positionIdx": position_idx,
+                 "orderLinkId": f"{symbol}_{side}_{price}_{str(uuid.uuid4())[:8]}"}
+                for price, qty in plan.create
+            ]
+            for (price, qty), result in zip(plan.create, self.exchange.create_orders_batch_bybit(batch)):
+                if result.get('id'):
+                    live_levels.add(price)
+                else:
+                    logging.error(f"[{symbol}] Failed to place {side} grid order at {price} with amount {qty}: {result.get('error')}")
+
+        # Levels are tracked at tick precision, so a small price shift no longer makes every level look new
+        filled_levels.clear()
+        filled_levels.update(live_levels)
+        logging.info(f"[{symbol}] {side.capitalize()} grid reconciled with {plan.request_count} order changes, {len(plan.keep)} orders kept.")
+        return True
+
     def cancel_grid_orders(self, symbol: str, side: str):
         try:
             open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
             logging.info(f"Open orders data for {symbol}: {open_orders}")
 
+            side_orders = [order for order in open_orders if order['side'].lower() == side.lower()]
             orders_canceled = 0
-            for order in open_orders:
-                if order['side'].lower() == side.lower():
-                    self.exchange.cancel_order_by_id(order['id'], symbol)
-                    orders_canceled += 1
-                    logging.info(f"Canceled order for {symbol}: {order}")
+            for order, result in zip(side_orders, self.exchange.cancel_orders_batch_bybit(side_orders)):
+                if 'error' in result:
+                    logging.info(f"Failed to cancel order for {symbol}: {order['id']} ({result['error']})")
+                    continue
+                orders_canceled += 1
+                logging.info(f"Canceled order for {symbol}: {order}")
 
             if orders_canceled > 0:
                 logging.info(f"Canceled {orders_canceled} {side} grid orders for {symbol}")
@@ -8,6 +8,7 @@ from threading import Thread, Lock
 from datetime import datetime, timedelta
 
 from directionalscalper.core.strategies.bybit.bybit_strategy import BybitStrategy
+from directionalscalper.core.exchanges.retry_scheduler import ExchangeDataUnavailable
 from directionalscalper.core.strategies.logger import Logger
 
 from live_table_manager import shared_symbols_data
@@ -18,6 +19,7 @@ symbol_locks = {}
 class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
     def __init__(self, exchange, manager, config, symbols_allowed=None):
         super().__init__(exchange, config, manager, symbols_allowed)
+        self.loop_interval = 30
         self.is_order_history_populated = False
         self.last_health_check_time = time.time()
         self.health_check_interval = 600
@@ -211,8 +213,32 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                 current_time = time.time()
                 logging.info(f"Max USD value: {self.max_usd_value}")
 
+                try:
+                    # Fetch equity data less frequently or if it's not available yet
+                    if current_time - last_equity_fetch_time > equity_refresh_interval or total_equity is None:
+                        total_equity = self.retry_api_call(self.exchange.get_balance_bybit, quote_currency)
+                        available_equity = self.retry_api_call(self.exchange.get_available_balance_bybit, quote_currency)
+                        last_equity_fetch_time = current_time
+
+                        logging.info(f"Total equity: {total_equity}")
+                        logging.info(f"Available equity: {available_equity}")
+                    
+                        # If total_equity is still None after fetching, log a warning and skip to the next iteration
+                        if total_equity is None:
+                            logging.warning("Failed to fetch total_equity. Skipping this iteration.")
+                            time.sleep(10)  # wait for a short period before retrying
+                            continue
+
+                    # Positions, orders, price and orderbook for this pass, fetched once
+                    tick = self.build_tick_context(symbol, total_equity, available_equity)
+                except ExchangeDataUnavailable as e:
+                    # The exchange is down and nothing recent is cached, try again on the next pass
+                    logging.warning(f"[{symbol}] Skipping this pass, exchange data unavailable: {e}")
+                    time.sleep(self.loop_interval)
+                    continue
+
                 # Check if the symbol should terminate
-                if self.should_terminate(symbol, current_time):
+                if self.should_terminate(symbol, current_time, tick):
                     self.cleanup_before_termination(symbol)
                     break  # Exit the while loop, thus ending the thread
 
@@ -220,49 +246,17 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                 thread_id = threading.get_ident()
                 logging.info(f"[Thread ID: {thread_id}] In while true loop {symbol}")
 
-                # Fetch open symbols every loop
-                open_position_data = self.retry_api_call(self.exchange.get_all_open_positions_bybit)
+                open_position_data = tick.open_positions
 
                 #logging.info(f"Open position data: {open_position_data}")
 
-                position_details = {}
-
-                for position in open_position_data:
-                    info = position.get('info', {})
-                    position_symbol = info.get('symbol', '').split(':')[0]  # Use a different variable name
-
-                    # Ensure 'size', 'side', 'avgPrice', and 'liqPrice' keys exist in the info dictionary
-                    if 'size' in info and 'side' in info and 'avgPrice' in info and 'liqPrice' in info:
-                        size = float(info['size'])
-                        side = info['side'].lower()
-                        avg_price = float(info['avgPrice'])
-                        liq_price = info.get('liqPrice', None)  # Default to None if not available
-
-                        # Initialize the nested dictionary if the position_symbol is not already in position_details
-                        if position_symbol not in position_details:
-                            position_details[position_symbol] = {
-                                'long': {'qty': 0, 'avg_price': 0, 'liq_price': None}, 
-                                'short': {'qty': 0, 'avg_price': 0, 'liq_price': None}
-                            }
-
-                        # Update the quantities, average prices, and liquidation prices based on the side of the position
-                        if side == 'buy':
-                            position_details[position_symbol]['long']['qty'] += size
-                            position_details[position_symbol]['long']['avg_price'] = avg_price
-                            position_details[position_symbol]['long']['liq_price'] = liq_price
-                        elif side == 'sell':
-                            position_details[position_symbol]['short']['qty'] += size
-                            position_details[position_symbol]['short']['avg_price'] = avg_price
-                            position_details[position_symbol]['short']['liq_price'] = liq_price
-                    else:
-                        logging.warning(f"Missing required keys in position info for {position_symbol}")
+                position_details = tick.position_details
 
-                open_symbols = self.extract_symbols_from_positions_bybit(open_position_data)
-                open_symbols = [symbol.replace("/", "") for symbol in open_symbols]
+                open_symbols = tick.open_symbols
                 logging.info(f"Open symbols: {open_symbols}")
-                open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
+                open_orders = tick.open_orders
 
-                market_data = self.get_market_data_with_retry(symbol, max_retries=100, retry_delay=5)
+                market_data = tick.market_data
                 min_qty = float(market_data["min_qty"])
 
 
@@ -270,21 +264,6 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
 
                 # logging.info(f"{symbol} last update time: {position_last_update_time}")
 
-                # Fetch equity data less frequently or if it's not available yet
-                if current_time - last_equity_fetch_time > equity_refresh_interval or total_equity is None:
-                    total_equity = self.retry_api_call(self.exchange.get_balance_bybit, quote_currency)
-                    available_equity = self.retry_api_call(self.exchange.get_available_balance_bybit, quote_currency)
-                    last_equity_fetch_time = current_time
-
-                    logging.info(f"Total equity: {total_equity}")
-                    logging.info(f"Available equity: {available_equity}")
-                    
-                    # If total_equity is still None after fetching, log a warning and skip to the next iteration
-                    if total_equity is None:
-                        logging.warning("Failed to fetch total_equity. Skipping this iteration.")
-                        time.sleep(10)  # wait for a short period before retrying
-                        continue
-
                 blacklist = self.config.blacklist
                 if symbol in blacklist:
                     logging.info(f"Symbol {symbol} is in the blacklist. Stopping operations for this symbol.")
@@ -293,9 +272,9 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                 funding_check = self.is_funding_rate_acceptable(symbol)
                 logging.info(f"Funding check on {symbol} : {funding_check}")
 
-                current_price = self.exchange.get_current_price(symbol)
+                current_price = tick.current_price
 
-                order_book = self.exchange.get_orderbook(symbol)
+                order_book = tick.order_book
                 # best_ask_price = self.exchange.get_orderbook(symbol)['asks'][0][0]
                 # best_bid_price = self.exchange.get_orderbook(symbol)['bids'][0][0]
 
@@ -370,7 +349,7 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                     fivemin_bottom_signal = metrics['Bottom Signal 5m']
 
 
-                    position_data = self.retry_api_call(self.exchange.get_positions_bybit, symbol)
+                    position_data = tick.positions(symbol)
 
                     long_liquidation_price = position_details.get(symbol, {}).get('long', {}).get('liq_price')
                     short_liquidation_price = position_details.get(symbol, {}).get('short', {}).get('liq_price')
@@ -414,13 +393,13 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                     logging.info(f"Long dynamic amount: {long_dynamic_amount} for {symbol}")
                     logging.info(f"Short dynamic amount: {short_dynamic_amount} for {symbol}")
 
-                    tp_order_counts = self.exchange.get_open_tp_order_count(symbol)
+                    tp_order_counts = tick.tp_order_counts
                     #print(type(tp_order_counts))
 
                     # Check for long position
                     if long_pos_qty > 0:
                         try:
-                            unrealized_pnl = self.exchange.fetch_unrealized_pnl(symbol)
+                            unrealized_pnl = tick.unrealized_pnl(symbol)
                             long_upnl = unrealized_pnl.get('long')
                             logging.info(f"Long UPNL for {symbol}: {long_upnl}")
                         except Exception as e:
@@ -429,7 +408,7 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                     # Check for short position
                     if short_pos_qty > 0:
                         try:
-                            unrealized_pnl = self.exchange.fetch_unrealized_pnl(symbol)
+                            unrealized_pnl = tick.unrealized_pnl(symbol)
                             short_upnl = unrealized_pnl.get('short')
                             logging.info(f"Short UPNL for {symbol}: {short_upnl}")
                         except Exception as e:
@@ -557,7 +536,7 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                     if long_pos_price is not None:
                         should_add_to_long = long_pos_price > moving_averages["ma_6_high"] and self.long_trade_condition(best_bid_price, moving_averages["ma_6_low"])
 
-                    open_tp_order_count = self.exchange.get_open_tp_order_count(symbol)
+                    open_tp_order_count = tick.tp_order_counts
 
                     logging.info(f"Open TP order count {open_tp_order_count}")
 
@@ -706,6 +685,6 @@ class BybitMMOneMinuteQFLMFIERIAutoHedgeWallsATR(BybitStrategy):
                         json.dump(data_to_save, f)
                     self.update_shared_data(symbol_data, open_position_data, len(open_symbols))
 
-                time.sleep(30)
+                time.sleep(self.loop_interval)
         except Exception as e:
             logging.info(f"Exception caught in onemin_mfi_eri_autohedge strategy {e}")
\ No newline at end of file
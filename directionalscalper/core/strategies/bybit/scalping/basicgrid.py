@@ -9,6 +9,7 @@ from threading import Thread, Lock
 from datetime import datetime, timedelta
 
 from directionalscalper.core.strategies.bybit.bybit_strategy import BybitStrategy
+from directionalscalper.core.exchanges.retry_scheduler import ExchangeDataUnavailable
 from directionalscalper.core.exchanges.bybit import BybitExchange
 from directionalscalper.core.strategies.logger import Logger
 from live_table_manager import shared_symbols_data
@@ -269,8 +270,35 @@ class BybitBasicGrid(BybitStrategy):
 
                 logging.info(f"Max USD value: {self.max_usd_value}")
 
+                try:
+                    # Fetch equity data less frequently or if it's not available yet
+                    if current_time - last_equity_fetch_time > equity_refresh_interval or total_equity is None:
+                        total_equity = self.retry_api_call(self.exchange.get_futures_balance_bybit, quote_currency)
+                        available_equity = self.retry_api_call(self.exchange.get_available_balance_bybit, quote_currency)
+                        last_equity_fetch_time = current_time
+
+                        logging.info(f"Total equity: {total_equity}")
+                        logging.info(f"Available equity: {available_equity}")
+                    
+                        # Log the type of total_equity
+                        logging.info(f"Type of total_equity: {type(total_equity)}")
+                    
+                        # If total_equity is still None after fetching, log a warning and skip to the next iteration
+                        if total_equity is None:
+                            logging.warning("Failed to fetch total_equity. Skipping this iteration.")
+                            time.sleep(10)  # wait for a short period before retrying
+                            continue
+
+                    # Positions, orders, price and orderbook for this pass, fetched once
+                    tick = self.build_tick_context(symbol, total_equity, available_equity)
+                except ExchangeDataUnavailable as e:
+                    # The exchange is down and nothing recent is cached, try again on the next pass
+                    logging.warning(f"[{symbol}] Skipping this pass, exchange data unavailable: {e}")
+                    time.sleep(self.loop_interval)
+                    continue
+
                 # Check if the symbol should terminate
-                if self.should_terminate(symbol, current_time):
+                if self.should_terminate(symbol, current_time, tick):
                     self.cleanup_before_termination(symbol)
                     break  # Exit the while loop, thus ending the thread
 
@@ -278,78 +306,28 @@ class BybitBasicGrid(BybitStrategy):
                 thread_id = threading.get_ident()
                 logging.info(f"[Thread ID: {thread_id}] In while true loop {symbol}")
 
-                # Fetch open symbols every loop
-                open_position_data = self.retry_api_call(self.exchange.get_all_open_positions_bybit)
+                open_position_data = tick.open_positions
 
                 
                 logging.info(f"Open position data for {symbol}: {open_position_data}")
 
-                position_details = {}
-
-                for position in open_position_data:
-                    info = position.get('info', {})
-                    position_symbol = info.get('symbol', '').split(':')[0]  # Use a different variable name
-
-                    # Ensure 'size', 'side', 'avgPrice', and 'liqPrice' keys exist in the info dictionary
-                    if 'size' in info and 'side' in info and 'avgPrice' in info and 'liqPrice' in info:
-                        size = float(info['size'])
-                        side = info['side'].lower()
-                        avg_price = float(info['avgPrice'])
-                        liq_price = info.get('liqPrice', None)  # Default to None if not available
-
-                        # Initialize the nested dictionary if the position_symbol is not already in position_details
-                        if position_symbol not in position_details:
-                            position_details[position_symbol] = {
-                                'long': {'qty': 0, 'avg_price': 0, 'liq_price': None}, 
-                                'short': {'qty': 0, 'avg_price': 0, 'liq_price': None}
-                            }
-
-                        # Update the quantities, average prices, and liquidation prices based on the side of the position
-                        if side == 'buy':
-                            position_details[position_symbol]['long']['qty'] += size
-                            position_details[position_symbol]['long']['avg_price'] = avg_price
-                            position_details[position_symbol]['long']['liq_price'] = liq_price
-                        elif side == 'sell':
-                            position_details[position_symbol]['short']['qty'] += size
-                            position_details[position_symbol]['short']['avg_price'] = avg_price
-                            position_details[position_symbol]['short']['liq_price'] = liq_price
-                    else:
-                        logging.warning(f"Missing required keys in position info for {position_symbol}")
+                position_details = tick.position_details
 
-                open_symbols = self.extract_symbols_from_positions_bybit(open_position_data)
-                open_symbols = [symbol.replace("/", "") for symbol in open_symbols]
+                open_symbols = tick.open_symbols
                 logging.info(f"Open symbols: {open_symbols}")
-                open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
+                open_orders = tick.open_orders
 
                 logging.info(f"Open symbols: {open_symbols}")
 
                 logging.info(f"Open orders: {open_orders}")
 
-                market_data = self.get_market_data_with_retry(symbol, max_retries=100, retry_delay=5)
+                market_data = tick.market_data
                 min_qty = float(market_data["min_qty"])
 
                 # position_last_update_time = self.get_position_update_time(symbol)
 
                 # logging.info(f"{symbol} last update time: {position_last_update_time}")
 
-                # Fetch equity data less frequently or if it's not available yet
-                if current_time - last_equity_fetch_time > equity_refresh_interval or total_equity is None:
-                    total_equity = self.retry_api_call(self.exchange.get_futures_balance_bybit, quote_currency)
-                    available_equity = self.retry_api_call(self.exchange.get_available_balance_bybit, quote_currency)
-                    last_equity_fetch_time = current_time
-
-                    logging.info(f"Total equity: {total_equity}")
-                    logging.info(f"Available equity: {available_equity}")
-                    
-                    # Log the type of total_equity
-                    logging.info(f"Type of total_equity: {type(total_equity)}")
-                    
-                    # If total_equity is still None after fetching, log a warning and skip to the next iteration
-                    if total_equity is None:
-                        logging.warning("Failed to fetch total_equity. Skipping this iteration.")
-                        time.sleep(10)  # wait for a short period before retrying
-                        continue
-
                 blacklist = self.config.blacklist
                 if symbol in blacklist:
                     logging.info(f"Symbol {symbol} is in the blacklist. Stopping operations for this symbol.")
@@ -358,9 +336,9 @@ class BybitBasicGrid(BybitStrategy):
                 funding_check = self.is_funding_rate_acceptable(symbol)
                 logging.info(f"Funding check on {symbol} : {funding_check}")
 
-                current_price = self.exchange.get_current_price(symbol)
+                current_price = tick.current_price
 
-                order_book = self.exchange.get_orderbook(symbol)
+                order_book = tick.order_book
                 # best_ask_price = self.exchange.get_orderbook(symbol)['asks'][0][0]
                 # best_bid_price = self.exchange.get_orderbook(symbol)['bids'][0][0]
 
@@ -443,7 +421,7 @@ class BybitBasicGrid(BybitStrategy):
                     onemin_top_signal = metrics['Top Signal 1m']
                     onemin_bottom_signal = metrics['Bottom Signal 1m']
 
-                    position_data = self.retry_api_call(self.exchange.get_positions_bybit, symbol)
+                    position_data = tick.positions(symbol)
 
                     long_liquidation_price = position_details.get(symbol, {}).get('long', {}).get('liq_price')
                     short_liquidation_price = position_details.get(symbol, {}).get('short', {}).get('liq_price')
@@ -618,7 +596,7 @@ class BybitBasicGrid(BybitStrategy):
                     if long_pos_price is not None:
                         should_add_to_long = long_pos_price > moving_averages["ma_6_high"] and self.long_trade_condition(best_bid_price, moving_averages["ma_6_low"])
 
-                    open_tp_order_count = self.exchange.get_open_tp_order_count(symbol)
+                    open_tp_order_count = tick.tp_order_counts
 
                     logging.info(f"Open TP order count {open_tp_order_count}")
 
@@ -633,13 +611,13 @@ class BybitBasicGrid(BybitStrategy):
 
                     logging.info(f"ATR for {symbol} : {one_hour_atr_value}")
 
-                    tp_order_counts = self.exchange.get_open_tp_order_count(symbol)
+                    tp_order_counts = tick.tp_order_counts
                     #print(type(tp_order_counts))
 
                     # Check for long position
                     if long_pos_qty > 0:
                         try:
-                            unrealized_pnl = self.exchange.fetch_unrealized_pnl(symbol)
+                            unrealized_pnl = tick.unrealized_pnl(symbol)
                             long_upnl = unrealized_pnl.get('long')
                             logging.info(f"Long UPNL for {symbol}: {long_upnl}")
                         except Exception as e:
@@ -648,7 +626,7 @@ class BybitBasicGrid(BybitStrategy):
                     # Check for short position
                     if short_pos_qty > 0:
                         try:
-                            unrealized_pnl = self.exchange.fetch_unrealized_pnl(symbol)
+                            unrealized_pnl = tick.unrealized_pnl(symbol)
                             short_upnl = unrealized_pnl.get('short')
                             logging.info(f"Short UPNL for {symbol}: {short_upnl}")
                         except Exception as e:
@@ -812,7 +790,7 @@ class BybitBasicGrid(BybitStrategy):
                 iteration_duration = iteration_end_time - iteration_start_time
                 logging.info(f"Iteration for symbol {symbol} took {iteration_duration:.2f} seconds")
 
-                time.sleep(3)
+                time.sleep(self.loop_interval)
         except Exception as e:
             traceback_info = traceback.format_exc()  # Get the full traceback
             logging.error(f"Exception caught in quickscalp strategy '{symbol}': {e}\nTraceback:\n{traceback_info}")
\ No newline at end of file
@@ -69,7 +69,7 @@ class BybitQuickScalpTrendSpot(BybitStrategy):
                 # Modify symbol-specific considerations for spot trading
                 # ...
 
-                time.sleep(3)
+                time.sleep(self.loop_interval)
         except Exception as e:
             traceback_info = traceback.format_exc()
             logging.info(f"Exception caught in spot strategy '{symbol}': {e}\nTraceback:\n{traceback_info}")
\ No newline at end of file
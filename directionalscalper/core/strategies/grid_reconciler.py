@@ -0,0 +1,88 @@
+class GridPlan:
+    """
+    What it takes to turn the live orders of one grid side into the desired grid.
+
+    ``amend`` holds (order, new price or None, new qty or None), ``cancel`` the live orders no level wants,
+    ``create`` the (price, qty) levels no live order can be moved to, and ``keep`` the orders already in place.
+    """
+
+    def __init__(self):
+        self.keep = []
+        self.amend = []
+        self.cancel = []
+        self.create = []
+
+    @property
+    def request_count(self) -> int:
+        return len(self.amend) + len(self.cancel) + len(self.create)
+
+    def __repr__(self):
+        return f"GridPlan(keep={len(self.keep)}, amend={len(self.amend)}, cancel={len(self.cancel)}, create={len(self.create)})"
+
+
+def _round_to_step(value: float, step: float) -> float:
+    if not step:
+        return float(value)
+    return round(round(float(value) / step) * step, 12)
+
+
+def _order_qty(order) -> float:
+    # An amend sets the order's total qty, so a partly filled order still matches a level of its original size
+    amount = order.get('amount')
+    if amount is None:
+        amount = order.get('info', {}).get('qty')
+    return float(amount or 0)
+
+
+def plan_grid_orders(levels: list, amounts: list, live_orders: list, tick_size: float, qty_step: float,
+                     tolerance_ticks: int = 1) -> GridPlan:
+    """
+    Diff the desired grid (``levels`` with their ``amounts``) against the live orders of the same side.
+
+    A live order within ``tolerance_ticks`` ticks of a level is that level's order: it is kept as it is, or
+    amended when its size is off by a quantity step or more. Each remaining level then takes the nearest remaining
+    order, amended onto it, so only the surplus is cancelled or created.
+    """
+    plan = GridPlan()
+    tick_size = tick_size or 0
+    tolerance = tolerance_ticks * tick_size + tick_size * 1e-6
+    qty_tolerance = (qty_step or 0) / 2
+
+    desired = sorted(
+        (_round_to_step(level, tick_size), _round_to_step(amount, qty_step))
+        for level, amount in zip(levels, amounts)
+        if amount and amount > 0
+    )
+    unmatched_orders = sorted(
+        (order for order in live_orders if order.get('price') is not None),
+        key=lambda order: float(order['price'])
+    )
+
+    unmatched_levels = []
+    for price, qty in desired:
+        match = None
+        for order in unmatched_orders:
+            distance = abs(float(order['price']) - price)
+            if distance <= tolerance and (match is None or distance < abs(float(match['price']) - price)):
+                match = order
+        if match is None:
+            unmatched_levels.append((price, qty))
+            continue
+        unmatched_orders.remove(match)
+        if abs(_order_qty(match) - qty) > qty_tolerance:
+            plan.amend.append((match, None, qty))
+        else:
+            plan.keep.append(match)
+
+    # Move the nearest leftover order onto each leftover level instead of cancelling and placing it again
+    for price, qty in unmatched_levels:
+        if not unmatched_orders:
+            plan.create.append((price, qty))
+            continue
+        order = min(unmatched_orders, key=lambda order: abs(float(order['price']) - price))
+        unmatched_orders.remove(order)
+        new_qty = qty if abs(_order_qty(order) - qty) > qty_tolerance else None
+        plan.amend.append((order, price, new_qty))
+
+    plan.cancel.extend(unmatched_orders)
+    return plan
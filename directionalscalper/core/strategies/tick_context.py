@@ -0,0 +1,142 @@
+import time
+
+
+class TickContext:
+    """
+    What one pass of a symbol loop reads from the exchange, fetched once at the top of the pass.
+
+    Built by ``BybitStrategy.build_tick_context``. The account-wide open positions are fetched once and the
+    per-symbol views (position details, position values, unrealized PnL, leverage, open symbols) are derived
+    from them, so helpers given the context never go back to the exchange within the same pass.
+    """
+
+    def __init__(self, symbol, open_positions, open_orders, ticker, current_price, order_book,
+                 total_equity, available_equity, market=None):
+        self.symbol = symbol
+        self.created_at = time.time()
+        self.open_positions = open_positions or []
+        self.open_orders = open_orders or []
+        self.ticker = ticker
+        self.current_price = current_price
+        self.order_book = order_book or {}
+        self.total_equity = total_equity
+        self.available_equity = available_equity
+        self.market = market
+
+        self._position_details = None
+        self._open_symbols = None
+
+    @staticmethod
+    def _position_symbol(position):
+        return position.get('info', {}).get('symbol', '').split(':')[0]
+
+    @property
+    def open_symbols(self) -> list:
+        """Exchange ids ('BTCUSDT') of every symbol with an open position."""
+        if self._open_symbols is None:
+            symbols = [pos.get('symbol').split(':')[0] for pos in self.open_positions if isinstance(pos, dict) and pos.get('symbol')]
+            self._open_symbols = [symbol.replace("/", "") for symbol in symbols]
+        return self._open_symbols
+
+    @property
+    def position_details(self) -> dict:
+        """Per symbol id: {'long': {'qty', 'avg_price', 'liq_price'}, 'short': {...}}."""
+        if self._position_details is None:
+            details = {}
+            for position in self.open_positions:
+                info = position.get('info', {})
+                if not all(key in info for key in ('size', 'side', 'avgPrice', 'liqPrice')):
+                    continue
+                position_symbol = self._position_symbol(position)
+                if position_symbol not in details:
+                    details[position_symbol] = {
+                        'long': {'qty': 0, 'avg_price': 0, 'liq_price': None},
+                        'short': {'qty': 0, 'avg_price': 0, 'liq_price': None}
+                    }
+                side = {'buy': 'long', 'sell': 'short'}.get(info['side'].lower())
+                if side is None:
+                    continue
+                details[position_symbol][side]['qty'] += float(info['size'])
+                details[position_symbol][side]['avg_price'] = float(info['avgPrice'])
+                details[position_symbol][side]['liq_price'] = info.get('liqPrice')
+            self._position_details = details
+        return self._position_details
+
+    def _symbol_positions(self, symbol):
+        return [position for position in self.open_positions if self._position_symbol(position) == symbol]
+
+    def positions(self, symbol: str = None) -> dict:
+        """Same shape as ``BybitExchange.get_positions_bybit``."""
+        symbol = symbol or self.symbol
+        values = {
+            side: {"qty": 0.0, "price": 0.0, "realised": 0, "cum_realised": 0, "upnl": 0, "upnl_pct": 0, "liq_price": 0, "entry_price": 0}
+            for side in ("long", "short")
+        }
+        for position in self._symbol_positions(symbol):
+            side = position.get('side')
+            if side not in values:
+                continue
+            info = position.get('info', {})
+            values[side]["qty"] = float(position.get("contracts") or 0)
+            values[side]["price"] = float(position.get("entryPrice") or 0)
+            values[side]["realised"] = round(float(info.get("unrealisedPnl") or 0), 4)
+            values[side]["cum_realised"] = round(float(info.get("cumRealisedPnl") or 0), 4)
+            values[side]["upnl"] = round(float(info.get("unrealisedPnl") or 0), 4)
+            values[side]["upnl_pct"] = round(float(position.get("percentage") or 0), 4)
+            values[side]["liq_price"] = float(position.get("liquidationPrice") or 0)
+            values[side]["entry_price"] = float(position.get("entryPrice") or 0)
+        return values
+
+    def unrealized_pnl(self, symbol: str = None) -> dict:
+        """Same shape as ``BybitExchange.fetch_unrealized_pnl``."""
+        symbol = symbol or self.symbol
+        unrealized_pnl = {'long': None, 'short': None}
+        for position in self._symbol_positions(symbol):
+            info = position.get('info', {})
+            side = {'buy': 'long', 'sell': 'short'}.get(info.get('side', '').lower())
+            try:
+                pnl = float(info.get('unrealisedPnl'))
+            except (TypeError, ValueError):
+                pnl = None
+            if side is not None:
+                unrealized_pnl[side] = pnl
+        return unrealized_pnl
+
+    def leverage(self, symbol: str = None) -> float:
+        symbol = symbol or self.symbol
+        for position in self._symbol_positions(symbol):
+            if position.get('leverage') is not None:
+                return float(position['leverage'])
+        return 0.0
+
+    @property
+    def market_data(self) -> dict:
+        """Same shape as ``BybitExchange.get_market_data_bybit``, without its account-wide position fetch."""
+        values = {"precision": 0.0, "leverage": self.leverage(), "min_qty": 0.0}
+        if self.market is not None:
+            values["precision"] = self.market.price_precision
+            values["min_qty"] = self.market.min_qty
+        return values
+
+    @property
+    def best_ask(self):
+        asks = self.order_book.get('asks') or []
+        return asks[0][0] if asks else None
+
+    @property
+    def best_bid(self):
+        bids = self.order_book.get('bids') or []
+        return bids[0][0] if bids else None
+
+    @property
+    def tp_order_counts(self) -> dict:
+        """Same shape as ``BybitExchange.get_open_tp_order_count``, counted from this pass's open orders."""
+        counts = {'long_tp_count': 0, 'short_tp_count': 0}
+        for order in self.open_orders:
+            if not order.get('info', {}).get('reduceOnly', False):
+                continue
+            if order.get('side') == 'sell':
+                counts['long_tp_count'] += 1
+            elif order.get('side') == 'buy':
+                counts['short_tp_count'] += 1
+        return counts
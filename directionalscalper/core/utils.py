@@ -3,12 +3,16 @@ from __future__ import annotations
 import hashlib
 import hmac
 import logging
+import queue
+import threading
 import time
 import random
 from collections import OrderedDict
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 
 log = logging.getLogger(__name__)
 
@@ -54,30 +58,135 @@ def hashing(
     ).hexdigest()
 
 
+class SessionPool:
+    """
+    Long-lived keep-alive ``requests`` sessions, up to ``pool_size`` per host.
+
+    A request borrows an idle session of its host (or opens a new one while the host is under
+    ``pool_size``) and hands it back afterwards, so its TCP/TLS connection is reused by the next request
+    instead of being handshaken again. Connection errors and 429/5xx answers are retried by the
+    adapter with a short backoff.
+    """
+
+    def __init__(self, pool_size: int = 8, retries: int = 3, backoff_factor: float = 0.2, timeout: float = 30):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+
+        self.idle = {}  # host -> queue of idle sessions
+        self.sessions = {}  # host -> every session opened for it
+        self.lock = threading.Lock()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        # Each session is used by one thread at a time, one connection per host is all it needs
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+        return session
+
+    def _acquire(self, host: str):
+        with self.lock:
+            idle = self.idle.setdefault(host, queue.LifoQueue())
+            sessions = self.sessions.setdefault(host, [])
+            try:
+                return idle, idle.get_nowait()
+            except queue.Empty:
+                if len(sessions) < self.pool_size:
+                    session = self._new_session()
+                    sessions.append(session)
+                    return idle, session
+        # Every session of the host is busy, wait for one to come back
+        try:
+            return idle, idle.get(timeout=self.timeout)
+        except queue.Empty:
+            # A requests error, so callers retry it like any other failed connection
+            raise requests.exceptions.ConnectionError(
+                f"No free session for {host} after {self.timeout}s ({self.pool_size} in use)"
+            ) from None
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        idle, session = self._acquire(urlparse(url).netloc)
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            idle.put(session)
+
+    def get_stats(self) -> dict:
+        """Requests sent and connections opened per host, as counted by the sessions' urllib3 pools."""
+        stats = {}
+        with self.lock:
+            sessions = {host: list(host_sessions) for host, host_sessions in self.sessions.items()}
+        for host, host_sessions in sessions.items():
+            requests_sent = connections_opened = 0
+            for session in host_sessions:
+                for adapter in set(session.adapters.values()):
+                    pools = adapter.poolmanager.pools
+                    for key in pools.keys():
+                        pool = pools.get(key)
+                        if pool is not None:
+                            requests_sent += pool.num_requests
+                            connections_opened += pool.num_connections
+            stats[host] = {
+                "sessions": len(host_sessions),
+                "requests": requests_sent,
+                "connections_opened": connections_opened,
+                "connections_reused": max(requests_sent - connections_opened, 0),
+            }
+        return stats
+
+    def close(self):
+        with self.lock:
+            for host_sessions in self.sessions.values():
+                for session in host_sessions:
+                    session.close()
+            self.sessions = {}
+            self.idle = {}
+
+
+session_pool = SessionPool()
+
+
+def configure_session_pool(**kwargs):
+    """Replace the process-wide session pool, e.g. ``configure_session_pool(pool_size=16, retries=2)``."""
+    global session_pool
+    old_pool, session_pool = session_pool, SessionPool(**kwargs)
+    old_pool.close()
+
+
+def get_session_pool_stats() -> dict:
+    return session_pool.get_stats()
+
+
 def dispatch_request(
     http_method: str,
     key: str = "",
     signature: str = "",
     timestamp: int = -1,
 ):
-    session = requests.Session()
-    session.headers.update(
-        {
-            "Content-Type": "application/json;charset=utf-8",
-            "X-MBX-APIKEY": f"{key}",
-            "X-BAPI-API-KEY": f"{key}",
-            "X-BAPI-SIGN": f"{signature}",
-            "X-BAPI-SIGN-TYPE": "2",
-            "X-BAPI-TIMESTAMP": f"{timestamp}",
-            "X-BAPI-RECV-WINDOW": "5000",
-        }
-    )
-    return {
-        "GET": session.get,
-        "DELETE": session.delete,
-        "PUT": session.put,
-        "POST": session.post,
-    }.get(http_method, "GET")
+    headers = {
+        "Content-Type": "application/json;charset=utf-8",
+        "X-MBX-APIKEY": f"{key}",
+        "X-BAPI-API-KEY": f"{key}",
+        "X-BAPI-SIGN": f"{signature}",
+        "X-BAPI-SIGN-TYPE": "2",
+        "X-BAPI-TIMESTAMP": f"{timestamp}",
+        "X-BAPI-RECV-WINDOW": "5000",
+    }
+    method = http_method if http_method in ("GET", "DELETE", "PUT", "POST") else "GET"
+
+    def send(url: str, **kwargs):
+        return session_pool.request(method, url, headers=headers, **kwargs)
+
+    return send
 
 
 def send_public_request(
@@ -27,6 +27,9 @@ from directionalscalper.core.exchanges.binance import BinanceExchange
 from directionalscalper.core.exchanges.hyperliquid import HyperLiquidExchange
 from directionalscalper.core.exchanges.bybit import BybitExchange
 from directionalscalper.core.exchanges.exchange import Exchange
+from directionalscalper.core.utils import configure_session_pool
+from directionalscalper.core.exchanges.metrics import ExchangeMetrics
+from directionalscalper.core.exchanges.retry_scheduler import RetryScheduler
 
 
 import directionalscalper.core.strategies.bybit.scalping as bybit_scalping
@@ -127,10 +130,10 @@ class DirectionalMarketMaker:
         #     self.exchange = BybitExchange(api_key, secret_key, passphrase, market_type)
         if exchange_name.lower() == 'bybit':
             market_type = 'swap'
-            self.exchange = BybitExchange(api_key, secret_key, passphrase, market_type)
+            self.exchange = BybitExchange(api_key, secret_key, passphrase, market_type, exchange_config.use_websocket, exchange_config.ticker_interval, exchange_config.async_runtime, exchange_config.base_url)
         elif exchange_name.lower() == 'bybit_spot':
             market_type = 'spot'
-            self.exchange = BybitExchange(api_key, secret_key, passphrase, market_type)
+            self.exchange = BybitExchange(api_key, secret_key, passphrase, market_type, exchange_config.use_websocket, exchange_config.ticker_interval, exchange_config.async_runtime, exchange_config.base_url)
         elif exchange_name.lower() == 'hyperliquid':
             self.exchange = HyperLiquidExchange(api_key, secret_key, passphrase)
         elif exchange_name.lower() == 'huobi':
@@ -613,13 +616,27 @@ if __name__ == '__main__':
     exchange_name = args.exchange  # Now it will have a value
     market_maker = DirectionalMarketMaker(config, exchange_name, args.account_name)
 
+    # Keep-alive sessions shared by the Manager and the scrapers
+    configure_session_pool(pool_size=config.api.http_pool_size, retries=config.api.http_retries)
+
+    # Per-endpoint latency and call counts, appended to a rotating file
+    ExchangeMetrics.for_process().start_exporter(config.logger.metrics_file, config.logger.metrics_interval)
+
+    # Retries give up at the deadline and serve the last good data while an endpoint's circuit is open.
+    # Strategies also stop retrying after one loop interval, which is all they wait for when no deadline is set.
+    retry_settings = dict(failure_threshold=config.bot.circuit_failure_threshold, reset_timeout=config.bot.circuit_reset_seconds)
+    if config.bot.retry_deadline_seconds is not None:
+        retry_settings["deadline"] = config.bot.retry_deadline_seconds
+    RetryScheduler.configure_all(**retry_settings)
+
     manager = Manager(
         market_maker.exchange, 
         exchange_name=args.exchange, 
         data_source_exchange=config.api.data_source_exchange,
         api=config.api.mode, 
         path=Path("data", config.api.filename), 
-        url=f"{config.api.url}{config.api.filename}"
+        url=f"{config.api.url}{config.api.filename}",
+        signal_engine_ttl=config.api.signal_engine_ttl
     )
 
     print(f"Using exchange {config.api.data_source_exchange} for API data")
@@ -0,0 +1,67 @@
+"""
+Microbenchmark of ``directionalscalper.core.indicators`` against the ``ta`` / pandas calls they replace.
+
+    PYTHONPATH=. python tests/bench_indicators.py --candles 100 --runs 200
+
+Parity is checked by test_indicators.py; this only times both.
+"""
+import argparse
+import timeit
+
+import pandas as pd
+import ta
+
+from directionalscalper.core import indicators
+from test_indicators import COLUMNS, random_candles
+
+
+def bench(candles: int = 100, runs: int = 200) -> dict:
+    """Microseconds per call of MFI+RSI+EMA (the strategies' hot path), ATR and HMA, ``ta`` vs kernels."""
+    data = random_candles(candles, seed=1)
+    df = pd.DataFrame(data, columns=COLUMNS)
+    high, low, close, volume = data[:, 2], data[:, 3], data[:, 4], data[:, 5]
+
+    def ta_mfirsi_ema():
+        frame = df.copy()
+        frame['mfi'] = ta.volume.MFIIndicator(high=frame['high'], low=frame['low'], close=frame['close'],
+                                              volume=frame['volume'], window=14, fillna=False).money_flow_index()
+        frame['rsi'] = ta.momentum.rsi(frame['close'], window=14)
+        return frame['mfi'].ewm(span=5, adjust=False).mean(), frame['rsi'].ewm(span=5, adjust=False).mean()
+
+    def kernel_mfirsi_ema():
+        return (indicators.ema(indicators.mfi(high, low, close, volume, 14), 5),
+                indicators.ema(indicators.rsi(close, 14), 5))
+
+    def ta_hma():
+        series2 = 2 * df['close'].rolling(7).mean() - df['close'].rolling(14).mean()
+        return series2.rolling(3).mean()
+
+    cases = {
+        "mfi+rsi+ema": (ta_mfirsi_ema, kernel_mfirsi_ema),
+        "atr": (lambda: ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'], window=14).average_true_range(),
+                lambda: indicators.atr(high, low, close, 14)),
+        "hma": (ta_hma, lambda: indicators.hma(close, 14)),
+    }
+    results = {}
+    for name, (reference_fn, kernel_fn) in cases.items():
+        kernel_fn()  # Compile first when numba is installed
+        results[name] = tuple(
+            min(timeit.repeat(fn, number=runs, repeat=3)) / runs * 1e6 for fn in (reference_fn, kernel_fn)
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time ta and the NumPy indicator kernels")
+    parser.add_argument("--candles", type=int, default=100, help="Candles per benchmark call")
+    parser.add_argument("--runs", type=int, default=200, help="Calls per benchmark timing")
+    args = parser.parse_args(argv)
+
+    print(f"numba {'on' if indicators.njit is not None else 'off'}")
+    print(f"{'indicator':<14}{'ta/pandas us':>14}{'kernels us':>12}{'speedup':>10}")
+    for name, (reference_us, kernel_us) in bench(args.candles, args.runs).items():
+        print(f"{name:<14}{reference_us:>14.1f}{kernel_us:>12.1f}{reference_us / kernel_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import time
+
+import pytest
+
+from directionalscalper.core.exchanges import bybit_ws
+from directionalscalper.core.exchanges.bybit_ws import BybitPrivateStream, BybitPublicStream
+from directionalscalper.core.exchanges.fake_bybit_ws import FakeBybitWS
+
+pytestmark = pytest.mark.skipif(bybit_ws.websocket is None, reason="websocket-client is not installed")
+
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def ticker_snapshot(topic):
+    if topic == "tickers.BTCUSDT":
+        return {"symbol": "BTCUSDT", "lastPrice": "100.00", "bid1Price": "99.50", "ask1Price": "100.50"}
+    return None
+
+
+class FakeClient:
+    """The parts of a ccxt bybit client the private stream uses."""
+
+    apiKey = "key"
+    secret = "secret"
+
+    def __init__(self):
+        self.positions = [{"symbol": "BTCUSDT", "positionIdx": 1, "size": "1", "avgPrice": "100", "updatedTime": "1"}]
+        self.orders = []
+        self.reconciles = 0
+
+    def nonce(self):
+        return int(time.time() * 1000)
+
+    def privateGetV5PositionList(self, request):
+        self.reconciles += 1
+        return {"result": {"list": [dict(raw) for raw in self.positions]}}
+
+    def privateGetV5OrderRealtime(self, request):
+        return {"result": {"list": [dict(raw) for raw in self.orders]}}
+
+    def parse_position(self, raw):
+        return {"symbol": raw["symbol"], "contracts": float(raw["size"]), "info": raw}
+
+    def parse_order(self, raw):
+        return {"id": raw["orderId"], "info": raw}
+
+
+@pytest.fixture
+def fake():
+    server = FakeBybitWS(snapshot_provider=ticker_snapshot).start()
+    yield server
+    server.stop()
+
+
+def test_public_stream_serves_pushed_tickers(fake):
+    stream = BybitPublicStream(fake.url)
+    stream.start()
+    try:
+        assert wait_until(lambda: stream.get_mid_price("BTCUSDT") == 100.0)
+
+        fake.publish("tickers.BTCUSDT", {"symbol": "BTCUSDT", "bid1Price": "101.00", "ask1Price": "103.00"}, "delta")
+        assert wait_until(lambda: stream.get_mid_price("BTCUSDT") == 102.0)
+    finally:
+        stream.stop()
+
+
+def test_public_stream_reconnects_and_resubscribes(fake):
+    stream = BybitPublicStream(fake.url)
+    stream.start()
+    try:
+        assert wait_until(lambda: stream.get_mid_price("BTCUSDT") == 100.0)
+        assert wait_until(lambda: "tickers.BTCUSDT" in fake.subscribed_topics())
+
+        fake.drop_connections()
+        # State from the dropped connection is not served, callers fall back to REST
+        assert wait_until(lambda: not stream.connected.is_set())
+        assert stream.tickers == {}
+
+        assert wait_until(lambda: fake.connection_count == 2)
+        assert wait_until(lambda: {"tickers.BTCUSDT", "orderbook.50.BTCUSDT"} <= fake.subscribed_topics())
+        assert wait_until(lambda: stream.get_mid_price("BTCUSDT") == 100.0)
+        assert stream.reconnect_count == 1
+    finally:
+        stream.stop()
+
+
+def test_public_stream_unsubscribes_idle_topics(fake):
+    stream = BybitPublicStream(fake.url, idle_timeout=0)
+    stream.start()
+    try:
+        assert wait_until(lambda: stream.get_mid_price("BTCUSDT") == 100.0)
+        stream._prune_idle_topics()
+        assert wait_until(lambda: "tickers.BTCUSDT" not in fake.subscribed_topics())
+        assert stream.topics == {}
+    finally:
+        stream.stop()
+
+
+def test_private_stream_reconciles_and_applies_pushes(fake):
+    client = FakeClient()
+    stream = BybitPrivateStream(fake.url, client)
+    stream.start()
+    try:
+        assert wait_until(lambda: stream.get_positions("BTCUSDT") is not None)
+        assert stream.get_positions("BTCUSDT")[0]["contracts"] == 1.0
+
+        fake.publish("position.linear", [{"symbol": "BTCUSDT", "positionIdx": 1, "size": "2", "entryPrice": "101",
+                                          "updatedTime": str(client.nonce())}])
+        assert wait_until(lambda: stream.get_positions("BTCUSDT")[0]["contracts"] == 2.0)
+
+        fake.publish("order.linear", [{"orderId": "1", "symbol": "BTCUSDT", "orderStatus": "New",
+                                       "updatedTime": str(client.nonce())}])
+        assert wait_until(lambda: [order["id"] for order in stream.get_open_orders("BTCUSDT")] == ["1"])
+    finally:
+        stream.stop()
+
+
+def test_private_stream_reauthenticates_and_resubscribes_after_reconnect(fake):
+    client = FakeClient()
+    stream = BybitPrivateStream(fake.url, client)
+    stream.start()
+    try:
+        topics = {"position.linear", "order.linear", "execution.linear"}
+        assert wait_until(lambda: stream.is_live())
+        assert wait_until(lambda: topics <= fake.subscribed_topics())
+
+        fake.drop_connections()
+        assert wait_until(lambda: not stream.is_live())
+        assert stream.get_positions() is None
+
+        # A new connection authenticates, resubscribes and reconciles over REST again
+        assert wait_until(lambda: fake.connection_count == 2)
+        assert wait_until(lambda: stream.is_live())
+        assert wait_until(lambda: topics <= fake.subscribed_topics())
+        assert client.reconciles == 2
+    finally:
+        stream.stop()
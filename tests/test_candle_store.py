@@ -0,0 +1,49 @@
+import time
+from types import SimpleNamespace
+
+from directionalscalper.core.exchanges.candle_store import CandleStore
+
+MINUTE_MS = 60_000
+
+
+class History:
+    """``fetch`` over a symbol listed ``listed`` one-minute candles ago, recording every call."""
+
+    def __init__(self, listed: int):
+        now = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+        self.rows = [[now - i * MINUTE_MS, 1.0, 1.0, 1.0, 1.0, 1.0] for i in reversed(range(listed))]
+        self.calls = []
+
+    def __call__(self, symbol, timeframe, since, limit):
+        self.calls.append((since, limit))
+        rows = self.rows if since is None else [row for row in self.rows if row[0] >= since]
+        return rows[-limit:] if since is None else rows[:limit]
+
+
+def make_store(min_refresh_seconds=0.0):
+    exchange = SimpleNamespace(id="bybit", parse_timeframe=lambda timeframe: 60)
+    return CandleStore(exchange, capacity=500, min_refresh_seconds=min_refresh_seconds)
+
+
+def test_a_short_history_is_loaded_once_then_refreshed_from_its_last_candle():
+    store, fetch = make_store(), History(listed=40)
+
+    assert len(store.get("NEWUSDT", "1m", 100, fetch)) == 40
+    assert len(store.get("NEWUSDT", "1m", 100, fetch)) == 40
+
+    assert fetch.calls[0] == (None, 100)
+    assert fetch.calls[1][0] == fetch.rows[-1][0]
+
+
+def test_a_short_history_respects_min_refresh_seconds():
+    store, fetch = make_store(min_refresh_seconds=60), History(listed=40)
+    for _ in range(3):
+        store.get("NEWUSDT", "1m", 100, fetch)
+    assert fetch.calls == [(None, 100)]
+
+
+def test_an_empty_load_is_retried():
+    store, fetch = make_store(), History(listed=0)
+    store.get("NEWUSDT", "1m", 100, fetch)
+    store.get("NEWUSDT", "1m", 100, fetch)
+    assert fetch.calls == [(None, 100), (None, 100)]
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from directionalscalper.core.exchanges.bybit import BybitExchange
+from directionalscalper.core.exchanges.fake_bybit_http import FakeBybitHTTP
+from directionalscalper.core.exchanges.retry_scheduler import mark_stale
+from directionalscalper.core.strategies.bybit.bybit_strategy import BybitStrategy
+
+SYMBOL = "BTCUSDT"
+
+
+@pytest.fixture
+def fake():
+    server = FakeBybitHTTP(symbols=[SYMBOL], prices={SYMBOL: 100.0}, seed=1).start(walk_interval=0)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def strategy(fake):
+    exchange = BybitExchange("key", "secret", base_url=fake.url)
+    config = SimpleNamespace(
+        symbol=SYMBOL, blacklist=[], max_usd_value=None, auto_reduce_start_pct=None, auto_reduce_maxloss_pct=None,
+        max_pos_balance_pct=None, wallet_exposure_limit=None, user_defined_leverage_long=None,
+        user_defined_leverage_short=None, auto_leverage_upscale=False,
+    )
+    strategy = BybitStrategy(exchange, config, manager=None)
+    strategy.filled_levels[SYMBOL] = {"buy": set(), "sell": set()}
+    return strategy
+
+
+def test_one_iteration_against_the_fake(fake, strategy):
+    tick = strategy.build_tick_context(SYMBOL, 10000.0, 10000.0)
+    assert tick.current_price == 100.0
+    assert tick.best_bid < tick.current_price < tick.best_ask
+    assert tick.market_data["min_qty"] > 0
+    assert tick.open_positions == [] and tick.open_orders == []
+
+    strategy.reconcile_grid_orders(SYMBOL, "buy", [99.0, 98.0], [1.0, 1.0], True, strategy.filled_levels[SYMBOL]["buy"])
+    strategy.reconcile_grid_orders(SYMBOL, "sell", [101.0, 102.0], [1.0, 1.0], False, strategy.filled_levels[SYMBOL]["sell"])
+
+    resting = sorted((order["side"], float(order["price"])) for order in fake.orders.values())
+    assert resting == [("Buy", 98.0), ("Buy", 99.0), ("Sell", 101.0), ("Sell", 102.0)]
+    assert strategy.filled_levels[SYMBOL] == {"buy": {98.0, 99.0}, "sell": {101.0, 102.0}}
+    assert fake.request_counts.get("/v5/order/create-batch") == 2
+
+
+def test_stale_open_orders_skip_the_grid(fake, strategy, monkeypatch):
+    monkeypatch.setattr(strategy, "retry_api_call", lambda function, *args, **kwargs: mark_stale([], 30.0))
+
+    assert not strategy.reconcile_grid_orders(SYMBOL, "buy", [99.0], [1.0], True, strategy.filled_levels[SYMBOL]["buy"])
+    assert not strategy.issue_grid_orders(SYMBOL, "sell", [101.0], [1.0], False, strategy.filled_levels[SYMBOL]["sell"])
+    assert fake.orders == {}
+    assert strategy.filled_levels[SYMBOL] == {"buy": set(), "sell": set()}
@@ -0,0 +1,72 @@
+from directionalscalper.core.strategies.grid_reconciler import plan_grid_orders
+
+TICK = 0.01
+QTY_STEP = 0.1
+
+
+def order(order_id, price, amount, filled=0.0):
+    return {"id": order_id, "price": price, "amount": amount, "filled": filled, "remaining": amount - filled}
+
+
+def test_orders_on_their_levels_are_kept():
+    live = [order("a", 100.00, 1.0), order("b", 99.00, 2.0)]
+    plan = plan_grid_orders([100.00, 99.00], [1.0, 2.0], live, TICK, QTY_STEP)
+    assert [o["id"] for o in plan.keep] == ["b", "a"]
+    assert plan.request_count == 0
+
+
+def test_orders_within_the_tick_tolerance_are_kept():
+    live = [order("a", 100.01, 1.0), order("b", 98.99, 2.0)]
+    plan = plan_grid_orders([100.00, 99.00], [1.0, 2.0], live, TICK, QTY_STEP)
+    assert sorted(o["id"] for o in plan.keep) == ["a", "b"]
+    assert plan.request_count == 0
+
+
+def test_orders_beyond_the_tick_tolerance_are_moved():
+    live = [order("a", 100.02, 1.0)]
+    plan = plan_grid_orders([100.00], [1.0], live, TICK, QTY_STEP)
+    assert plan.keep == []
+    assert plan.amend == [(live[0], 100.00, None)]
+
+
+def test_partly_filled_order_of_the_same_size_is_kept():
+    live = [order("a", 100.00, 1.0, filled=0.4)]
+    plan = plan_grid_orders([100.00], [1.0], live, TICK, QTY_STEP)
+    assert plan.keep == live
+    assert plan.request_count == 0
+
+
+def test_partly_filled_order_of_another_size_is_amended_to_the_total():
+    live = [order("a", 100.00, 1.0, filled=0.4)]
+    plan = plan_grid_orders([100.00], [1.5], live, TICK, QTY_STEP)
+    assert plan.amend == [(live[0], None, 1.5)]
+
+
+def test_size_change_under_half_a_step_is_ignored():
+    live = [order("a", 100.00, 1.0)]
+    plan = plan_grid_orders([100.00], [1.04], live, TICK, QTY_STEP)
+    assert plan.keep == live
+
+
+def test_leftover_orders_move_to_the_nearest_new_level():
+    live = [order("a", 100.00, 1.0), order("b", 95.00, 1.0)]
+    plan = plan_grid_orders([100.00, 97.00], [1.0, 2.0], live, TICK, QTY_STEP)
+    assert plan.keep == [live[0]]
+    assert plan.amend == [(live[1], 97.00, 2.0)]
+    assert plan.cancel == [] and plan.create == []
+
+
+def test_surplus_orders_are_cancelled_and_missing_levels_created():
+    live = [order("a", 100.00, 1.0), order("b", 99.00, 1.0), order("c", 98.00, 1.0)]
+    plan = plan_grid_orders([100.00], [1.0], live, TICK, QTY_STEP)
+    assert plan.keep == [live[0]]
+    assert plan.amend == [] and plan.create == []
+    assert sorted(o["id"] for o in plan.cancel) == ["b", "c"]
+
+    plan = plan_grid_orders([100.00, 99.00, 98.00], [1.0, 1.0, 1.0], [live[0]], TICK, QTY_STEP)
+    assert plan.create == [(98.00, 1.0), (99.00, 1.0)]
+
+
+def test_levels_without_an_amount_are_skipped():
+    plan = plan_grid_orders([100.00, 99.00], [0, 1.0], [], TICK, QTY_STEP)
+    assert plan.create == [(99.00, 1.0)]
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+from directionalscalper.core import indicators
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Rolling means and variances are summed in a different order than pandas' online algorithm
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def random_candles(n: int, seed: int = 0, flat: bool = False) -> np.ndarray:
+    """A random walk of ``n`` candles; ``flat`` adds a flat, zero-volume stretch where MFI and RSI divide by zero."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n))
+    volume = rng.uniform(10, 1000, n)
+    if flat and n > 40:
+        open_[10:35] = high[10:35] = low[10:35] = close[10:35] = close[10]
+        volume[20:40] = 0.0
+    timestamp = np.arange(n) * 60_000.0
+    return np.column_stack([timestamp, open_, high, low, close, volume])
+
+
+CANDLE_SETS = [(n, seed, flat) for n in (10, 30, 200) for seed in (0, 1) for flat in (False, True)]
+
+
+class Candles:
+    """Column views of one candle set for the kernels, and the same candles as a DataFrame for ``ta``."""
+
+    def __init__(self, data):
+        self.high, self.low, self.close, self.volume = data[:, 2], data[:, 3], data[:, 4], data[:, 5]
+        self.df = pd.DataFrame(data, columns=COLUMNS)
+
+
+@pytest.fixture(params=CANDLE_SETS, ids=lambda case: "n={}-seed={}-flat={}".format(*case))
+def candles(request):
+    return Candles(random_candles(*request.param))
+
+
+def assert_matches(got, expected, atol=ATOL):
+    expected = np.asarray(expected, dtype=np.float64)
+    assert got.dtype == np.float64 and got.shape == expected.shape
+    # The warm-up NaNs have to line up with ta's, not only the values after them
+    np.testing.assert_array_equal(np.isnan(got), np.isnan(expected))
+    np.testing.assert_allclose(got, expected, rtol=RTOL, atol=atol, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [5, 14, 22])
+def test_sma(candles, window):
+    assert_matches(indicators.sma(candles.close, window), ta.trend.SMAIndicator(candles.df["close"], window=window).sma_indicator())
+
+
+@pytest.mark.parametrize("window", [5, 14])
+def test_rolling_sum(candles, window):
+    assert_matches(indicators.rolling_sum(candles.volume, window), candles.df["volume"].rolling(window).sum())
+
+
+@pytest.mark.parametrize("window", [5, 14])
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_rolling_std(candles, window, ddof):
+    # pandas' online variance leaves a ~1e-7 residue on flat windows whose exact std is 0
+    assert_matches(indicators.rolling_std(candles.close, window, ddof), candles.df["close"].rolling(window).std(ddof=ddof), atol=1e-6)
+
+
+@pytest.mark.parametrize("window", [5, 22])
+def test_rolling_max_and_min(candles, window):
+    assert_matches(indicators.rolling_max(candles.close, window), candles.df["close"].rolling(window).max())
+    assert_matches(indicators.rolling_min(candles.close, window), candles.df["close"].rolling(window).min())
+
+
+@pytest.mark.parametrize("span", [5, 14])
+def test_ema(candles, span):
+    assert_matches(indicators.ema(candles.close, span), candles.df["close"].ewm(span=span, adjust=False).mean())
+
+
+@pytest.mark.parametrize("span", [5, 14])
+def test_ema_with_min_periods_matches_ta(candles, span):
+    assert_matches(indicators.ema(candles.close, span, min_periods=span), ta.trend.EMAIndicator(candles.df["close"], window=span).ema_indicator())
+
+
+@pytest.mark.parametrize("span", [5, 14])
+def test_ema_of_a_series_with_leading_nans(candles, span):
+    mfi = ta.volume.MFIIndicator(high=candles.df["high"], low=candles.df["low"], close=candles.df["close"],
+                                 volume=candles.df["volume"], window=14, fillna=False).money_flow_index()
+    assert_matches(indicators.ema(mfi.to_numpy(), span), mfi.ewm(span=span, adjust=False).mean())
+
+
+@pytest.mark.parametrize("window", [9, 14])
+def test_hma(candles, window):
+    close = candles.df["close"]
+    series2 = 2 * close.rolling(int(window / 2)).mean() - close.rolling(window).mean()
+    assert_matches(indicators.hma(candles.close, window), series2.rolling(int(np.sqrt(window))).mean())
+
+
+@pytest.mark.parametrize("window", [14, 20])
+def test_rsi(candles, window):
+    assert_matches(indicators.rsi(candles.close, window), ta.momentum.RSIIndicator(candles.df["close"], window=window).rsi())
+
+
+@pytest.mark.parametrize("window", [10, 14])
+def test_mfi(candles, window):
+    expected = ta.volume.MFIIndicator(high=candles.df["high"], low=candles.df["low"], close=candles.df["close"],
+                                      volume=candles.df["volume"], window=window, fillna=False).money_flow_index()
+    assert_matches(indicators.mfi(candles.high, candles.low, candles.close, candles.volume, window), expected)
+
+
+def test_true_range(candles):
+    high, low, close = candles.df["high"], candles.df["low"], candles.df["close"]
+    expected = np.maximum(high - low, np.maximum(abs(high - close.shift(1)), abs(low - close.shift(1))))
+    assert_matches(indicators.true_range(candles.high, candles.low, candles.close, seed_first=False), expected)
+    seeded = indicators.true_range(candles.high, candles.low, candles.close)
+    assert seeded[0] == candles.high[0] - candles.low[0]
+    assert_matches(seeded[1:], expected[1:])
+
+
+@pytest.mark.parametrize("window", [7, 14])
+def test_atr(candles, window):
+    got = indicators.atr(candles.high, candles.low, candles.close, window)
+    if len(candles.close) < window:
+        # ta refuses short inputs, the kernel answers with zeros like ta's warm-up
+        np.testing.assert_array_equal(got, np.zeros(len(candles.close)))
+        return
+    expected = ta.volatility.AverageTrueRange(candles.df["high"], candles.df["low"], candles.df["close"], window=window).average_true_range()
+    assert_matches(got, expected)
+
+
+@pytest.mark.parametrize("window", [10, 20])
+def test_bollinger(candles, window):
+    bands = ta.volatility.BollingerBands(candles.df["close"], window=window, window_dev=2)
+    mavg, hband, lband = indicators.bollinger(candles.close, window, 2)
+    assert_matches(mavg, bands.bollinger_mavg())
+    assert_matches(hband, bands.bollinger_hband(), atol=1e-6)
+    assert_matches(lband, bands.bollinger_lband(), atol=1e-6)
+
+
+@pytest.mark.parametrize("len_slow_ma,len_power_ema", [(64, 13), (20, 5)])
+def test_eri(candles, len_slow_ma, len_power_ema):
+    df = candles.df
+    vwma = (df["close"] * df["volume"]).rolling(len_slow_ma).sum() / df["volume"].rolling(len_slow_ma).sum()
+    slow_vwma_ema = vwma.ewm(span=len_slow_ma, adjust=False).mean()
+    slow_ma, bull_power, bear_power = indicators.eri(candles.high, candles.low, candles.close, candles.volume, len_slow_ma, len_power_ema)
+    assert_matches(slow_ma, slow_vwma_ema)
+    assert_matches(bull_power, (df["high"] - slow_vwma_ema).ewm(span=len_power_ema, adjust=False).mean())
+    assert_matches(bear_power, (df["low"] - slow_vwma_ema).ewm(span=len_power_ema, adjust=False).mean())
+
+
+def test_linear_regression(candles):
+    x = np.arange(len(candles.close))
+    expected = np.linalg.lstsq(np.vstack([x, np.ones(len(x))]).T, candles.close, rcond=None)[0]
+    np.testing.assert_allclose(indicators.linear_regression(candles.close), expected, rtol=1e-7, atol=1e-9)
+
+
+def test_peaks_and_troughs(candles):
+    close = candles.close
+    peaks = [i for i in range(1, len(close) - 1) if close[i - 1] < close[i] > close[i + 1]]
+    troughs = [i for i in range(1, len(close) - 1) if close[i - 1] > close[i] < close[i + 1]]
+    got_peaks, got_troughs = indicators.peaks_and_troughs(close)
+    assert got_peaks.tolist() == peaks
+    assert got_troughs.tolist() == troughs
+
+
+@pytest.mark.parametrize("kernel", [indicators.sma, indicators.rolling_std, indicators.rolling_max, indicators.rolling_min])
+def test_window_longer_than_the_input_is_all_nan(kernel):
+    assert np.isnan(kernel(random_candles(5)[:, 4], 14)).all()
+
+
+def test_empty_input():
+    assert len(indicators.ema([], 5)) == 0
+    assert len(indicators.sma([], 5)) == 0
@@ -0,0 +1,42 @@
+import json
+import os
+
+import msgpack
+import pytest
+
+from api.local_payload import LocalPayloadFile, msgpack_sibling
+
+
+@pytest.fixture
+def payload_path(tmp_path):
+    path = tmp_path / "quantdata.json"
+    path.write_text(json.dumps([{"symbol": "BTCUSDT", "source": "json"}]))
+    return path
+
+
+def write_sibling(path, mtime_offset_ns):
+    sibling = msgpack_sibling(path)
+    sibling.write_bytes(msgpack.packb([{"symbol": "BTCUSDT", "source": "msgpack"}]))
+    json_mtime = os.stat(path).st_mtime_ns
+    os.utime(sibling, ns=(json_mtime + mtime_offset_ns, json_mtime + mtime_offset_ns))
+    return sibling
+
+
+def test_a_current_msgpack_copy_is_preferred(payload_path):
+    sibling = write_sibling(payload_path, 0)
+    payload = LocalPayloadFile(payload_path, check_interval=0)
+    assert payload.get()[0]["source"] == "msgpack"
+    assert payload.source == sibling
+
+
+def test_an_outdated_msgpack_copy_does_not_shadow_the_json(payload_path):
+    write_sibling(payload_path, -60_000_000_000)
+    payload = LocalPayloadFile(payload_path, check_interval=0)
+    assert payload.get()[0]["source"] == "json"
+    assert payload.source == payload_path
+
+
+def test_the_msgpack_copy_is_read_when_the_json_is_gone(payload_path):
+    write_sibling(payload_path, -60_000_000_000)
+    payload_path.unlink()
+    assert LocalPayloadFile(payload_path, check_interval=0).get()[0]["source"] == "msgpack"
@@ -0,0 +1,58 @@
+import time
+
+from api.payload_refresher import PayloadRefresher
+from directionalscalper.core.exchanges.retry_scheduler import RetryScheduler
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def refresher(url, payload=None, **kwargs):
+    refresher = PayloadRefresher(url, **kwargs)
+    refresher.fetches = 0
+
+    def fetch():
+        refresher.fetches += 1
+        if payload is None:
+            raise RuntimeError("down")
+        return payload
+
+    refresher._fetch = fetch
+    return refresher
+
+
+def test_polling_starts_with_the_first_read():
+    payload = refresher("http://signals.test/lazy.json", [{"Asset": "BTCUSDT"}], interval=0.05)
+    assert payload.thread is None
+    assert payload.get() == [{"Asset": "BTCUSDT"}]
+    assert payload.thread is not None
+    payload.stop()
+
+
+def test_idle_refresher_pauses_and_resumes_on_read():
+    payload = refresher("http://signals.test/idle.json", [1], interval=0.01, idle_timeout=0.1)
+    assert payload.get() == [1]
+    assert wait_until(lambda: payload.thread is None)
+    fetches = payload.fetches
+    time.sleep(0.05)
+    assert payload.fetches == fetches
+
+    assert payload.get() == [1]
+    assert wait_until(lambda: payload.fetches > fetches)
+    payload.stop()
+
+
+def test_a_failing_url_does_not_open_the_circuit_of_another(monkeypatch):
+    monkeypatch.setattr(RetryScheduler.for_process(), "failure_threshold", 2)
+    down = refresher("http://signals.test/down.json", interval=0.01)
+    up = refresher("http://signals.test/up.json", [1], interval=0.01)
+    for _ in range(3):
+        assert not down.refresh()
+    assert up.refresh()
+    assert RetryScheduler.for_process().get_state()["remote_data:http://signals.test/down.json"]["state"] == "open"
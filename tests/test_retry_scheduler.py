@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from directionalscalper.core.exchanges.retry_scheduler import (
+    CircuitOpenError, RetryDeadlineExceeded, RetryScheduler, call_endpoint, is_stale,
+)
+
+
+def failing(*args):
+    raise RuntimeError("down")
+
+
+@pytest.fixture
+def scheduler():
+    return RetryScheduler(deadline=1.0, base_delay=0, max_delay=0, failure_threshold=2, reset_timeout=60)
+
+
+def test_a_failing_symbol_only_opens_its_own_circuit(scheduler):
+    for _ in range(2):
+        with pytest.raises(RetryDeadlineExceeded):
+            scheduler.call(call_endpoint("get_open_orders", ("DOGEUSDT",)), failing, ("DOGEUSDT",), max_attempts=1)
+
+    with pytest.raises(CircuitOpenError):
+        scheduler.call(call_endpoint("get_open_orders", ("DOGEUSDT",)), failing, ("DOGEUSDT",))
+    assert scheduler.call(call_endpoint("get_open_orders", ("BTCUSDT",)), lambda symbol: [], ("BTCUSDT",)) == []
+
+
+def test_accounts_get_their_own_scheduler():
+    first = SimpleNamespace(id="bybit", apiKey="first")
+    second = SimpleNamespace(id="bybit", apiKey="second")
+    assert RetryScheduler.for_client(first) is RetryScheduler.for_client(SimpleNamespace(id="bybit", apiKey="first"))
+    assert RetryScheduler.for_client(first) is not RetryScheduler.for_client(second)
+    assert RetryScheduler.for_client(first) is not RetryScheduler.for_process()
+
+
+def test_last_good_values_are_bounded(scheduler):
+    scheduler.configure(max_cached=2)
+    for symbol in ("A", "B", "C"):
+        scheduler.call(symbol, lambda: [symbol], cache_key=symbol)
+    assert list(scheduler.last_good) == ["B", "C"]
+
+
+def test_old_last_good_values_are_not_served(scheduler):
+    scheduler.call("positions", lambda: [1], cache_key="positions")
+    stale = scheduler.call("positions", failing, cache_key="positions", max_attempts=1)
+    assert is_stale(stale) and stale == [1]
+
+    scheduler.configure(max_stale_age=0)
+    with pytest.raises(RetryDeadlineExceeded):
+        scheduler.call("positions", failing, cache_key="positions", max_attempts=1)
+    assert "positions" not in scheduler.last_good
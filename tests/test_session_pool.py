@@ -0,0 +1,34 @@
+import pytest
+import requests
+
+from directionalscalper.core import utils
+from directionalscalper.core.utils import SessionPool
+
+
+def test_exhausted_pool_raises_a_requests_error():
+    pool = SessionPool(pool_size=1, timeout=0.05)
+    pool._acquire("api.example.com")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        pool._acquire("api.example.com")
+
+
+def test_send_public_request_retries_an_exhausted_pool(monkeypatch):
+    pool = SessionPool(pool_size=1, timeout=0.01)
+    pool._acquire("api.example.com")
+    monkeypatch.setattr(utils, "session_pool", pool)
+    monkeypatch.setattr(utils.time, "sleep", lambda seconds: None)
+    assert utils.send_public_request("https://api.example.com", url_path="/v5/time", max_retries=2) == ("", "")
+
+
+def test_configure_session_pool_closes_the_old_sessions(monkeypatch):
+    old_pool = SessionPool()
+    _, session = old_pool._acquire("api.example.com")
+    closed = []
+    monkeypatch.setattr(session, "close", lambda: closed.append(session))
+    monkeypatch.setattr(utils, "session_pool", old_pool)
+
+    utils.configure_session_pool(pool_size=2)
+
+    assert closed == [session]
+    assert utils.session_pool is not old_pool
+    assert utils.session_pool.pool_size == 2